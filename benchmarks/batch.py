@@ -0,0 +1,34 @@
+"""Measure how random-vector throughput scales with the number of workers.
+
+Run from the repository root with ``python -m benchmarks.batch``. The worker
+counts go up to the number of CPUs of the machine.
+"""
+
+import os
+import time
+
+from benchmarks.circuits import rippleCarryAdder
+from logicsimulator.model.BatchSimulator import BatchSimulator
+from logicsimulator.model.Netlist import Netlist
+
+def main():
+    switches, _ = rippleCarryAdder(64)
+    netlist, _ = Netlist.fromComponents(switches)
+    vectors = 1 << 22
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, 32, cpus} & set(range(1, cpus + 1)))
+    baseline = None
+    print(f"320-gate adder, {vectors} random vectors, {cpus} CPUs")
+    for workers in counts:
+        with BatchSimulator(netlist, workers) as simulator:
+            # Start the pool outside of the measurement.
+            simulator.random(1, seed=1)
+            start = time.perf_counter()
+            simulator.random(vectors)
+            elapsed = time.perf_counter() - start
+        throughput = vectors / elapsed
+        baseline = baseline or throughput
+        print(f"  {workers:>2} workers: {throughput / 1e6:7.2f} M vectors/s, speedup {throughput / baseline:5.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Compare word-wide and N-input gates with their bit-level equivalents.
+
+Run from the repository root with ``python -m benchmarks.buses``.
+"""
+
+import time
+from typing import Callable, List, Tuple
+
+from benchmarks.circuits import wire
+from logicsimulator.model.Bulb import Bulb
+from logicsimulator.model.Gates import AndGate, XorGate
+from logicsimulator.model.Propagator import Propagator
+from logicsimulator.model.Switch import Switch
+
+def countObjects(switches: List[Switch]) -> int:
+    """Return the number of components, pins and connections reachable from the switches."""
+    seen = set()
+    stack = list(switches)
+    while stack:
+        propagator = stack.pop()
+        if propagator in seen:
+            continue
+        seen.add(propagator)
+        stack.extend(observer for observer in propagator.observers if isinstance(observer, Propagator))
+    return len(seen)
+
+def wordAnd(width: int) -> Tuple[List[Switch], Bulb]:
+    """Build a ``width``-bit AND of two words with a single bus gate."""
+    a, b = Switch(width=width), Switch(width=width)
+    gate, bulb = AndGate(width=width), Bulb(width=width)
+    wire(a.outputPins[0], gate.inputPins[0])
+    wire(b.outputPins[0], gate.inputPins[1])
+    wire(gate.outputPins[0], bulb.inputPins[0])
+    return [a, b], bulb
+
+def bitAnd(width: int) -> Tuple[List[Switch], List[Bulb]]:
+    """Build a ``width``-bit AND of two words from one gate per bit."""
+    switches, bulbs = [], []
+    for _ in range(width):
+        a, b = Switch(), Switch()
+        gate, bulb = AndGate(), Bulb()
+        wire(a.outputPins[0], gate.inputPins[0])
+        wire(b.outputPins[0], gate.inputPins[1])
+        wire(gate.outputPins[0], bulb.inputPins[0])
+        switches += [a, b]
+        bulbs.append(bulb)
+    return switches, bulbs
+
+def wideParity(inputs: int) -> Tuple[List[Switch], Bulb]:
+    """Build the parity of ``inputs`` switches with a single N-input XOR gate."""
+    switches = [Switch() for _ in range(inputs)]
+    gate, bulb = XorGate(numInputs=inputs), Bulb()
+    for switch, pin in zip(switches, gate.inputPins):
+        wire(switch.outputPins[0], pin)
+    wire(gate.outputPins[0], bulb.inputPins[0])
+    return switches, bulb
+
+def treeParity(inputs: int) -> Tuple[List[Switch], Bulb]:
+    """Build the parity of ``inputs`` switches with a tree of two-input XOR gates."""
+    switches = [Switch() for _ in range(inputs)]
+    outputs = [switch.outputPins[0] for switch in switches]
+    while len(outputs) > 1:
+        paired = []
+        for left, right in zip(outputs[::2], outputs[1::2]):
+            gate = XorGate()
+            wire(left, gate.inputPins[0])
+            wire(right, gate.inputPins[1])
+            paired.append(gate.outputPins[0])
+        if len(outputs) % 2:
+            paired.append(outputs[-1])
+        outputs = paired
+    bulb = Bulb()
+    wire(outputs[0], bulb.inputPins[0])
+    return switches, bulb
+
+def timeWrites(write: Callable[[int], None], repeats: int = 2000) -> float:
+    """Return the mean time in seconds of a write of alternating values."""
+    start = time.perf_counter()
+    for repeat in range(repeats):
+        write(repeat)
+    return (time.perf_counter() - start) / repeats
+
+def main():
+    print("AND of two words (write of a new word to one operand)")
+    for width in (8, 32, 64):
+        (a, b), _ = wordAnd(width)
+        b.setValue(b.mask)
+        word = timeWrites(lambda repeat: a.setValue(repeat))
+        switches, _ = bitAnd(width)
+        for switch in switches[1::2]:
+            switch.toggle()
+        operands = switches[0::2]
+
+        def writeBits(repeat):
+            for bit, switch in enumerate(operands):
+                if bool(repeat >> bit & 1) != switch.value:
+                    switch.toggle()
+
+        bits = timeWrites(writeBits)
+        print(f"  {width:>2} bits: bus {countObjects([a, b]):>4} objects {word * 1e6:7.1f} us, "
+              f"bit-level {countObjects(switches):>5} objects {bits * 1e6:8.1f} us")
+
+    print("parity of N switches (toggle of one input)")
+    for inputs in (8, 32, 128):
+        switches, _ = wideParity(inputs)
+        wide = timeWrites(lambda repeat: switches[repeat % inputs].toggle())
+        treeSwitches, _ = treeParity(inputs)
+        tree = timeWrites(lambda repeat: treeSwitches[repeat % inputs].toggle())
+        print(f"  {inputs:>3} inputs: N-input gate {countObjects(switches):>4} objects {wide * 1e6:6.1f} us, "
+              f"gate tree {countObjects(treeSwitches):>4} objects {tree * 1e6:6.1f} us")
+
+if __name__ == "__main__":
+    main()
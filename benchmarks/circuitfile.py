@@ -0,0 +1,68 @@
+"""Measure saving and loading circuit files.
+
+A random netlist of 500k gates is saved with positions, then opened and
+rebuilt as a :class:`Netlist` in bulk; a smaller adder measures the
+object model path.
+
+Run from the repository root with ``python -m benchmarks.circuitfile``.
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.circuits import rippleCarryAdder
+from logicsimulator.model.CircuitFile import CircuitFile
+from logicsimulator.model.CompiledCircuit import CompiledCircuit
+from logicsimulator.model.Netlist import Netlist
+
+def randomNetlist(gates: int, inputs: int, seed: int = 0) -> Netlist:
+    """Return a random netlist of two-input gates driven by ``inputs`` switches."""
+    rng = random.Random(seed)
+    netlist = Netlist()
+    for _ in range(inputs):
+        netlist.addComponent("Switch")
+    for index in range(inputs, inputs + gates):
+        netlist.addComponent(rng.choice(("AndGate", "OrGate", "XorGate", "NandGate")))
+        for pin in range(2):
+            # Prefer recent signals, as in real netlists.
+            netlist.connect(max(0, index - 1 - int(rng.expovariate(1 / 50))), index, pin)
+    netlist.evaluate()
+    return netlist
+
+def timed(label: str, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"  {label:<36} {(time.perf_counter() - start) * 1e3:8.1f} ms")
+    return result
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "circuit.lsim")
+        netlist = randomNetlist(500000, 1000)
+        positions = [(float(index % 1000), float(index // 1000)) for index in range(len(netlist))]
+        timed("save 501k-component netlist", lambda: CircuitFile.write(path, netlist, positions))
+        print(f"  {'file size':<36} {os.path.getsize(path) / 1e6:8.1f} MB")
+
+        def load():
+            with CircuitFile(path) as file:
+                return file.toNetlist(), file.positions()
+
+        loaded, _ = timed("open and load as netlist + positions", load)
+        assert [loaded.value(index) for index in range(0, len(loaded), 997)] == [
+            netlist.value(index) for index in range(0, len(netlist), 997)
+        ]
+
+        switches, _ = rippleCarryAdder(4000)
+        components = CompiledCircuit(switches).components
+        timed(f"save {len(components)}-component object model", lambda: CircuitFile.write(path, components))
+
+        def loadComponents():
+            with CircuitFile(path) as file:
+                return file.toComponents()
+
+        timed(f"load {len(components)}-component object model", loadComponents)
+
+if __name__ == "__main__":
+    main()
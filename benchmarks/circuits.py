@@ -0,0 +1,130 @@
+"""Circuit builders shared by the benchmark scripts."""
+
+from typing import List, Tuple
+
+from logicsimulator.model.Bulb import Bulb
+from logicsimulator.model.Gates import AndGate, OrGate, XorGate
+from logicsimulator.model.Netlist import Netlist
+from logicsimulator.model.Pin import Connection, OutputPin, InputPin
+from logicsimulator.model.Sequential import Clock, DFlipFlop
+from logicsimulator.model.Switch import Switch
+
+def wire(source: OutputPin, target: InputPin) -> Connection:
+    """Connect an output pin to an input pin, failing loudly if it is refused."""
+    connection = Connection.create(source, target)
+    if connection is None:
+        raise RuntimeError("connection refused")
+    return connection
+
+def fullAdder(a: OutputPin, b: OutputPin, carryIn: OutputPin) -> Tuple[OutputPin, OutputPin]:
+    """Build a five-gate full adder and return its sum and carry outputs."""
+    halfSum, sumGate = XorGate(), XorGate()
+    generate, propagate, carry = AndGate(), AndGate(), OrGate()
+    wire(a, halfSum.inputPins[0])
+    wire(b, halfSum.inputPins[1])
+    wire(halfSum.outputPins[0], sumGate.inputPins[0])
+    wire(carryIn, sumGate.inputPins[1])
+    wire(a, generate.inputPins[0])
+    wire(b, generate.inputPins[1])
+    wire(halfSum.outputPins[0], propagate.inputPins[0])
+    wire(carryIn, propagate.inputPins[1])
+    wire(generate.outputPins[0], carry.inputPins[0])
+    wire(propagate.outputPins[0], carry.inputPins[1])
+    return sumGate.outputPins[0], carry.outputPins[0]
+
+def rippleCarryAdder(bits: int) -> Tuple[List[Switch], List[Bulb]]:
+    """Build a ``bits``-wide ripple-carry adder.
+
+    Returns:
+        Tuple[List[Switch], List[Bulb]]: The switches (carry in, then ``a`` and
+        ``b`` interleaved from the least significant bit) and the bulbs (the
+        sum bits, then the carry out).
+    """
+    carryIn = Switch()
+    switches, bulbs = [carryIn], []
+    carry = carryIn.outputPins[0]
+    for _ in range(bits):
+        a, b = Switch(), Switch()
+        switches += [a, b]
+        total, carry = fullAdder(a.outputPins[0], b.outputPins[0], carry)
+        bulb = Bulb()
+        wire(total, bulb.inputPins[0])
+        bulbs.append(bulb)
+    bulb = Bulb()
+    wire(carry, bulb.inputPins[0])
+    bulbs.append(bulb)
+    return switches, bulbs
+
+def reconvergentChain(depth: int) -> Tuple[Switch, Bulb]:
+    """Build a chain of AND gates whose two inputs share the same driver.
+
+    Every stage doubles the number of paths from the switch to the bulb, which
+    is the worst case for the recursive observer chain.
+    """
+    switch = Switch()
+    output = switch.outputPins[0]
+    for _ in range(depth):
+        gate = AndGate()
+        wire(output, gate.inputPins[0])
+        wire(output, gate.inputPins[1])
+        output = gate.outputPins[0]
+    bulb = Bulb()
+    wire(output, bulb.inputPins[0])
+    return switch, bulb
+
+def counter(bits: int) -> Tuple[Clock, Switch, List[DFlipFlop]]:
+    """Build a ``bits``-wide synchronous binary counter.
+
+    Every flip-flop loads its own value XOR the carry of the lower bits, so
+    the counter increments on every clock cycle while the enable switch is on.
+
+    Returns:
+        Tuple[Clock, Switch, List[DFlipFlop]]: The clock, the enable switch
+        (initially off) and the flip-flops, from the least significant bit.
+    """
+    clock, enable = Clock(), Switch()
+    carry = enable.outputPins[0]
+    flipFlops = []
+    for _ in range(bits):
+        flipFlop, total, nextCarry = DFlipFlop(), XorGate(), AndGate()
+        wire(flipFlop.outputPins[0], total.inputPins[0])
+        wire(carry, total.inputPins[1])
+        wire(flipFlop.outputPins[0], nextCarry.inputPins[0])
+        wire(carry, nextCarry.inputPins[1])
+        wire(total.outputPins[0], flipFlop.inputPins[0])
+        wire(clock.outputPins[0], flipFlop.clockPin)
+        carry = nextCarry.outputPins[0]
+        flipFlops.append(flipFlop)
+    return clock, enable, flipFlops
+
+def rippleCarryAdderNetlist(bits: int) -> Tuple[Netlist, List[int], List[int]]:
+    """Build the adder of :func:`rippleCarryAdder` directly in a :class:`Netlist`.
+
+    Returns:
+        Tuple[Netlist, List[int], List[int]]: The netlist and the indices of
+        its switches and bulbs, in the same order as :func:`rippleCarryAdder`.
+    """
+    netlist = Netlist()
+    carry = netlist.addComponent("Switch")
+    switches, bulbs = [carry], []
+    for _ in range(bits):
+        a, b = netlist.addComponent("Switch"), netlist.addComponent("Switch")
+        switches += [a, b]
+        halfSum, total = netlist.addComponent("XorGate"), netlist.addComponent("XorGate")
+        generate, propagate = netlist.addComponent("AndGate"), netlist.addComponent("AndGate")
+        carryOut = netlist.addComponent("OrGate")
+        for source, target, pin in (
+            (a, halfSum, 0), (b, halfSum, 1), (halfSum, total, 0), (carry, total, 1),
+            (a, generate, 0), (b, generate, 1), (halfSum, propagate, 0), (carry, propagate, 1),
+            (generate, carryOut, 0), (propagate, carryOut, 1),
+        ):
+            netlist.connect(source, target, pin)
+        bulb = netlist.addComponent("Bulb")
+        netlist.connect(total, bulb, 0)
+        bulbs.append(bulb)
+        carry = carryOut
+    bulb = netlist.addComponent("Bulb")
+    netlist.connect(carry, bulb, 0)
+    bulbs.append(bulb)
+    netlist.evaluate()
+    return netlist, switches, bulbs
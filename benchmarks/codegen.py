@@ -0,0 +1,86 @@
+"""Compare headless evaluation of random input vectors across engines.
+
+Every engine evaluates the same random vectors on a ripple-carry adder: the
+observer chain and the compiled circuit toggle the switches that differ from
+the previous vector, the netlist sets them, and the generated function
+evaluates the whole vector at once (and 64 vectors per call in bit-parallel
+mode).
+
+Run from the repository root with ``python -m benchmarks.codegen``.
+"""
+
+import random
+import sys
+import time
+
+from benchmarks.circuits import rippleCarryAdder
+from logicsimulator.model.CodeGenerator import GeneratedCircuit
+from logicsimulator.model.CompiledCircuit import CompiledCircuit
+from logicsimulator.model.Netlist import Netlist
+
+def main():
+    sys.setrecursionlimit(1_000_000)
+    rng = random.Random(0)
+    for bits in (16, 64):
+        count = 500
+        switches, bulbs = rippleCarryAdder(bits)
+        vectors = [[rng.getrandbits(1) for _ in switches] for _ in range(count)]
+
+        start = time.perf_counter()
+        for vector in vectors:
+            for switch, value in zip(switches, vector):
+                if switch.value != value:
+                    switch.toggle()
+            [bulb.value for bulb in bulbs]
+        observer = (time.perf_counter() - start) / count
+
+        circuit = CompiledCircuit(switches)
+        start = time.perf_counter()
+        for vector in vectors:
+            for switch, value in zip(switches, vector):
+                if switch.value != value:
+                    circuit.toggle(switch)
+            [bulb.value for bulb in bulbs]
+        compiled = (time.perf_counter() - start) / count
+
+        netlist, index = Netlist.fromComponents(switches)
+        positions = [index[switch] for switch in switches]
+        start = time.perf_counter()
+        for vector in vectors:
+            for position, value in zip(positions, vector):
+                if netlist.value(position) != value:
+                    netlist.setValue(position, value)
+        arrays = (time.perf_counter() - start) / count
+
+        start = time.perf_counter()
+        generated = GeneratedCircuit(netlist)
+        compileTime = time.perf_counter() - start
+        start = time.perf_counter()
+        GeneratedCircuit(Netlist.fromComponents(rippleCarryAdder(bits)[0])[0])
+        cachedTime = time.perf_counter() - start
+        function = generated.function
+        # Inputs of the function are in netlist order.
+        order = sorted(range(len(switches)), key=lambda position: positions[position])
+        inputs = [[vector[position] for position in order] for vector in vectors]
+        start = time.perf_counter()
+        for vector in inputs:
+            function(vector)
+        straight = (time.perf_counter() - start) / count
+
+        words = [rng.getrandbits(64) for _ in switches]
+        mask = (1 << 64) - 1
+        start = time.perf_counter()
+        for _ in range(count):
+            function(words, mask)
+        parallel = (time.perf_counter() - start) / (64 * count)
+
+        print(f"{5 * bits}-gate adder, time per vector:")
+        print(f"  observer chain {observer * 1e6:8.1f} us")
+        print(f"  compiled       {compiled * 1e6:8.1f} us")
+        print(f"  netlist        {arrays * 1e6:8.1f} us")
+        print(f"  generated      {straight * 1e6:8.1f} us ({observer / straight:5.1f}x the observer chain)")
+        print(f"  generated x64  {parallel * 1e6:8.3f} us")
+        print(f"  code generation {compileTime * 1e3:.1f} ms, cached netlist build and lookup {cachedTime * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Count component evaluations per switch toggle.
+
+Propagation stops at the first component whose value is stable, so the number
+of evaluations per toggle is compared with the size of the downstream cone,
+which is what an unconditional flood would evaluate (once per path for the
+observer chain).
+
+Run from the repository root with ``python -m benchmarks.evaluations``.
+"""
+
+import random
+import sys
+from collections import Counter
+
+from benchmarks.circuits import rippleCarryAdder, reconvergentChain
+from logicsimulator.model.Bulb import Bulb
+from logicsimulator.model.CompiledCircuit import CompiledCircuit
+from logicsimulator.model.Gates import AndGate, OrGate, XorGate, NotGate
+
+evaluations = Counter()
+
+def countEvaluations():
+    """Wrap the ``_evaluate`` method of every gate type to count its calls."""
+    for cls in (AndGate, OrGate, XorGate, NotGate, Bulb):
+        def counted(self, evaluate=cls._evaluate):
+            evaluations["total"] += 1
+            evaluate(self)
+        cls._evaluate = counted
+
+def coneSize(switch) -> int:
+    """Return the number of components downstream of ``switch``."""
+    seen, stack = set(), [switch]
+    while stack:
+        component = stack.pop()
+        for successor in component.successors():
+            if successor not in seen:
+                seen.add(successor)
+                stack.append(successor)
+    return len(seen)
+
+def measure(name, switches, toggles, circuit):
+    """Report the mean evaluations per toggle for both propagation engines."""
+    rng = random.Random(0)
+    picks = [rng.choice(switches) for _ in range(toggles)]
+    cone = sum(coneSize(switch) for switch in picks) / toggles
+    evaluations.clear()
+    for switch in picks:
+        switch.toggle()
+    observer = evaluations["total"] / toggles
+    evaluations.clear()
+    for switch in picks:
+        circuit.toggle(switch)
+    compiled = evaluations["total"] / toggles
+    print(f"{name:<28} cone {cone:9.1f}   observer chain {observer:8.1f}   compiled {compiled:8.1f}")
+
+def main():
+    sys.setrecursionlimit(1_000_000)
+    countEvaluations()
+    for depth in (8, 16):
+        switch, _ = reconvergentChain(depth)
+        measure(f"reconvergent chain {depth}", [switch], 100, CompiledCircuit([switch]))
+    for bits in (16, 256):
+        switches, _ = rippleCarryAdder(bits)
+        measure(f"ripple-carry adder {bits}", switches, 1000, CompiledCircuit(switches))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Measure fault coverage grading with the parallel-fault simulator.
+
+A word size of 1 simulates the faulty machines one at a time, which is the
+serial baseline for the wider words.
+
+Run from the repository root with ``python -m benchmarks.faults``.
+"""
+
+import random
+import time
+
+from benchmarks.circuits import rippleCarryAdder
+from logicsimulator.model.FaultSimulator import FaultSimulator
+
+def main():
+    rng = random.Random(0)
+    for bits in (8, 32):
+        switches, bulbs = rippleCarryAdder(bits)
+        vectors = [[rng.getrandbits(1) for _ in switches] for _ in range(32)]
+        print(f"{5 * bits}-gate adder, {len(vectors)} random vectors")
+        for wordSize, dropping in ((1, True), (64, False), (64, True), (1024, True)):
+            simulator = FaultSimulator(switches, bulbs, wordSize)
+            start = time.perf_counter()
+            report = simulator.run(vectors, dropping)
+            elapsed = time.perf_counter() - start
+            print(f"  word {wordSize:>4}, dropping {'on ' if dropping else 'off'}: "
+                  f"{elapsed * 1e3:8.1f} ms, {report}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Measure the import time of ``.bench`` and BLIF netlists.
+
+The ISCAS circuits are not shipped with the repository, so random circuits
+of the same size are generated: one with the gate, input and output counts
+of c7552, and one of 100k gates. Pass the paths of real ``.bench`` files
+to time them instead.
+
+Run from the repository root with ``python -m benchmarks.importers``.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from logicsimulator.model.Importer import BenchImporter, BlifImporter
+
+def randomCircuit(gates: int, inputs: int, outputs: int, seed: int = 0):
+    """Return random gates ``(name, kind, inputs)`` in topological order, with the input and output names."""
+    rng = random.Random(seed)
+    signals = [f"I{index}" for index in range(inputs)]
+    circuit = []
+    for index in range(gates):
+        kind = rng.choice(("AND", "NAND", "OR", "NOR", "XOR", "NOT", "BUFF"))
+        count = 1 if kind in ("NOT", "BUFF") else rng.choice((2, 2, 2, 3, 4))
+        # Prefer recent signals, as in real netlists.
+        fanins = [signals[max(0, len(signals) - 1 - int(rng.expovariate(1 / 50)))] for _ in range(count)]
+        circuit.append((f"G{index}", kind, fanins))
+        signals.append(f"G{index}")
+    return circuit, signals[:inputs], signals[-outputs:]
+
+def writeBench(path: str, circuit, inputs, outputs) -> None:
+    with open(path, "w") as file:
+        file.writelines(f"INPUT({name})\n" for name in inputs)
+        file.writelines(f"OUTPUT({name})\n" for name in outputs)
+        file.writelines(f"{name} = {kind}({', '.join(fanins)})\n" for name, kind, fanins in circuit)
+
+def writeBlif(path: str, circuit, inputs, outputs) -> None:
+    covers = {
+        "AND": lambda n: [("1" * n, "1")],
+        "NAND": lambda n: [("1" * n, "0")],
+        "OR": lambda n: [("-" * i + "1" + "-" * (n - i - 1), "1") for i in range(n)],
+        "NOR": lambda n: [("-" * i + "1" + "-" * (n - i - 1), "0") for i in range(n)],
+        "XOR": lambda n: [(f"{k:0{n}b}", "1") for k in range(1 << n) if bin(k).count("1") % 2],
+        "NOT": lambda n: [("0", "1")],
+        "BUFF": lambda n: [("1", "1")],
+    }
+    with open(path, "w") as file:
+        file.write(f".model random\n.inputs {' '.join(inputs)}\n.outputs {' '.join(outputs)}\n")
+        for name, kind, fanins in circuit:
+            file.write(f".names {' '.join(fanins)} {name}\n")
+            file.writelines(f"{row} {value}\n" for row, value in covers[kind](len(fanins)))
+        file.write(".end\n")
+
+def timeImport(importer, path: str) -> None:
+    start = time.perf_counter()
+    imported = importer.read(path)
+    elapsed = time.perf_counter() - start
+    print(f"  {importer.__name__:<13} {os.path.basename(path):<16} {len(imported.netlist):>7} components: {elapsed * 1e3:8.1f} ms")
+
+def main():
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            timeImport(BlifImporter if path.endswith(".blif") else BenchImporter, path)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        for name, gates, inputs, outputs in (("c7552-sized", 3512, 207, 108), ("100k", 100000, 1000, 1000)):
+            circuit, inputNames, outputNames = randomCircuit(gates, inputs, outputs)
+            bench = os.path.join(directory, f"{name}.bench")
+            blif = os.path.join(directory, f"{name}.blif")
+            writeBench(bench, circuit, inputNames, outputNames)
+            writeBlif(blif, circuit, inputNames, outputNames)
+            timeImport(BenchImporter, bench)
+            timeImport(BlifImporter, blif)
+
+if __name__ == "__main__":
+    main()
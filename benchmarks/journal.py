@@ -0,0 +1,121 @@
+"""Measure journaling commands and recovering sessions after a crash.
+
+A session adds components one command at a time, then "crashes" in three
+ways, each checked after recovery:
+
+* the journal ends with a torn record, which is dropped;
+* a compaction stopped after its ``compact`` record, before the new
+  snapshot replaced the old one, which is completed;
+* the snapshot cannot be loaded, which moves the session aside and starts
+  an empty one.
+
+A last session compacts its journal while working and checks that the
+commands done before the compaction can still be undone and redone, and
+that the result survives a crash, as does a subcircuit type created in
+the session but only used after the compaction.
+
+Like the editor, this needs PySide6 for the view-model layer.
+
+Run from the repository root with ``python -m benchmarks.journal``.
+"""
+
+import os
+import tempfile
+import time
+
+from PySide6.QtCore import QPointF
+
+from logicsimulator.core.registry import ComponentRegistry
+from logicsimulator.viewmodel.CanvasVM import CanvasVM
+from logicsimulator.viewmodel.command.CommandManager import CommandManager
+from logicsimulator.viewmodel.command.Journal import CommandJournal
+
+def openSession(directory: str):
+    """Open the session stored in a directory, as the editor does at startup."""
+    canvasVM = CanvasVM()
+    journal = CommandJournal(os.path.join(directory, "session.journal"), os.path.join(directory, "session.lsim"))
+    manager = CommandManager(canvasVM, journal)
+    manager.recover()
+    return canvasVM, journal, manager
+
+def timed(label: str, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"  {label:<40} {(time.perf_counter() - start) * 1e3:8.1f} ms")
+    return result
+
+def main():
+    commands = 2000
+    with tempfile.TemporaryDirectory() as directory:
+        canvasVM, journal, manager = openSession(directory)
+
+        def addComponents():
+            for index in range(commands):
+                manager.createCommand("AddComponents", componentTypeList=["AndGate"], posList=[QPointF(index, 0)])
+
+        timed(f"journal {commands} commands", addComponents)
+        ids = set(canvasVM.components)
+        print(f"  {'journal size':<40} {journal.size / 1e3:8.1f} kB")
+
+        # Crash while a record is written: its frame is torn.
+        journal.close()
+        with open(os.path.join(directory, "session.journal"), "ab") as file:
+            file.write(b"\xff\x00\x00\x00torn")
+        canvasVM, journal, manager = timed("recover by replaying the journal", lambda: openSession(directory))
+        assert set(canvasVM.components) == ids
+
+        # Crash during a compaction, after the compact record: the new
+        # snapshot is still the temporary file.
+        snapshot = os.path.join(directory, "session.lsim")
+        canvasVM.save(snapshot + ".tmp")
+        journal._write(("compact", "", {}), sync=True)
+        journal.close()
+        canvasVM, journal, manager = timed("recover an interrupted compaction", lambda: openSession(directory))
+        assert set(canvasVM.components) == ids
+        assert journal.size == len(CommandJournal.MAGIC) and not os.path.exists(snapshot + ".tmp")
+
+        # A snapshot that cannot be loaded is moved aside.
+        journal.close()
+        with open(snapshot, "r+b") as file:
+            file.write(b"XXXX")
+        canvasVM, journal, manager = openSession(directory)
+        assert not canvasVM.components and os.path.exists(snapshot + ".broken")
+        journal.close()
+
+        # Compacting keeps the history: undoing past the snapshot is
+        # journaled as a new snapshot.
+        with tempfile.TemporaryDirectory() as other:
+            canvasVM, journal, manager = openSession(other)
+            journal._threshold = 1000
+            for index in range(100):
+                manager.createCommand("AddComponents", componentTypeList=["AndGate"], posList=[QPointF(index, 0)])
+            assert journal.size < 1000
+            for _ in range(60):
+                manager.undo()
+            for _ in range(10):
+                manager.redo()
+            assert len(canvasVM.components) == 50
+
+            # A subcircuit type is journaled, and kept by the compaction.
+            manager.createCommand("AddComponents", componentTypeList=["Switch", "NotGate", "Bulb"], posList=[QPointF()] * 3)
+            switch, gate, bulb = list(canvasVM.components)[-3:]
+            for source, target in ((switch, gate), (gate, bulb)):
+                manager.createCommand(
+                    "CreateConnection",
+                    parentPinPair1=(source, next(iter(canvasVM.components[source].outputPins))),
+                    parentPinPair2=(target, next(iter(canvasVM.components[target].inputPins))),
+                )
+            canvasVM.createSubcircuit("JournaledInverter", [switch, gate, bulb])
+            manager.compact()
+            manager.createCommand("AddComponents", componentTypeList=["JournaledInverter"], posList=[QPointF()])
+            ids = set(canvasVM.components)
+            journal.close()
+            # A new process does not have the type registered.
+            del ComponentRegistry._registered["JournaledInverter"], ComponentRegistry._registry["JournaledInverter"]
+            canvasVM, journal, manager = openSession(other)
+            assert set(canvasVM.components) == ids
+            journal.close()
+        print("  recovery checks passed")
+
+if __name__ == "__main__":
+    main()
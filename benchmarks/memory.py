@@ -0,0 +1,30 @@
+"""Compare the memory used by the object model and the array-backed netlist.
+
+Run from the repository root with ``python -m benchmarks.memory``.
+"""
+
+import gc
+import tracemalloc
+
+from benchmarks.circuits import rippleCarryAdder, rippleCarryAdderNetlist
+
+def measure(build, bits) -> int:
+    """Return the traced memory in bytes held by an adder built by ``build``."""
+    gc.collect()
+    tracemalloc.start()
+    circuit = build(bits)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del circuit
+    return size
+
+def main():
+    for bits in (1000, 20000):
+        gates = 5 * bits
+        objects = measure(rippleCarryAdder, bits)
+        arrays = measure(rippleCarryAdderNetlist, bits)
+        print(f"{gates:>7} gates: objects {objects / gates:6.0f} B/gate, "
+              f"netlist {arrays / gates:4.0f} B/gate, {objects / arrays:5.1f}x smaller")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Time observer registration and notification on a net with a large fan-out.
+
+Run from the repository root with ``python -m benchmarks.observers``.
+"""
+
+import time
+
+from logicsimulator.model.Observer import Observable, Observer
+
+class Counter(Observer):
+    """Observer counting the notifications it receives."""
+
+    def __init__(self):
+        self.count = 0
+
+    def update(self, **kwargs) -> None:
+        self.count += 1
+
+class ListObservable(Observable):
+    """Observable backed by a list, as observers were stored before."""
+
+    def __init__(self):
+        self._observers = []
+
+    def attach(self, observer: Observer) -> None:
+        if observer not in self._observers:
+            self._observers.append(observer)
+
+    def detach(self, observer: Observer) -> None:
+        if observer in self._observers:
+            self._observers.remove(observer)
+
+def measure(observable: Observable, fanout: int):
+    """Return the seconds spent attaching, notifying and detaching ``fanout`` observers."""
+    observers = [Counter() for _ in range(fanout)]
+    start = time.perf_counter()
+    for observer in observers:
+        observable.attach(observer)
+    attached = time.perf_counter()
+    observable.notify()
+    notified = time.perf_counter()
+    for observer in reversed(observers):
+        observable.detach(observer)
+    detached = time.perf_counter()
+    assert all(observer.count == 1 for observer in observers)
+    return attached - start, notified - attached, detached - notified
+
+def main():
+    for fanout in (1000, 10000):
+        print(f"fan-out {fanout}")
+        for name, observable in (("list", ListObservable()), ("ordered set", Observable())):
+            attach, notify, detach = measure(observable, fanout)
+            print(f"  {name:>11}: attach {attach * 1e3:8.2f} ms, notify {notify * 1e3:6.2f} ms, "
+                  f"detach {detach * 1e3:8.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Measure the logic optimizer on a circuit with heavy redundancy.
+
+The circuit is a ripple-carry adder built twice from the same switches, as
+flattened netlists often duplicate shared logic. Both copies of every sum and
+carry are combined by an OR gate, the carry-in is tied to 0 and half of the
+``b`` operand to 1, and a debug cone of gates drives no bulb.
+
+Run from the repository root with ``python -m benchmarks.optimizer``.
+"""
+
+import random
+import time
+from typing import List, Tuple
+
+from benchmarks.circuits import fullAdder, wire
+from logicsimulator.model.Bulb import Bulb
+from logicsimulator.model.Gates import AndGate, OrGate, XorGate
+from logicsimulator.model.Netlist import Netlist
+from logicsimulator.model.Optimizer import LogicOptimizer
+from logicsimulator.model.Switch import Switch
+
+def redundantAdder(bits: int) -> Tuple[List[Switch], List[Bulb], dict]:
+    """Build the redundant adder, returning its switches, bulbs and tied switches."""
+    carryIn = Switch()
+    switches = [carryIn]
+    constants = {carryIn: False}
+    bulbs = []
+    carries = [carryIn.outputPins[0], carryIn.outputPins[0]]
+    for bit in range(bits):
+        a, b = Switch(), Switch()
+        switches += [a, b]
+        if bit % 2:
+            constants[b] = True
+        sums = []
+        for copy in range(2):
+            total, carries[copy] = fullAdder(a.outputPins[0], b.outputPins[0], carries[copy])
+            sums.append(total)
+        merged = OrGate()
+        wire(sums[0], merged.inputPins[0])
+        wire(sums[1], merged.inputPins[1])
+        bulb = Bulb()
+        wire(merged.outputPins[0], bulb.inputPins[0])
+        bulbs.append(bulb)
+        # Debug logic left behind: reaches no bulb.
+        probe = XorGate()
+        wire(a.outputPins[0], probe.inputPins[0])
+        wire(carries[0], probe.inputPins[1])
+        latch = AndGate()
+        wire(probe.outputPins[0], latch.inputPins[0])
+        wire(b.outputPins[0], latch.inputPins[1])
+    carryOut = OrGate()
+    wire(carries[0], carryOut.inputPins[0])
+    wire(carries[1], carryOut.inputPins[1])
+    bulb = Bulb()
+    wire(carryOut.outputPins[0], bulb.inputPins[0])
+    bulbs.append(bulb)
+    for switch, value in constants.items():
+        if value:
+            switch.toggle()
+    return switches, bulbs, constants
+
+def timeToggles(netlist: Netlist, switches: List[int], toggles: int = 2000) -> float:
+    """Return the mean time in seconds of a toggle of a random switch."""
+    rng = random.Random(0)
+    picks = [rng.choice(switches) for _ in range(toggles)]
+    start = time.perf_counter()
+    for switch in picks:
+        netlist.toggle(switch)
+    return (time.perf_counter() - start) / toggles
+
+def main():
+    for bits in (64, 1024):
+        switches, bulbs, constants = redundantAdder(bits)
+        original, originalIndex = Netlist.fromComponents(switches)
+        optimized, index, report = LogicOptimizer(switches, constants).run()
+        free = [switch for switch in switches if switch not in constants]
+        before = timeToggles(original, [originalIndex[switch] for switch in free])
+        after = timeToggles(optimized, [index[switch] for switch in free])
+        print(f"{bits}-bit redundant adder: {report}")
+        print(f"  toggle: original {before * 1e6:8.1f} us, optimized {after * 1e6:8.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Compare partitioned and single-process random-vector throughput.
+
+The single-process baseline evaluates the generated function of the whole
+netlist; the partitioned runs split it into ``K`` parts simulated by ``K``
+pipelined worker processes. Partitioning can only pay off with at least
+``K`` idle CPUs; on the single-CPU machine it was developed on, every
+partitioned run was slower than the baseline (0.54x, 0.44x and 0.21x for
+2, 4 and 8 parts), so no speedup has been measured.
+
+Run from the repository root with ``python -m benchmarks.partition``.
+"""
+
+import os
+import time
+
+from benchmarks.circuits import rippleCarryAdder
+from logicsimulator.model.BatchSimulator import BatchSimulator
+from logicsimulator.model.Netlist import Netlist
+from logicsimulator.model.Partition import Partition
+from logicsimulator.model.PartitionedSimulator import PartitionedSimulator
+
+def main():
+    switches, _ = rippleCarryAdder(256)
+    netlist, _ = Netlist.fromComponents(switches)
+    vectors = 1 << 20
+    print(f"1280-gate adder, {vectors} random vectors, {os.cpu_count() or 1} CPUs")
+    with BatchSimulator(netlist, workers=1) as simulator:
+        start = time.perf_counter()
+        simulator.random(vectors)
+        baseline = vectors / (time.perf_counter() - start)
+    print(f"  single process: {baseline / 1e6:7.2f} M vectors/s")
+    for parts in (2, 4, 8):
+        start = time.perf_counter()
+        partition = Partition.compute(netlist, parts)
+        partitioning = time.perf_counter() - start
+        simulator = PartitionedSimulator(partition)
+        start = time.perf_counter()
+        simulator.random(vectors)
+        throughput = vectors / (time.perf_counter() - start)
+        print(f"  {parts} parts: {throughput / 1e6:7.2f} M vectors/s, speedup {throughput / baseline:5.2f}x, "
+              f"{len(partition.cutNets())} cut nets, sizes {partition.sizes()}, partitioned in {partitioning * 1e3:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Compare the recursive observer chain with the levelized compiled engine.
+
+Run from the repository root with ``python -m benchmarks.propagation``.
+"""
+
+import sys
+import time
+
+from benchmarks.circuits import rippleCarryAdder, reconvergentChain
+from logicsimulator.model.CompiledCircuit import CompiledCircuit
+
+def timeToggles(toggle, switches) -> float:
+    """Return the mean time in seconds to toggle each switch twice."""
+    start = time.perf_counter()
+    for switch in switches:
+        toggle(switch)
+        toggle(switch)
+    return (time.perf_counter() - start) / (2 * len(switches))
+
+def main():
+    sys.setrecursionlimit(1_000_000)
+
+    print("reconvergent chain (toggle of the single switch)")
+    for depth in (8, 12, 16):
+        switch, bulb = reconvergentChain(depth)
+        observer = timeToggles(lambda s: s.toggle(), [switch])
+        circuit = CompiledCircuit([switch])
+        compiled = timeToggles(circuit.toggle, [switch])
+        print(f"  depth {depth:>3}: observer chain {observer * 1e3:9.3f} ms, compiled {compiled * 1e3:7.3f} ms")
+
+    print("ripple-carry adder with a = all ones (toggle of the carry-in switch)")
+    for bits in (64, 256, 4000):
+        switches, bulbs = rippleCarryAdder(bits)
+        gates = 5 * bits
+        carryIn = switches[0]
+        circuit = CompiledCircuit(switches)
+        for a in switches[1::2]:
+            circuit.toggle(a)
+        compiled = timeToggles(circuit.toggle, [carryIn])
+        if bits <= 256:
+            observer = f"{timeToggles(lambda s: s.toggle(), [carryIn]) * 1e3:9.3f} ms"
+        else:
+            observer = "      n/a"
+        print(f"  {gates:>6} gates: observer chain {observer}, compiled {compiled * 1e3:7.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Measure the startup cost of component discovery.
+
+A plugin pack of 1000 component types is installed in a temporary
+directory with its entry point, then fresh interpreters list the
+registered types: first without a manifest cache, which imports the pack,
+then with the cache, which imports no component module. The built-in types
+alone are timed the same way for comparison.
+
+Run from the repository root with ``python -m benchmarks.registry``.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+from logicsimulator.core.registry import ComponentRegistry
+types = ComponentRegistry.getAllComponents()
+elapsed = time.perf_counter() - start
+print(len(types), sum(name.startswith("logicsimulator.model.") or name.startswith("pack") for name in sys.modules), elapsed)
+"""
+
+def writePack(directory: str, types: int) -> None:
+    """Write a plugin pack of ``types`` gates and its distribution metadata."""
+    os.makedirs(os.path.join(directory, "pack"))
+    open(os.path.join(directory, "pack", "__init__.py"), "w").close()
+    with open(os.path.join(directory, "pack", "gates.py"), "w") as file:
+        file.write("from logicsimulator.model.Gates import AndGate\n")
+        for index in range(types):
+            file.write(f"class Gate{index}(AndGate):\n    type = 'Gate{index}'\n")
+    metadata = os.path.join(directory, "pack-1.0.dist-info")
+    os.makedirs(metadata)
+    with open(os.path.join(metadata, "METADATA"), "w") as file:
+        file.write("Metadata-Version: 2.1\nName: pack\nVersion: 1.0\n")
+    with open(os.path.join(metadata, "entry_points.txt"), "w") as file:
+        file.write("[logicsimulator.components]\npack = pack.gates\n")
+
+def probe(label: str, environment: dict) -> None:
+    output = subprocess.run([sys.executable, "-c", PROBE], env=environment, capture_output=True, text=True, check=True).stdout
+    types, modules, elapsed = output.split()
+    print(f"  {label:<36} {float(elapsed) * 1e3:8.1f} ms  {types:>5} types  {modules:>3} modules imported")
+
+def main():
+    with tempfile.TemporaryDirectory() as packs, tempfile.TemporaryDirectory() as cache:
+        writePack(packs, 1000)
+        root = os.getcwd()
+        environment = dict(os.environ, LOGICSIMULATOR_CACHE=os.path.join(cache, "components.json"))
+        probe("built-in types, no cache", dict(environment, PYTHONPATH=root))
+        probe("built-in types, cached", dict(environment, PYTHONPATH=root))
+        environment["PYTHONPATH"] = os.pathsep.join((root, packs))
+        probe("1000 plugin types, no cache", environment)
+        probe("1000 plugin types, cached", environment)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Measure the throughput of the clocked scheduler on a synchronous counter.
+
+After the measured runs, the model written back by :meth:`ClockedCircuit.sync`
+is checked to keep counting under the observer chain.
+
+Run from the repository root with ``python -m benchmarks.sequential``.
+"""
+
+import time
+
+from benchmarks.circuits import counter
+from logicsimulator.model.ClockedCircuit import ClockedCircuit
+
+def main():
+    for bits, cycles in ((8, 200_000), (32, 200_000), (256, 50_000)):
+        clock, enable, flipFlops = counter(bits)
+        enable.toggle()
+        circuit = ClockedCircuit([clock])
+        start = time.perf_counter()
+        circuit.run(cycles)
+        elapsed = time.perf_counter() - start
+        count = sum(flipFlop.value << bit for bit, flipFlop in enumerate(flipFlops))
+        assert count == cycles % (1 << bits)
+        print(f"{bits:>4}-bit counter: {cycles / elapsed:10,.0f} cycles/s")
+        for tick in range(1, 4):
+            clock.tick()
+            count = sum(flipFlop.value << bit for bit, flipFlop in enumerate(flipFlops))
+            assert count == (cycles + tick) % (1 << bits)
+
+    bits, cycles = 32, 2_000
+    clock, enable, flipFlops = counter(bits)
+    enable.toggle()
+    start = time.perf_counter()
+    for _ in range(cycles):
+        clock.tick()
+    elapsed = time.perf_counter() - start
+    print(f"{bits:>4}-bit counter, observer chain: {cycles / elapsed:10,.0f} cycles/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compare subcircuit instances with rebuilt component graphs.
+
+Run from the repository root with ``python -m benchmarks.subcircuits``.
+"""
+
+import gc
+import time
+import tracemalloc
+
+from benchmarks.circuits import rippleCarryAdder
+from logicsimulator.model.Bulb import Bulb
+from logicsimulator.model.CompiledCircuit import CompiledCircuit
+from logicsimulator.model.Subcircuit import SubcircuitTemplate
+from logicsimulator.model.Switch import Switch
+
+def adderTemplate(bits: int) -> SubcircuitTemplate:
+    """Compile a ``bits``-wide ripple-carry adder into a template."""
+    switches, bulbs = rippleCarryAdder(bits)
+    gates = [
+        component for component in CompiledCircuit(switches).components
+        if not isinstance(component, (Switch, Bulb))
+    ]
+    return SubcircuitTemplate(f"Adder{bits}", switches + gates + bulbs)
+
+def measure(build, count: int):
+    """Return the time in seconds and the traced bytes of ``count`` builds."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    built = [build() for _ in range(count)]
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return elapsed, size
+
+def main():
+    count = 2000
+    for bits in (4, 16):
+        template = adderTemplate(bits)
+        cls = template.componentClass
+        graphTime, graphSize = measure(lambda: rippleCarryAdder(bits), count)
+        # Component graphs built by the adder include their switches and bulbs.
+        cellTime, cellSize = measure(lambda: (cls(), [Switch() for _ in range(cls.numInputs)], [Bulb() for _ in range(cls.numOutputs)]), count)
+        print(f"{count} {bits}-bit adders ({5 * bits} gates, {template.size} state slots)")
+        print(f"  component graph: {graphTime * 1e6 / count:7.1f} us, {graphSize / count:7.0f} B per adder")
+        print(f"  subcircuit:      {cellTime * 1e6 / count:7.1f} us, {cellSize / count:7.0f} B per adder "
+              f"({graphSize / cellSize:.1f}x smaller)")
+
+if __name__ == "__main__":
+    main()
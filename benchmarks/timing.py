@@ -0,0 +1,50 @@
+"""Measure the event throughput of the timing simulator and count glitches.
+
+A counter simulated with clock edges is then synced and checked to keep
+counting under the observer chain.
+
+Run from the repository root with ``python -m benchmarks.timing``.
+"""
+
+import random
+import time
+
+from benchmarks.circuits import counter, rippleCarryAdder
+from logicsimulator.model.TimingSimulator import TimingSimulator
+
+def main():
+    random.seed(0)
+    for bits, vectors in ((64, 2000), (1024, 200)):
+        switches, bulbs = rippleCarryAdder(bits)
+        simulator = TimingSimulator(switches)
+        simulator.watch(*bulbs)
+        # A new random input vector every 10 time units, so that the long
+        # carry chains are still settling when the next vector arrives.
+        start = time.perf_counter()
+        for _ in range(vectors):
+            for switch in switches:
+                if random.random() < 0.5:
+                    simulator.toggle(switch)
+            simulator.run(simulator.now + 10)
+        simulator.run()
+        elapsed = time.perf_counter() - start
+        glitches = sum(len(simulator.pulses(bulb, 4)) for bulb in bulbs)
+        print(f"{5 * bits:>5} gates: {simulator.events:>9,} events, "
+              f"{simulator.events / elapsed:10,.0f} events/s, {glitches:>7,} glitches")
+
+    bits, cycles = 8, 1000
+    clock, enable, flipFlops = counter(bits)
+    enable.toggle()
+    simulator = TimingSimulator([clock])
+    for _ in range(2 * cycles):
+        simulator.toggle(clock, 20)
+        simulator.run()
+    simulator.sync()
+    for tick in range(4):
+        count = sum(flipFlop.value << bit for bit, flipFlop in enumerate(flipFlops))
+        assert count == (cycles + tick) % (1 << bits)
+        clock.tick()
+    print(f"{bits:>5}-bit counter: {cycles} cycles synced and checked")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Compare toggling many switches one by one and in a propagation batch.
+
+Run from the repository root with ``python -m benchmarks.transactions``.
+"""
+
+import random
+import time
+
+from benchmarks.circuits import rippleCarryAdder
+from logicsimulator.model.Batch import PropagationBatch
+from logicsimulator.model.CompiledCircuit import CompiledCircuit
+from logicsimulator.model.Observer import Observer
+
+class Counter(Observer):
+    """Observer counting its notifications, like a view-model relay."""
+
+    def __init__(self):
+        self.count = 0
+
+    def update(self, **kwargs) -> None:
+        self.count += 1
+
+def main():
+    rng = random.Random(0)
+    for bits in (32, 128):
+        switches, _ = rippleCarryAdder(bits)
+        counter = Counter()
+        for component in CompiledCircuit(switches).components:
+            for pin in component.outputPins or ():
+                pin.attach(counter)
+        rounds = [rng.sample(switches, 32) for _ in range(20)]
+        for name, batched in (("one by one", False), ("batch", True)):
+            counter.count = 0
+            start = time.perf_counter()
+            for toggled in rounds:
+                if batched:
+                    with PropagationBatch():
+                        for switch in toggled:
+                            switch.toggle()
+                else:
+                    for switch in toggled:
+                        switch.toggle()
+            elapsed = (time.perf_counter() - start) / len(rounds)
+            print(f"{5 * bits:>4}-gate adder, 32 toggles, {name:<10}: {elapsed * 1e3:7.3f} ms, "
+                  f"{counter.count / len(rounds):6.1f} output pin notifications")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compare random-vector simulation by toggling switches with bit-parallel simulation.
+
+Run from the repository root with ``python -m benchmarks.vectors``.
+"""
+
+import random
+import sys
+import time
+
+from benchmarks.circuits import rippleCarryAdder
+from logicsimulator.model.VectorSimulator import VectorSimulator
+
+def main():
+    sys.setrecursionlimit(1_000_000)
+    rng = random.Random(0)
+    bits, count = 32, 4096
+    switches, bulbs = rippleCarryAdder(bits)
+    vectors = [[rng.random() < 0.5 for _ in switches] for _ in range(count)]
+
+    start = time.perf_counter()
+    expected = []
+    for vector in vectors:
+        for switch, value in zip(switches, vector):
+            if switch.value != value:
+                switch.toggle()
+        expected.append([bulb.value for bulb in bulbs])
+    toggling = time.perf_counter() - start
+
+    simulator = VectorSimulator(switches, bulbs)
+    start = time.perf_counter()
+    results = simulator.simulate(vectors)
+    parallel = time.perf_counter() - start
+    assert results == expected
+
+    words = [rng.getrandbits(count) for _ in switches]
+    start = time.perf_counter()
+    simulator.simulateWords(words, count)
+    packed = time.perf_counter() - start
+
+    print(f"{count} vectors on a {bits}-bit adder ({5 * bits} gates)")
+    print(f"  toggling switches     {count / toggling:12.0f} vectors/s")
+    print(f"  bit-parallel matrix   {count / parallel:12.0f} vectors/s")
+    print(f"  bit-parallel packed   {count / packed:12.0f} vectors/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Measure the structural Verilog export of ripple-carry adders.
+
+The adders grow tenfold between runs, so the time per component shows
+that the export is linear in the size of the design.
+
+Run from the repository root with ``python -m benchmarks.verilog``.
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.circuits import rippleCarryAdder
+from logicsimulator.model.Verilog import VerilogExporter
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "adder.v")
+        for bits in (100, 1000, 10000):
+            switches, bulbs = rippleCarryAdder(bits)
+            start = time.perf_counter()
+            exporter = VerilogExporter(switches + bulbs)
+            with open(path, "w") as file:
+                exporter.write(file, "adder")
+            elapsed = time.perf_counter() - start
+            components = len(switches) + len(bulbs) + 5 * bits
+            print(
+                f"  {bits:>6}-bit adder, {components:>6} components: {elapsed * 1e3:8.1f} ms, "
+                f"{elapsed / components * 1e6:5.2f} us per component, {os.path.getsize(path) / 1e3:8.1f} kB"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Compare the memory used to record waveforms in lists and in ring buffers.
+
+The list baseline appends a ``(time, signal, value)`` tuple per change; the
+recorder streams its ring buffer to a VCD file (here ``os.devnull``).
+
+Run from the repository root with ``python -m benchmarks.waveform``.
+"""
+
+import gc
+import os
+import random
+import time
+import tracemalloc
+
+from benchmarks.circuits import rippleCarryAdder
+from logicsimulator.model.Observer import Observer
+from logicsimulator.model.Waveform import WaveformRecorder
+
+class ListProbe(Observer):
+    """Probe appending every change to a shared list of tuples."""
+
+    def __init__(self, changes, clock, signal, target):
+        self.changes, self.clock, self.signal, self.target = changes, clock, signal, target
+
+    def update(self, **kwargs) -> None:
+        self.changes.append((self.clock[0], self.signal, int(self.target.value)))
+
+def run(switches, steps: int) -> None:
+    """Toggle random switches, one per step."""
+    rng = random.Random(0)
+    for _ in range(steps):
+        yield
+        rng.choice(switches).toggle()
+
+def measure(record, steps: int):
+    """Return the peak traced memory and the duration of a recorded run.
+
+    The durations include the tracing overhead of ``tracemalloc``.
+    """
+    switches, bulbs = rippleCarryAdder(16)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    record(switches, bulbs, steps)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+def recordLists(switches, bulbs, steps: int) -> None:
+    changes, clock = [], [0]
+    for signal, bulb in enumerate(bulbs):
+        bulb.attach(ListProbe(changes, clock, signal, bulb))
+    for _ in run(switches, steps):
+        clock[0] += 1
+
+def recordRing(switches, bulbs, steps: int) -> None:
+    with open(os.devnull, "w") as output, WaveformRecorder(1 << 14, output) as recorder:
+        for bulb in bulbs:
+            recorder.probe(bulb)
+        for _ in run(switches, steps):
+            recorder.advance()
+
+def main():
+    for steps in (10000, 100000):
+        for name, record in (("lists", recordLists), ("ring buffer + VCD", recordRing)):
+            peak, elapsed = measure(record, steps)
+            print(f"{steps:>7} steps, {name:<17}: peak {peak / 1e6:6.2f} MB, {elapsed:6.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Measure wiring a netlist one connection at a time through its facade.
+
+This is the path of the view-model layer: every connection is checked with
+:meth:`NetlistConnection.canConnect`, made, and its value propagated. The
+time per connection should stay flat as the circuit grows, since the
+fanouts and the topological order are updated incrementally instead of
+being recompiled after every connection.
+
+Run from the repository root with ``python -m benchmarks.wiring``.
+"""
+
+import time
+
+from logicsimulator.model.Netlist import Netlist, NetlistConnection
+
+def wireChain(gates: int) -> float:
+    """Return the time to wire a chain of NOT gates, from its input to its end."""
+    netlist = Netlist()
+    previous = netlist.addComponent("Switch")
+    start = time.perf_counter()
+    for _ in range(gates):
+        gate = netlist.addComponent("NotGate")
+        NetlistConnection.create(netlist.component(previous).outputPins[0], netlist.component(gate).inputPins[0])
+        previous = gate
+    return time.perf_counter() - start
+
+def main():
+    for gates in (1000, 4000, 16000, 64000):
+        elapsed = wireChain(gates)
+        print(f"  {gates:>6} gates: {elapsed * 1e3:8.1f} ms, {elapsed / gates * 1e6:5.1f} us/connection")
+
+if __name__ == "__main__":
+    main()
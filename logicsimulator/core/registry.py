@@ -1,39 +1,208 @@
-import inspect
 import importlib
+import json
+import os
+import sys
+import warnings
 
 class ComponentRegistry:
+    """Registry of the component classes, by type name.
+
+    The registry starts from a manifest mapping every type name to the
+    ``module:Class`` path of its class, and imports a module only when one
+    of its types is first looked up, so listing the types costs no import.
+    The manifest holds the built-in components of :attr:`BUILTINS` and the
+    components of the plugin packs declared in the :attr:`ENTRY_POINTS`
+    entry point group, e.g. in a ``pyproject.toml``::
+
+        [project.entry-points."logicsimulator.components"]
+        mypack = "mypack.components"
+
+    An entry point names a module, whose component classes are all
+    registered, or a single class (``"mypack.components:Mux"``). Finding
+    the classes of a pack requires importing it, so the plugin part of the
+    manifest is cached in a JSON file (:meth:`cachePath`), keyed by the
+    entry points and the versions of their distributions: packs are only
+    imported again when they are installed, removed or upgraded. The cache
+    also records the modification times of the import path directories;
+    while they are unchanged, even the distribution metadata is not read.
+    """
+
+    #: Entry point group of the plugin component packs.
+    ENTRY_POINTS = "logicsimulator.components"
+
+    #: Class path of every built-in component type, in sidebar order.
+    BUILTINS = {
+        "AndGate": "logicsimulator.model.Gates:AndGate",
+        "OrGate": "logicsimulator.model.Gates:OrGate",
+        "XorGate": "logicsimulator.model.Gates:XorGate",
+        "NotGate": "logicsimulator.model.Gates:NotGate",
+        "NandGate": "logicsimulator.model.Gates:NandGate",
+        "NorGate": "logicsimulator.model.Gates:NorGate",
+        "XnorGate": "logicsimulator.model.Gates:XnorGate",
+        "BufferGate": "logicsimulator.model.Gates:BufferGate",
+        "Switch": "logicsimulator.model.Switch:Switch",
+        "Bulb": "logicsimulator.model.Bulb:Bulb",
+        "DFlipFlop": "logicsimulator.model.Sequential:DFlipFlop",
+        "Register": "logicsimulator.model.Sequential:Register",
+        "Clock": "logicsimulator.model.Sequential:Clock",
+    }
+
+    #: Version of the cache file format.
+    CACHE_VERSION = 1
+
+    # Type name -> class, or class path until the class is first looked up.
     _registry = None
+    _cached = set()
+    # Classes added with register(), which outlive a refresh of the manifest.
+    _registered = {}
 
     @classmethod
-    def _loadComponents(cls, modules = ["logicsimulator.model.Gates", "logicsimulator.model.Switch", "logicsimulator.model.Bulb"]):
+    def _loadComponents(cls, useCache = True):
+        """Return the registry, loading the manifest on first use."""
         if cls._registry is None:
-            componentModule = importlib.import_module("logicsimulator.model.Component")
-            circuitComponentModule = importlib.import_module("logicsimulator.model.CircuitComponent")
-            logicGateModule = importlib.import_module("logicsimulator.model.LogicGate")
-            Component = getattr(componentModule, "Component")
-            LogicGate = getattr(logicGateModule, "LogicGate")
-            CircuitComponent = getattr(circuitComponentModule, "CircuitComponent")
-
-            cls._registry = {}
-            for module_name in modules:
-                module = importlib.import_module(module_name)
-                for name, obj in vars(module).items():
-                    if (
-                        inspect.isclass(obj)
-                        and issubclass(obj, Component)
-                        and obj is not Component
-                        and obj is not CircuitComponent
-                        and obj is not LogicGate
-                    ):
-                        cls._registry[name] = obj
-
+            cls._registry = dict(cls.BUILTINS)
+            plugins, cls._cached = cls._loadPlugins(useCache)
+            for type, path in plugins.items():
+                cls._registry.setdefault(type, path)
+            cls._registry.update(cls._registered)
         return cls._registry
 
+    @classmethod
+    def cachePath(cls) -> str:
+        """Return the path of the manifest cache.
+
+        It is ``$LOGICSIMULATOR_CACHE`` if set, otherwise
+        ``components.json`` in the ``logicsimulator`` user cache directory.
+        """
+        path = os.environ.get("LOGICSIMULATOR_CACHE")
+        if path:
+            return path
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(base, "logicsimulator", "components.json")
+
+    @staticmethod
+    def _pathKey():
+        """Return the modification times of the import path directories.
+
+        Installing, removing or upgrading a distribution changes the
+        directory it is installed in, so an unchanged key means unchanged
+        entry points, without scanning the distribution metadata.
+        """
+        key = []
+        for path in sys.path:
+            try:
+                key.append([path, os.stat(path or ".").st_mtime_ns])
+            except OSError:
+                pass
+        return key
+
+    @classmethod
+    def _loadPlugins(cls, useCache):
+        """Return the class path of every plugin type and the types read from the cache."""
+        cache = {}
+        if useCache:
+            try:
+                with open(cls.cachePath()) as file:
+                    cache = json.load(file)
+            except (OSError, ValueError):
+                pass
+            if cache.get("version") != cls.CACHE_VERSION:
+                cache = {}
+        pathKey = cls._pathKey()
+        if cache and cache.get("path") == pathKey:
+            return cache["types"], set(cache["types"])
+
+        from importlib.metadata import entry_points
+        points = sorted(entry_points(group = cls.ENTRY_POINTS), key = lambda point: (point.name, point.value))
+        key = [
+            [point.name, point.value, point.dist.name if point.dist else "", point.dist.version if point.dist else ""]
+            for point in points
+        ]
+        if cache and cache.get("key") == key:
+            types = cache["types"]
+        else:
+            types = {}
+            for point in points:
+                try:
+                    loaded = point.load()
+                except Exception as error:
+                    # A broken pack must not prevent the application from starting.
+                    warnings.warn(f"Cannot load component pack {point.name} ({point.value}): {error}")
+                    continue
+                classes = [loaded] if isinstance(loaded, type) else list(vars(loaded).values())
+                for obj in classes:
+                    if cls._isComponent(obj):
+                        types.setdefault(obj.type, f"{obj.__module__}:{obj.__qualname__}")
+        try:
+            os.makedirs(os.path.dirname(cls.cachePath()), exist_ok = True)
+            temporary = f"{cls.cachePath()}.{os.getpid()}.tmp"
+            with open(temporary, "w") as file:
+                json.dump({"version": cls.CACHE_VERSION, "path": pathKey, "key": key, "types": types}, file)
+            os.replace(temporary, cls.cachePath())
+        except OSError:
+            pass
+        return types, set(types) if cache.get("key") == key else set()
+
+    @staticmethod
+    def _isComponent(obj):
+        """Return whether an object is a concrete component class."""
+        import inspect
+        if not inspect.isclass(obj):
+            return False
+        Component = importlib.import_module("logicsimulator.model.Component").Component
+        CircuitComponent = importlib.import_module("logicsimulator.model.CircuitComponent").CircuitComponent
+        LogicGate = importlib.import_module("logicsimulator.model.LogicGate").LogicGate
+        return (
+            issubclass(obj, Component)
+            and obj is not Component
+            and obj is not CircuitComponent
+            and obj is not LogicGate
+            and not inspect.isabstract(obj)
+        )
+
+    @staticmethod
+    def _resolve(path):
+        """Import the class at a ``module:Class`` path."""
+        module, _, name = path.partition(":")
+        obj = importlib.import_module(module)
+        for attribute in name.split("."):
+            obj = getattr(obj, attribute)
+        return obj
+
+    @classmethod
+    def refresh(cls):
+        """Reload the manifest, importing the plugin packs again instead of using the cache.
+
+        Components added with :meth:`register` are kept.
+        """
+        cls._registry = None
+        cls._loadComponents(useCache = False)
+
     @classmethod
     def getAllComponents(cls):
         return list(cls._loadComponents().keys())
-    
+
     @classmethod
     def getComponent(cls, type : str):
         registry = cls._loadComponents()
-        return registry[type]
\ No newline at end of file
+        component = registry[type]
+        if isinstance(component, str):
+            try:
+                component = cls._resolve(component)
+            except (ImportError, AttributeError):
+                if type not in cls._cached:
+                    raise
+                # The cached manifest is stale, e.g. a pack installed in
+                # development mode was changed without a new version.
+                cls.refresh()
+                return cls.getComponent(type)
+            registry[type] = component
+        return component
+
+    @classmethod
+    def register(cls, component):
+        registry = cls._loadComponents()
+        if component.type in registry and cls.getComponent(component.type) is not component:
+            raise ValueError(f"A component named {component.type} is already registered")
+        registry[component.type] = component
+        cls._registered[component.type] = component
@@ -1,7 +1,10 @@
+import os
 import sys
+from PySide6.QtCore import QStandardPaths
 from PySide6.QtWidgets import QApplication
 from logicsimulator.view.MainWindow import MainWindow
 from logicsimulator.viewmodel.command.CommandManager import CommandManager
+from logicsimulator.viewmodel.command.Journal import CommandJournal
 from logicsimulator.viewmodel.EventHandler import EventHandler
 from logicsimulator.viewmodel.CanvasVM import CanvasVM
 
@@ -28,8 +31,21 @@ def main():
     # Ensures that UI updates reflect the underlying data model
     canvas.connectCanvasVM(canvasVM=canvasVM)
 
-    # Create the command manager to handle undo/redo operations
-    commandManager = CommandManager(canvasVM=canvasVM)
+    # Journal every command next to a snapshot of the session, so the session
+    # survives a crash and autosaving only writes the changes
+    sessionDirectory = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    os.makedirs(sessionDirectory, exist_ok=True)
+    journal = CommandJournal(
+        path=os.path.join(sessionDirectory, "session.journal"),
+        snapshotPath=os.path.join(sessionDirectory, "session.lsim"),
+    )
+
+    # Create the command manager to handle undo/redo operations, and restore
+    # the last session from the journal. The journal is the autosave of the
+    # editor, so the session is restored after a clean exit too, not only
+    # after a crash
+    commandManager = CommandManager(canvasVM=canvasVM, journal=journal)
+    commandManager.recover()
 
     # Create the event handler to listen to the canvas EventBus and dispatch commands
     # This allows user actions (e.g., drag/drop, toggle, add/remove components) to modify the ViewModel
@@ -39,7 +55,9 @@ def main():
     window.show()
 
     # Start the Qt event loop
-    sys.exit(app.exec())
+    exitCode = app.exec()
+    journal.close()
+    sys.exit(exitCode)
 
 # Run the main function if this script is executed directly
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+from __future__ import annotations
+from heapq import heappush, heappop
+from itertools import count
+from typing import TYPE_CHECKING, Container, Dict, List, Optional, Set, Tuple, Union
+
+from logicsimulator.model.Propagator import Propagator
+
+if TYPE_CHECKING:
+    from logicsimulator.model.CircuitComponent import CircuitComponent
+    from logicsimulator.model.Switch import Switch
+
+class PropagationBatch:
+    """Transaction deferring propagation until its commit.
+
+    Inside a batch, toggling or setting a :class:`Switch` only changes its
+    value and marks it dirty, and circuit components notified by their
+    input pins are scheduled instead of evaluated. Leaving the ``with``
+    block commits the batch in a single ordered pass: the dirty switches
+    whose value differs from the one they had when the batch started
+    notify their pins, then the scheduled components are evaluated in
+    their dynamic topological order (see :class:`TopologicalOrder`), each
+    one once, so every pin and connection changes at most once::
+
+        with PropagationBatch():
+            for switch in switches:
+                switch.toggle()
+
+    A batch may be scoped to the components of one circuit, e.g. with the
+    :class:`ReachabilityIndex` of a canvas, so that other circuits, such as
+    a simulation engine built inside the ``with`` block, keep propagating
+    immediately. Nested batches join the outermost one of the same scope,
+    or an unscoped one, which commits; batches of different scopes commit
+    separately. Clocked
+    components are evaluated again when their inputs change after their
+    evaluation, since the connections into them are not ordered; a clock
+    toggled twice in the same batch produces no edge.
+    """
+
+    #: The outermost batches deferring propagation, in the order they started.
+    _active: List[PropagationBatch] = []
+
+    def __init__(self, scope: Optional[Container[CircuitComponent]] = None):
+        """Create an inactive batch.
+
+        Args:
+            scope (Optional[Container[CircuitComponent]]): The components
+                whose propagation is deferred; every component by default.
+        """
+        self._scope = scope
+        # Dirty sources and their value when the batch started.
+        self._sources: Dict[Switch, Union[bool, int]] = {}
+        self._queue: List[Tuple[int, int, CircuitComponent]] = []
+        self._scheduled: Set[CircuitComponent] = set()
+        self._counter = count()
+        self._owner = False
+
+    @classmethod
+    def current(cls, component: Optional[CircuitComponent] = None) -> Optional[PropagationBatch]:
+        """Return the batch deferring the propagation of a component.
+
+        Args:
+            component (Optional[CircuitComponent]): The component; by
+                default, any component.
+
+        Returns:
+            Optional[PropagationBatch]: The first active batch whose scope
+            holds the component, or ``None``.
+        """
+        for batch in cls._active:
+            if batch._scope is None or component is None or component in batch._scope:
+                return batch
+        return None
+
+    def __enter__(self) -> PropagationBatch:
+        """Start deferring propagation, unless a batch covering the scope is active.
+
+        Returns:
+            PropagationBatch: The active batch, which is the outermost one.
+        """
+        for active in PropagationBatch._active:
+            if active._scope is None or active._scope is self._scope:
+                return active
+        PropagationBatch._active.append(self)
+        self._owner = True
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Commit the batch if it is the outermost one.
+
+        The batch is committed even when the block raised, so that the
+        circuit is consistent with the values already changed.
+        """
+        if self._owner:
+            try:
+                self.commit()
+            finally:
+                PropagationBatch._active.remove(self)
+                self._owner = False
+
+    def markDirty(self, source: Switch) -> None:
+        """Record a source about to change its value.
+
+        Args:
+            source (Switch): The source, still holding its previous value.
+        """
+        self._sources.setdefault(source, source._value)
+
+    def schedule(self, component: CircuitComponent) -> None:
+        """Schedule the evaluation of a component for the commit.
+
+        Args:
+            component (CircuitComponent): A component whose inputs changed.
+        """
+        if component not in self._scheduled:
+            self._scheduled.add(component)
+            heappush(self._queue, (component.topologicalIndex, next(self._counter), component))
+
+    def commit(self) -> None:
+        """Propagate the changes of the dirty sources in one ordered pass."""
+        sources = [source for source, value in self._sources.items() if source._value != value]
+        self._sources.clear()
+        for source in sorted(sources, key=lambda source: source.topologicalIndex):
+            source.notify()
+        queue = self._queue
+        while queue:
+            component = heappop(queue)[2]
+            self._scheduled.discard(component)
+            # The base class evaluates, where CircuitComponent.update would
+            # schedule the component again.
+            Propagator.update(component)
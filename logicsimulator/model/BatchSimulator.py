@@ -0,0 +1,213 @@
+from __future__ import annotations
+import os
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.CodeGenerator import GeneratedCircuit
+from logicsimulator.model.Netlist import Netlist
+
+# Generated function of the netlist of a worker process, set by _initWorker.
+_function: Optional[Callable[..., Tuple[int, ...]]] = None
+
+def _initWorker(data: bytes) -> None:
+    """Unpickle the netlist once per worker process and generate its function."""
+    global _function
+    _function = GeneratedCircuit(pickle.loads(data)).function
+
+def _runShard(task: tuple) -> List[bytes]:
+    """Simulate a shard in a worker process, see :func:`_simulateShard`."""
+    return _simulateShard(_function, *task)
+
+def _simulateShard(function: Callable[..., Tuple[int, ...]], kind: str, numInputs: int, numOutputs: int,
+                   first: int, last: int, chunkBits: int, total: int, seed: int) -> List[bytes]:
+    """Simulate the vectors of chunks ``first`` to ``last - 1``.
+
+    Chunk ``c`` holds vectors ``c * 2 ** chunkBits`` onwards, evaluated in
+    one call of the generated function with one bit per vector. Random
+    chunks are seeded by their index, so the vectors do not depend on how
+    the chunks are split into shards.
+
+    Args:
+        function (Callable[..., Tuple[int, ...]]): The generated function.
+        kind (str): ``"random"`` or ``"enumerate"``.
+        numInputs (int): Number of inputs of the circuit.
+        numOutputs (int): Number of outputs of the circuit.
+        first (int): The first chunk of the shard.
+        last (int): The chunk after the last one of the shard.
+        chunkBits (int): Base-2 logarithm of the number of vectors per chunk.
+        total (int): Number of vectors of the whole run.
+        seed (int): Seed of the random vectors.
+
+    Returns:
+        List[bytes]: For every output, its bits for the shard's vectors, in
+        little-endian order.
+    """
+    columns: List[List[bytes]] = [[] for _ in range(numOutputs)]
+    for chunk in range(first, last):
+        start = chunk << chunkBits
+        rows = min(1 << chunkBits, total - start)
+        mask = (1 << rows) - 1
+        if kind == "random":
+            generator = random.Random(f"{seed}:{chunk}")
+            words = [generator.getrandbits(rows) for _ in range(numInputs)]
+        else:
+            # Inside a chunk the low inputs follow fixed patterns and the high
+            # inputs are constant, as in TruthTable.
+            words = [(mask // ((1 << (1 << bit)) + 1)) << (1 << bit) for bit in range(min(chunkBits, numInputs))]
+            words += [mask if start >> bit & 1 else 0 for bit in range(chunkBits, numInputs)]
+        length = (rows + 7) // 8
+        for column, word in zip(columns, function(words, mask)):
+            column.append(word.to_bytes(length, "little"))
+    return [b"".join(column) for column in columns]
+
+
+class BatchResult:
+    """Outputs of a batch of simulated input vectors.
+
+    Attributes:
+        vectors (int): Number of simulated vectors.
+        columns (List[int]): For every output, a packed word whose bit ``k``
+            is the output value for vector ``k``.
+    """
+
+    def __init__(self, vectors: int, columns: List[int]):
+        self.vectors = vectors
+        self.columns = columns
+
+    def ones(self) -> List[int]:
+        """Return the number of vectors for which each output is on."""
+        return [bin(column).count("1") for column in self.columns]
+
+
+class BatchSimulator:
+    """Headless simulator spreading input vectors over worker processes.
+
+    The netlist is pickled once and handed to every worker when the process
+    pool starts. Each worker then generates the function of the circuit (see
+    :class:`GeneratedCircuit`). The vectors are split into chunks of
+    ``2 ** chunkBits`` vectors, evaluated bit-parallel in a single call of
+    the function, and the chunks into one shard per pool task. The outputs
+    of the shards are merged in vector order, so the result does not depend
+    on the number of workers.
+
+    The pool is started on the first run and kept until :meth:`close`, which
+    the simulator also calls when used as a context manager. Worker
+    processes look component types up in :class:`ComponentRegistry`, so
+    subcircuit types must be registered in them too, which is automatic
+    when processes are forked.
+    """
+
+    def __init__(self, netlist: Netlist, workers: Optional[int] = None, chunkBits: int = 12):
+        """Prepare the batch simulation of a netlist.
+
+        Args:
+            netlist (Netlist): The circuit.
+            workers (Optional[int]): Number of worker processes, the number
+                of CPUs by default. With one worker, vectors are simulated in
+                the calling process.
+            chunkBits (int): Base-2 logarithm of the number of vectors per
+                call of the generated function. At least 3, so that chunks
+                are whole bytes.
+        """
+        self._generated = GeneratedCircuit(netlist)
+        self._data = pickle.dumps(netlist)
+        self._workers = workers or os.cpu_count() or 1
+        self._chunkBits = max(chunkBits, 3)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def fromComponents(cls, components: Iterable[CircuitComponent], workers: Optional[int] = None) -> Tuple[BatchSimulator, Dict[CircuitComponent, int]]:
+        """Prepare the batch simulation of the graph reachable from ``components``.
+
+        Args:
+            components (Iterable[CircuitComponent]): Components of the circuit.
+            workers (Optional[int]): Number of worker processes.
+
+        Returns:
+            Tuple[BatchSimulator, Dict[CircuitComponent, int]]: The simulator
+            and the netlist index of every component, which orders the inputs
+            and outputs.
+
+        Raises:
+            ValueError: If the graph cannot be stored in a :class:`Netlist`,
+                e.g. because it contains a bus or a component with several
+                outputs.
+        """
+        netlist, index = Netlist.fromComponents(components)
+        return cls(netlist, workers), index
+
+    def __enter__(self) -> BatchSimulator:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut the worker processes down."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    @property
+    def workers(self) -> int:
+        """int: Number of worker processes."""
+        return self._workers
+
+    @property
+    def inputs(self) -> List[int]:
+        """List[int]: Netlist indices of the inputs, in vector bit order."""
+        return self._generated.inputs
+
+    @property
+    def outputs(self) -> List[int]:
+        """List[int]: Netlist indices of the outputs, in column order."""
+        return self._generated.outputs
+
+    def random(self, count: int, seed: int = 0) -> BatchResult:
+        """Simulate random input vectors.
+
+        Args:
+            count (int): Number of vectors.
+            seed (int): Seed of the vectors; equal seeds give equal vectors
+                whatever the number of workers.
+
+        Returns:
+            BatchResult: The outputs for every vector.
+        """
+        return self._run("random", count, self._chunkBits, seed)
+
+    def enumerate(self) -> BatchResult:
+        """Simulate every input vector.
+
+        Vector ``k`` sets input ``i`` to bit ``i`` of ``k``, as a row of a
+        :class:`TruthTable`.
+
+        Returns:
+            BatchResult: The outputs for every vector.
+        """
+        numInputs = len(self.inputs)
+        return self._run("enumerate", 1 << numInputs, min(self._chunkBits, numInputs), 0)
+
+    def _run(self, kind: str, total: int, chunkBits: int, seed: int) -> BatchResult:
+        """Split the vectors into shards, simulate them and merge the outputs."""
+        chunks = -(-total >> chunkBits)
+        shards = max(1, min(chunks, 4 * self._workers))
+        bounds = [chunks * shard // shards for shard in range(shards + 1)]
+        tasks = [
+            (kind, len(self.inputs), len(self.outputs), first, last, chunkBits, total, seed)
+            for first, last in zip(bounds, bounds[1:])
+        ]
+        if self._workers == 1:
+            results = [_simulateShard(self._generated.function, *task) for task in tasks]
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self._workers, initializer=_initWorker, initargs=(self._data,))
+            results = list(self._pool.map(_runShard, tasks))
+        columns = [
+            int.from_bytes(b"".join(result[output] for result in results), "little")
+            for output in range(len(self.outputs))
+        ]
+        return BatchResult(total, columns)
@@ -1,3 +1,5 @@
+from typing import List
+
 from logicsimulator.model.CircuitComponent import CircuitComponent
 
 class Bulb(CircuitComponent):
@@ -5,16 +7,21 @@ class Bulb(CircuitComponent):
 
     The ``Bulb`` has one input pin and no output pins. Its value reflects the
     boolean state of its input. When the input is ``True``, the bulb is
-    considered "on"; when ``False``, it is "off".
+    considered "on"; when ``False``, it is "off". A bulb wider than one bit
+    displays the integer value of a bus.
     """
 
     type = "Bulb"
     numInputs = 1
     numOutputs = 0
 
-    def __init__(self):
-        """Initialize the bulb and create its single input pin."""
-        super().__init__()
+    def __init__(self, width: int = 1):
+        """Initialize the bulb and create its single input pin.
+
+        Args:
+            width (int): Number of bits of the input.
+        """
+        super().__init__(width=width)
 
     def _evaluate(self) -> None:
         """Evaluate the bulb's state.
@@ -24,4 +31,14 @@ class Bulb(CircuitComponent):
         Sets:
             self._value (bool): The current on/off state of the bulb.
         """
-        self._value = self._inputPins[0].value
\ No newline at end of file
+        self._value = self._inputPins[0].value
+
+    @staticmethod
+    def evaluateBits(inputs: List[int], mask: int) -> int:
+        """Evaluate the bulb on a bit-packed input word, mirroring its input."""
+        return inputs[0]
+
+    @staticmethod
+    def bitExpression(inputs: List[str]) -> str:
+        """Return the expression of the bulb, its input."""
+        return inputs[0]
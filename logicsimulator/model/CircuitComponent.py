@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional, Set
 
+from logicsimulator.model.Batch import PropagationBatch
 from logicsimulator.model.Component import Component
 from logicsimulator.model.Propagator import Propagator
 from logicsimulator.model.Pin import InputPin, OutputPin
+from logicsimulator.model.TopologicalOrder import TopologicalOrder
 
 class CircuitComponent(Component, Propagator, ABC):
     """Abstract base class for components that participate in logic circuits.
@@ -13,21 +15,68 @@ class CircuitComponent(Component, Propagator, ABC):
 
     Subclasses must implement :attr:`numInputs` and :attr:`numOutputs`, which
     determine how many :class:`InputPin` and :class:`OutputPin` objects are
-    created for the component.
+    created for the component. Components accepting a variable number of
+    inputs take it as a constructor argument instead.
+
+    Every pin of a component carries :attr:`width` bits. Single-bit components
+    have boolean values, while wider components (buses) carry integers whose
+    bit ``i`` is bit ``i`` of the bus.
 
     Attributes:
         inputPins (Optional[List[InputPin]]): A list of all input pins, or
             ``None`` if the component has zero inputs.
         outputPins (Optional[List[OutputPin]]): A list of all output pins, or
             ``None`` if the component has zero outputs.
+        isClocked (bool): Whether the component only changes on clock edges,
+            see :class:`~logicsimulator.model.Sequential.ClockedComponent`.
+        delay (int): Propagation delay in time units, used by the
+            :class:`TimingSimulator`. Zero unless overridden.
     """
+
+    isClocked = False
+    delay = 0
     
-    def __init__(self):
-        """Initialize the component and create its input and output pins."""
+    def __init__(self, numInputs: Optional[int] = None, width: int = 1):
+        """Initialize the component, create its pins and evaluate its initial value.
+
+        The initial evaluation makes the value consistent with the unconnected
+        inputs (e.g. a NOT gate starts ``True``), which change-detecting
+        propagation relies on.
+
+        Args:
+            numInputs (Optional[int]): Number of input pins, overriding the
+                class default for components with a variable number of inputs.
+            width (int): Number of bits carried by every pin.
+
+        Raises:
+            ValueError: If ``width`` is smaller than one.
+        """
         super().__init__()
+        if width < 1:
+            raise ValueError("Width must be at least one bit")
+        if numInputs is not None:
+            self.numInputs = numInputs
+        self._width = width
+        self._mask = (1 << width) - 1
+        if width > 1:
+            self._value = 0
+        self._topologicalIndex = TopologicalOrder.nextIndex()
         self._inputPins = self._createInputPins(self.numInputs)
         self._outputPins = self._createOutputPins(self.numOutputs)
+        self.update()
     
+    def update(self) -> None:
+        """React to a change of an input pin.
+
+        Inside a :class:`PropagationBatch`, the evaluation is deferred to the
+        commit of the batch.
+        """
+        batch = PropagationBatch.current(self) if PropagationBatch._active else None
+        if batch is None:
+            Propagator.update(self)
+        else:
+            batch.schedule(self)
+
     @property
     @abstractmethod
     def numInputs(self) -> int:
@@ -48,6 +97,91 @@ class CircuitComponent(Component, Propagator, ABC):
         """
         pass
     
+    @property
+    def width(self) -> int:
+        """int: Number of bits carried by every pin of the component."""
+        return self._width
+
+    @property
+    def mask(self) -> int:
+        """int: A word with the :attr:`width` low bits set."""
+        return self._mask
+
+    def outputValue(self, index: int):
+        """Return the value carried by one output pin.
+
+        Components with a single output value carry it on every output pin.
+        Components with several outputs, such as subcircuits, override this.
+
+        Args:
+            index (int): Index of the output pin.
+
+        Returns:
+            Union[bool, int]: The value of the output pin.
+        """
+        return self._value
+
+    def _fromWord(self, word: int):
+        """Convert a word to a value: a boolean for single-bit components.
+
+        Args:
+            word (int): The word, with no bits set beyond :attr:`width`.
+
+        Returns:
+            Union[bool, int]: The value to store.
+        """
+        return bool(word) if self._width == 1 else word
+
+    @staticmethod
+    def evaluateBits(inputs: List[int], mask: int) -> int:
+        """Evaluate the component on bit-packed input words.
+
+        Each input word carries the values of one input pin for many
+        independent input vectors, one vector per bit, or the bits of a bus.
+        Components that can take part in bit-parallel simulation override
+        this method with the bitwise equivalent of :meth:`_evaluate`; the
+        engines check :meth:`supportsBits` when they are created.
+
+        Args:
+            inputs (List[int]): One packed word per input pin.
+            mask (int): A word with every used bit set, for operations that
+                would otherwise set the unused high bits (such as negation).
+
+        Returns:
+            int: The packed output word.
+
+        Raises:
+            NotImplementedError: If the component has no bitwise evaluation.
+        """
+        raise NotImplementedError("Component does not support bit-parallel evaluation")
+
+    @classmethod
+    def supportsBits(cls) -> bool:
+        """Return whether the component overrides :meth:`evaluateBits`.
+
+        Returns:
+            bool: ``True`` if the component can be evaluated on words.
+        """
+        return cls.evaluateBits is not CircuitComponent.evaluateBits
+
+    @staticmethod
+    def bitExpression(inputs: List[str]) -> Optional[str]:
+        """Return a Python expression equivalent to :meth:`evaluateBits`.
+
+        Used by :class:`~logicsimulator.model.CodeGenerator.GeneratedCircuit`
+        to inline the component into generated source. The expression may
+        refer to ``mask`` with the meaning of the ``mask`` argument of
+        :meth:`evaluateBits`.
+
+        Args:
+            inputs (List[str]): One expression per input pin.
+
+        Returns:
+            Optional[str]: The expression, or ``None`` if the component has
+            none, in which case :meth:`evaluateBits` is called instead.
+        """
+        return None
+
     def _createInputPins(self, numInputs : int) -> Optional[List[InputPin]]:
         """Create the list of input pins for the component.
 
@@ -102,12 +236,49 @@ class CircuitComponent(Component, Propagator, ABC):
         """
         return self._outputPins
     
+    @property
+    def topologicalIndex(self) -> int:
+        """int: Position of the component in the dynamic topological order.
+
+        A component always has a smaller index than the components it drives.
+        See :class:`TopologicalOrder`.
+        """
+        return self._topologicalIndex
+
+    def successors(self) -> List["CircuitComponent"]:
+        """Return the components driven by this component's output pins.
+
+        Returns:
+            List[CircuitComponent]: One entry per outgoing connection.
+        """
+        successors = []
+        for pin in self._outputPins or ():
+            for connection in pin.connections:
+                successors.append(connection.target.parent)
+        return successors
+
+    def predecessors(self) -> List["CircuitComponent"]:
+        """Return the components driving this component's input pins.
+
+        Returns:
+            List[CircuitComponent]: One entry per connected input pin.
+        """
+        predecessors = []
+        for pin in self._inputPins or ():
+            if pin.connection is not None:
+                predecessors.append(pin.connection.source.parent)
+        return predecessors
+
     def precedes(self, circuitComponent : "CircuitComponent") -> bool:
         """Determine whether this component precedes another in the propagation graph.
 
-        This performs a depth-first search starting from ``self`` and follows all
-        propagator observers to determine whether ``self`` eventually leads to
-        ``circuitComponent``. Components do not precede themselves.
+        Since a component can only lead to components with a larger
+        :attr:`topologicalIndex`, the answer is immediate when the index of
+        ``circuitComponent`` is not larger. Otherwise an iterative depth-first
+        search follows the outgoing connections, skipping every component
+        whose index is beyond that of ``circuitComponent``. Components do not
+        precede themselves, and paths through clocked components are not
+        followed, since a clock edge separates their inputs from their output.
 
         Args:
             circuitComponent (CircuitComponent): The component to test reachability to.
@@ -116,22 +287,19 @@ class CircuitComponent(Component, Propagator, ABC):
             bool: ``True`` if this component precedes ``circuitComponent`` in the
             propagation graph, ``False`` otherwise.
         """
-        if self == circuitComponent:
+        limit = circuitComponent.topologicalIndex
+        if self is circuitComponent or self._topologicalIndex >= limit:
             return False
-        else: 
-            start = self
-            end = circuitComponent
-            visited : Set[Propagator] = set()
-            
-            def dfs(current : Propagator):
-                if current == end:
+        visited : Set[CircuitComponent] = {self}
+        stack = [self]
+        while stack:
+            current = stack.pop()
+            for successor in current.successors():
+                if successor.isClocked:
+                    continue
+                if successor is circuitComponent:
                     return True
-                visited.add(current)
-                for observer in current._observers:
-                    if isinstance(observer, CircuitComponent):
-                        if observer not in visited:
-                            if dfs(observer):
-                                return True
-                return False
-            
-            return dfs(start)
\ No newline at end of file
+                if successor not in visited and successor.topologicalIndex < limit:
+                    visited.add(successor)
+                    stack.append(successor)
+        return False
@@ -0,0 +1,437 @@
+from __future__ import annotations
+from array import array
+from itertools import accumulate
+from operator import sub
+import marshal
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from logicsimulator.core.registry import ComponentRegistry
+from logicsimulator.model.Batch import PropagationBatch
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.Netlist import Netlist
+from logicsimulator.model.Pin import Connection
+from logicsimulator.model.Subcircuit import Subcircuit, SubcircuitTemplate
+from logicsimulator.model.Switch import Switch
+
+class CircuitFile:
+    """Versioned binary circuit file, read through a memory map.
+
+    A circuit file is a header followed by these sections, little-endian,
+    in this order:
+
+    * types: the registered type name of every type code,
+    * templates: the :attr:`SubcircuitTemplate.program` of every subcircuit
+      type used, in ``marshal`` format, followed by padding up to a multiple
+      of 8 bytes,
+    * components: the type code, number of inputs, width and value of every
+      component,
+    * connections: for every input pin of every component, in order, the
+      index of the component driving it (``-1`` when unconnected) and the
+      index of the driving output pin, like the fanin array of a
+      :class:`Netlist`,
+    * positions: the ``x`` and ``y`` coordinates of every component, or no
+      records for circuits saved without positions,
+    * ids: when the :attr:`IDS` flag of the header is set, the view-model ID
+      of every component.
+
+    Strings are UTF-8, prefixed by their length in bytes. The components,
+    connections and positions are tables of fixed-width records, and every
+    field of a record is aligned on its size, so a table mapped as an
+    array of one field type holds the field at a fixed stride: whole columns
+    are read and written with strided ``memoryview`` slices, without
+    unpacking records one by one, while single records are read in place
+    with :meth:`struct.Struct.unpack_from`. :meth:`toNetlist` builds the
+    arrays of a :class:`Netlist` straight from the columns, the fast path
+    for large designs; :meth:`toComponents` builds the object model.
+
+    Values are saved so that switches and clocked components come back in
+    their state; the other values are recomputed by propagation. Subcircuit
+    types that are not registered yet are registered when the file is
+    opened, so that a circuit using them loads in a new session.
+    """
+
+    MAGIC = b"LSIM"
+    VERSION = 2
+
+    #: Magic, version, flags, then the number of types, the size of the
+    #: templates in bytes and the number of components, input pins and
+    #: positions.
+    HEADER = struct.Struct("<4sHHIIIII")
+    STRING = struct.Struct("<H")
+
+    #: Flag of the header set when the file has an ids table.
+    IDS = 1
+    COMPONENT = struct.Struct("<HHIQ")
+    CONNECTION = struct.Struct("<iI")
+    POSITION = struct.Struct("<dd")
+
+    #: The array type code, first item and stride of every field of the
+    #: records, when a table is viewed as an array of that type code.
+    FIELDS = {
+        "components": (("H", 0, 8), ("H", 1, 8), ("I", 1, 4), ("Q", 1, 2)),
+        "connections": (("i", 0, 2), ("I", 1, 2)),
+        "positions": (("d", 0, 2), ("d", 1, 2)),
+    }
+
+    def __init__(self, path: str):
+        """Open and map a circuit file; the tables are decoded on demand.
+
+        Args:
+            path (str): Path of the file.
+
+        Raises:
+            ValueError: If the file is not a circuit file of a supported
+                version, or is truncated.
+            KeyError: If a subcircuit type uses a type that is not registered.
+        """
+        self._file = open(path, "rb")
+        try:
+            if os.fstat(self._file.fileno()).st_size < self.HEADER.size:
+                raise ValueError(f"{path} is not a circuit file")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+        try:
+            magic, version, flags, numTypes, templateSize, numComponents, numPins, numPositions = self.HEADER.unpack_from(self._map)
+            if magic != self.MAGIC:
+                raise ValueError(f"{path} is not a circuit file")
+            if version != self.VERSION:
+                raise ValueError(f"Unsupported circuit file version {version}")
+            self._types, offset = self._readStrings(self.HEADER.size, numTypes)
+            if offset + templateSize > len(self._map):
+                raise ValueError(f"{path} is truncated")
+            programs = marshal.loads(self._map[offset:offset + templateSize]) if templateSize else []
+            offset = -(-(offset + templateSize) // 8) * 8
+            self._tables: Dict[str, Tuple[struct.Struct, int, int]] = {}
+            for name, record, count in (
+                ("components", self.COMPONENT, numComponents),
+                ("connections", self.CONNECTION, numPins),
+                ("positions", self.POSITION, numPositions),
+            ):
+                self._tables[name] = (record, offset, count)
+                offset += record.size * count
+            if len(self._map) < offset:
+                raise ValueError(f"{path} is truncated")
+            self._ids = (offset, numComponents if flags & self.IDS else 0)
+            registered = set(ComponentRegistry.getAllComponents())
+            for program in programs:
+                if program[0] not in registered:
+                    SubcircuitTemplate.fromProgram(*program).register()
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> CircuitFile:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if not self._file.closed:
+            self._map.close()
+            self._file.close()
+
+    # ---------------- Writing ----------------
+
+    @classmethod
+    def write(
+        cls,
+        path: str,
+        circuit: Union[Iterable[CircuitComponent], Netlist],
+        positions: Optional[Sequence[Tuple[float, float]]] = None,
+        ids: Optional[Sequence[str]] = None,
+    ) -> None:
+        """Save a circuit.
+
+        Args:
+            path (str): Path of the file to write.
+            circuit (Union[Iterable[CircuitComponent], Netlist]): The
+                components to save, in the order they are loaded back, or a
+                netlist. Connections from components outside of the circuit
+                are not saved.
+            positions (Optional[Sequence[Tuple[float, float]]]): The position
+                of every component.
+            ids (Optional[Sequence[str]]): The view-model ID of every
+                component.
+
+        Raises:
+            ValueError: If the number of positions or IDs does not match the
+                number of components, or a type name or an ID is longer than
+                65535 bytes.
+        """
+        if isinstance(circuit, Netlist):
+            types, components, connections = cls._netlistColumns(circuit)
+        else:
+            types, components, connections = cls._componentColumns(list(circuit))
+        count = len(components[0])
+        positions = list(positions or ())
+        if positions and len(positions) != count:
+            raise ValueError("Every component needs a position")
+        if ids is not None and len(ids) != count:
+            raise ValueError("Every component needs an ID")
+        names = cls._packStrings(types)
+        encodedIds = cls._packStrings(ids or ())
+        classes = [ComponentRegistry.getComponent(type) for type in types]
+        programs = [component.template.program for component in classes if issubclass(component, Subcircuit)]
+        templates = marshal.dumps(programs) if programs else b""
+        with open(path, "wb") as file:
+            file.write(cls.HEADER.pack(
+                cls.MAGIC,
+                cls.VERSION,
+                0 if ids is None else cls.IDS,
+                len(types),
+                len(templates),
+                count,
+                len(connections[0]),
+                len(positions),
+            ))
+            file.write(names)
+            file.write(templates)
+            file.write(bytes(-(cls.HEADER.size + len(names) + len(templates)) % 8))
+            file.write(cls._pack("components", cls.COMPONENT, components))
+            file.write(cls._pack("connections", cls.CONNECTION, connections))
+            file.write(cls._pack("positions", cls.POSITION, list(zip(*positions)) or [(), ()]))
+            file.write(encodedIds)
+
+    @classmethod
+    def _packStrings(cls, strings: Iterable[str]) -> bytes:
+        """Encode strings, each prefixed by its length."""
+        encoded = [string.encode() for string in strings]
+        if any(len(string) > 0xFFFF for string in encoded):
+            raise ValueError("Type names and IDs are limited to 65535 bytes")
+        return b"".join(cls.STRING.pack(len(string)) + string for string in encoded)
+
+    @classmethod
+    def _pack(cls, table: str, record: struct.Struct, columns: Sequence[Sequence]) -> bytearray:
+        """Interleave columns into the records of a table."""
+        data = bytearray(record.size * len(columns[0]))
+        with memoryview(data) as view:
+            for (typecode, start, stride), values in zip(cls.FIELDS[table], columns):
+                column = array(typecode, values)
+                if sys.byteorder == "big":
+                    column.byteswap()
+                with view.cast(typecode) as items:
+                    items[start::stride] = column
+        return data
+
+    @staticmethod
+    def _componentColumns(components: List[CircuitComponent]) -> Tuple[List[str], list, list]:
+        """Return the type names, component columns and connection columns of components."""
+        index = {component: position for position, component in enumerate(components)}
+        codes: Dict[str, int] = {}
+        typeCodes, numInputs, widths, values = [], [], [], []
+        sources, outputs = [], []
+        for component in components:
+            inputPins = component.inputPins or ()
+            typeCodes.append(codes.setdefault(component.type, len(codes)))
+            numInputs.append(len(inputPins))
+            widths.append(component.width)
+            values.append(int(component.value))
+            for inputPin in inputPins:
+                outputPin = inputPin.connection.source if inputPin.connection is not None else None
+                source = index.get(outputPin.parent, -1) if outputPin is not None else -1
+                sources.append(source)
+                outputs.append(outputPin.parent.outputPins.index(outputPin) if source >= 0 else 0)
+        return list(codes), [typeCodes, numInputs, widths, values], [sources, outputs]
+
+    @staticmethod
+    def _netlistColumns(netlist: Netlist) -> Tuple[List[str], list, list]:
+        """Return the type names, component columns and connection columns of a netlist."""
+        state = netlist.__getstate__()
+        faninStart, fanins = state["faninStart"], state["fanins"]
+        numInputs = list(map(sub, faninStart[1:], faninStart[:-1]))
+        components = [state["typeCode"], numInputs, [1] * len(numInputs), list(state["values"])]
+        return state["types"], components, [fanins, [0] * len(fanins)]
+
+    # ---------------- Reading ----------------
+
+    def _readStrings(self, offset: int, count: int) -> Tuple[List[str], int]:
+        """Decode ``count`` length-prefixed strings.
+
+        Returns:
+            Tuple[List[str], int]: The strings and the offset past them.
+
+        Raises:
+            ValueError: If the strings run past the end of the file.
+        """
+        data = self._map
+        strings = []
+        for _ in range(count):
+            end = offset + self.STRING.size
+            if end > len(data):
+                raise ValueError("The circuit file is truncated")
+            (length,) = self.STRING.unpack_from(data, offset)
+            offset = end + length
+            if offset > len(data):
+                raise ValueError("The circuit file is truncated")
+            strings.append(data[end:offset].decode())
+        return strings, offset
+
+    def _columns(self, table: str) -> List[array]:
+        """Decode every field of a table in bulk, one array per field."""
+        record, offset, count = self._tables[table]
+        columns = []
+        with memoryview(self._map) as view, view[offset:offset + record.size * count] as data:
+            for typecode, start, stride in self.FIELDS[table]:
+                with data.cast(typecode) as items:
+                    column = array(typecode, items[start::stride].tolist())
+                if sys.byteorder == "big":
+                    column.byteswap()
+                columns.append(column)
+        return columns
+
+    def _record(self, table: str, index: int) -> tuple:
+        """Read one record in place."""
+        record, offset, count = self._tables[table]
+        if not 0 <= index < count:
+            raise IndexError(f"{table} index out of range")
+        return record.unpack_from(self._map, offset + record.size * index)
+
+    def __len__(self) -> int:
+        """Return the number of components."""
+        return self._tables["components"][2]
+
+    @property
+    def types(self) -> List[str]:
+        """List[str]: The type name of every type code."""
+        return list(self._types)
+
+    @property
+    def hasPositions(self) -> bool:
+        """bool: Whether the circuit was saved with the positions of its components."""
+        return self._tables["positions"][2] > 0
+
+    def component(self, index: int) -> Tuple[str, int, int, int]:
+        """Read the record of a component.
+
+        Args:
+            index (int): Index of the component.
+
+        Returns:
+            Tuple[str, int, int, int]: Its type name, number of inputs, width
+            and value.
+        """
+        code, numInputs, width, value = self._record("components", index)
+        return self._types[code], numInputs, width, value
+
+    def position(self, index: int) -> Tuple[float, float]:
+        """Read the position of a component, ``(0.0, 0.0)`` if none was saved."""
+        return self._record("positions", index) if self.hasPositions else (0.0, 0.0)
+
+    def connections(self) -> List[Tuple[int, int, int, int]]:
+        """Decode the connections.
+
+        Returns:
+            List[Tuple[int, int, int, int]]: The source component, source
+            output pin, target component and target input pin of every
+            connection, by target.
+
+        Raises:
+            ValueError: If the connection table does not match the inputs of
+                the components.
+        """
+        numInputs = self._columns("components")[1]
+        sources, outputs = self._columns("connections")
+        if len(sources) != sum(numInputs):
+            raise ValueError("The connection table does not match the components")
+        connections = []
+        slot = 0
+        for target, count in enumerate(numInputs):
+            for pin in range(count):
+                if sources[slot + pin] >= 0:
+                    connections.append((sources[slot + pin], outputs[slot + pin], target, pin))
+            slot += count
+        return connections
+
+    def positions(self) -> List[Tuple[float, float]]:
+        """Decode the position table, one ``(x, y)`` pair per component or none."""
+        return list(zip(*self._columns("positions")))
+
+    def ids(self) -> List[str]:
+        """Decode the ids table, one view-model ID per component or none."""
+        return self._readStrings(*self._ids)[0]
+
+    # ---------------- Loading ----------------
+
+    def toNetlist(self) -> Netlist:
+        """Build a netlist from the columns in bulk.
+
+        Returns:
+            Netlist: The circuit, with its saved values.
+
+        Raises:
+            ValueError: If the circuit contains a bus, since a netlist stores
+                one bit per component, or the tables do not match.
+            KeyError: If a type is not registered.
+        """
+        typeCodes, numInputs, widths, values = self._columns("components")
+        if widths.count(1) != len(widths):
+            raise ValueError("A netlist cannot store buses")
+        faninStart = array("i", accumulate(numInputs, initial=0))
+        fanins = self._columns("connections")[0]
+        if len(fanins) != faninStart[-1]:
+            raise ValueError("The connection table does not match the components")
+        return Netlist.fromTables(self._types, array("H", typeCodes), faninStart, fanins, bytearray(values.tolist()))
+
+    def toComponents(self, connect: bool = True) -> List[CircuitComponent]:
+        """Build the object model of the circuit.
+
+        Args:
+            connect (bool): Whether to create the connections and restore the
+                values. The view-model layer creates the connections itself
+                and then calls :meth:`restore`.
+
+        Returns:
+            List[CircuitComponent]: The components, in file order.
+
+        Raises:
+            KeyError: If a type is not registered.
+            ValueError: If the tables do not match.
+        """
+        classes = [ComponentRegistry.getComponent(type) for type in self._types]
+        typeCodes, numInputs, widths, _ = self._columns("components")
+        components = []
+        for code, count, width in zip(typeCodes, numInputs, widths):
+            cls = classes[code]
+            arguments = {}
+            if count != cls.numInputs:
+                arguments["numInputs"] = count
+            # The width of a subcircuit is that of its template.
+            if width != 1 and not issubclass(cls, Subcircuit):
+                arguments["width"] = width
+            components.append(cls(**arguments))
+        if connect:
+            with PropagationBatch(set(components)):
+                # Saved circuits are acyclic, so the cycle checks are skipped.
+                for source, output, target, pin in self.connections():
+                    Connection(components[source].outputPins[output], components[target].inputPins[pin])
+            self.restore(components)
+        return components
+
+    def restore(self, components: List[CircuitComponent]) -> None:
+        """Restore the saved values of the switches and clocked components.
+
+        The switches are set in one :class:`PropagationBatch`, then the
+        clocked components get their state back without a clock edge.
+
+        Args:
+            components (List[CircuitComponent]): The connected components, in
+                file order.
+        """
+        values = self._columns("components")[3]
+        scope = set(components)
+        with PropagationBatch(scope):
+            for component, value in zip(components, values):
+                if isinstance(component, Switch):
+                    component.setValue(value)
+        with PropagationBatch(scope):
+            for component, value in zip(components, values):
+                if component.isClocked:
+                    component.restore(value)
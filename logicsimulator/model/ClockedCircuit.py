@@ -0,0 +1,218 @@
+from heapq import heappush, heappop
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.CompiledCircuit import CompiledCircuit
+from logicsimulator.model.Sequential import Clock
+from logicsimulator.model.Switch import Switch
+
+class ClockedCircuit:
+    """Cycle-based scheduler for synchronous sequential circuits.
+
+    Every :class:`ClockedComponent` whose clock input is driven directly by a
+    :class:`Clock` is a register of the circuit. A call to :meth:`step`
+    simulates one clock cycle: every register loads its next state at once,
+    then the combinational logic downstream of the registers that changed is
+    evaluated once, in compiled order, before the next edge.
+
+    The simulation runs on flat lists of words (0/1 for single bits), using the
+    :meth:`CircuitComponent.evaluateBits` method of every combinational
+    component, and only does work where values change: a register is only
+    recomputed when one of its data inputs or its own state changed since the
+    previous edge, and a gate only when one of its drivers changed. The model
+    objects are left untouched until :meth:`sync` writes the values back.
+
+    Clocked components whose clock input is not driven by a clock keep their
+    state. Like :class:`CompiledCircuit`, the scheduler works on a snapshot
+    of the graph.
+    """
+
+    def __init__(self, components: Iterable[CircuitComponent]):
+        """Compile the circuit connected to the given components.
+
+        Args:
+            components (Iterable[CircuitComponent]): Components of the circuit.
+                Components connected to them are included automatically.
+
+        Raises:
+            ValueError: If the graph contains a cycle that does not go through
+                a clocked component, or a combinational component with several
+                outputs or no bit-parallel evaluation.
+        """
+        self._circuit = CompiledCircuit(components)
+        self._cycles = 0
+        self._index: Dict[CircuitComponent, int] = {
+            component: position for position, component in enumerate(self._circuit.components)
+        }
+        size = len(self._index)
+        # The extra slot past the last component always holds 0, for unconnected inputs.
+        self._values = [int(component.value) for component in self._circuit.components] + [0]
+        self._gates: List[Optional[Tuple[Callable, Callable, int]]] = [None] * size
+        self._registers: Dict[int, Tuple[Callable, Callable]] = {}
+        self._fanout: List[List[int]] = [[] for _ in range(size)]
+        self._registerFanout: List[List[int]] = [[] for _ in range(size)]
+
+        for position, component in enumerate(self._circuit.components):
+            if component.isClocked:
+                clock = component.clockPin.connection
+                if clock is not None and isinstance(clock.source.parent, Clock):
+                    self._registers[position] = (component.nextState, self._fanins(component.dataPins))
+            elif component.inputPins:
+                if component.numOutputs > 1:
+                    raise ValueError(f"Clocked simulation does not support components with several outputs, such as {component.type}")
+                if not component.supportsBits():
+                    raise ValueError(f"Clocked simulation does not support components of type {component.type}")
+                self._gates[position] = (component.evaluateBits, self._fanins(component.inputPins), component.mask)
+
+        for position, component in enumerate(self._circuit.components):
+            for pin in component.outputPins or ():
+                for connection in pin.connections:
+                    target = connection.target.parent
+                    targetPosition = self._index[target]
+                    if not target.isClocked:
+                        self._fanout[position].append(targetPosition)
+                    elif targetPosition in self._registers and connection.target is not target.clockPin:
+                        self._registerFanout[position].append(targetPosition)
+
+        self._dirty: Set[int] = set(self._registers)
+
+    def _fanins(self, pins) -> Callable[[List[int]], Sequence[int]]:
+        """Return a function reading the values of the given input pins.
+
+        Args:
+            pins (List[InputPin]): The input pins.
+
+        Returns:
+            Callable[[List[int]], Sequence[int]]: Takes the value list and
+            returns one value per pin; unconnected pins read the constant 0
+            slot.
+        """
+        fanins = [
+            len(self._index) if pin.connection is None else self._index[pin.connection.source.parent]
+            for pin in pins
+        ]
+        if len(fanins) == 1:
+            # itemgetter with a single index returns the item, not a tuple.
+            fanin = fanins[0]
+            return lambda values: (values[fanin],)
+        return itemgetter(*fanins)
+
+    @property
+    def components(self) -> List[CircuitComponent]:
+        """List[CircuitComponent]: All components in schedule order."""
+        return self._circuit.components
+
+    @property
+    def registers(self) -> List[CircuitComponent]:
+        """List[CircuitComponent]: The clocked components driven by a clock."""
+        return [self._circuit.components[position] for position in sorted(self._registers)]
+
+    @property
+    def cycles(self) -> int:
+        """int: Number of clock cycles simulated so far."""
+        return self._cycles
+
+    def value(self, component: CircuitComponent) -> Union[bool, int]:
+        """Return the simulated value of a component.
+
+        Args:
+            component (CircuitComponent): A component of this circuit.
+
+        Returns:
+            Union[bool, int]: Its value after the last simulated cycle.
+        """
+        return component._fromWord(self._values[self._index[component]])
+
+    def toggle(self, switch: Switch) -> None:
+        """Toggle a switch in the simulation, between two clock cycles.
+
+        Args:
+            switch (Switch): A switch of this circuit.
+        """
+        position = self._index[switch]
+        self._values[position] ^= switch.mask
+        self._propagate([position])
+
+    def setValue(self, switch: Switch, value: int) -> None:
+        """Set the value of a switch in the simulation, between two clock cycles.
+
+        Args:
+            switch (Switch): A switch of this circuit.
+            value (int): The new value; bits past the width of the switch are
+                ignored.
+        """
+        position = self._index[switch]
+        value = int(value) & switch.mask
+        if value != self._values[position]:
+            self._values[position] = value
+            self._propagate([position])
+
+    def step(self) -> None:
+        """Simulate one clock cycle."""
+        values = self._values
+        changed = []
+        for position in self._dirty:
+            nextState, read = self._registers[position]
+            value = nextState(read(values), values[position])
+            if value != values[position]:
+                changed.append((position, value))
+        self._dirty = set()
+        for position, value in changed:
+            values[position] = value
+        self._propagate([position for position, _ in changed])
+        self._cycles += 1
+
+    def run(self, cycles: int) -> None:
+        """Simulate a number of clock cycles, then :meth:`sync` the model.
+
+        Args:
+            cycles (int): The number of cycles to simulate.
+        """
+        for _ in range(cycles):
+            self.step()
+        self.sync()
+
+    def sync(self) -> None:
+        """Write the simulated values back into the model objects.
+
+        Observers that are not part of the model, such as view-model relays,
+        are notified of the values that changed.
+        """
+        self._circuit.writeBack(self._values)
+
+    def _propagate(self, changed: List[int]) -> None:
+        """Evaluate the logic downstream of changed components in compiled order.
+
+        Each gate is evaluated at most once. Registers whose data inputs
+        changed are marked for the next clock edge.
+
+        Args:
+            changed (List[int]): Positions whose value just changed.
+        """
+        values = self._values
+        gates = self._gates
+        fanout = self._fanout
+        registerFanout = self._registerFanout
+        dirty = self._dirty
+        queue: List[int] = []
+        scheduled: Set[int] = set()
+        for position in changed:
+            if position in self._registers:
+                dirty.add(position)
+            dirty.update(registerFanout[position])
+            for successor in fanout[position]:
+                if successor not in scheduled:
+                    scheduled.add(successor)
+                    heappush(queue, successor)
+        while queue:
+            position = heappop(queue)
+            evaluateBits, read, mask = gates[position]
+            value = evaluateBits(read(values), mask)
+            if value != values[position]:
+                values[position] = value
+                dirty.update(registerFanout[position])
+                for successor in fanout[position]:
+                    if successor not in scheduled:
+                        scheduled.add(successor)
+                        heappush(queue, successor)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+import hashlib
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.Netlist import Netlist
+
+class GeneratedCircuit:
+    """Circuit compiled to a straight-line Python function.
+
+    The function has one local variable per net (``n<index>``, the output
+    of the netlist component ``index``) and one assignment per component, in
+    topological order. Components are inlined with their
+    :meth:`CircuitComponent.bitExpression`; those without an expression call
+    their :meth:`CircuitComponent.evaluateBits` method. The function takes
+    the values of the inputs (components without input pins, such as
+    switches) and returns those of the outputs (components without output
+    pins, such as bulbs), both in netlist order::
+
+        evaluate(inputs: Sequence[int], mask: int = 1) -> Tuple[int, ...]
+
+    Values are words like in :meth:`CircuitComponent.evaluateBits`: with a
+    wider ``mask``, each bit is an independent input vector.
+
+    Generated functions are cached by the structural hash of the netlist, so
+    circuits with the same structure share a single compilation. The cache
+    keeps the :attr:`CACHE_SIZE` most recently used functions.
+    """
+
+    #: Maximum number of functions kept in the cache.
+    CACHE_SIZE = 32
+
+    #: Compiled functions and their source, by structural hash, from the
+    #: least to the most recently used.
+    _cache: Dict[str, Tuple[Callable[..., Tuple[int, ...]], str]] = {}
+
+    def __init__(self, netlist: Netlist):
+        """Generate, or fetch from the cache, the function of a netlist.
+
+        Args:
+            netlist (Netlist): The circuit.
+
+        Raises:
+            ValueError: If the netlist contains a cycle.
+        """
+        self._inputs = [index for index in range(len(netlist)) if netlist.numInputs(index) == 0]
+        self._outputs = [index for index in range(len(netlist)) if netlist.numOutputs(index) == 0]
+        self._hash = self.structuralHash(netlist)
+        cache = GeneratedCircuit._cache
+        cached = cache.pop(self._hash, None)
+        if cached is None:
+            cached = self._compile(netlist)
+            while len(cache) >= self.CACHE_SIZE:
+                del cache[next(iter(cache))]
+        cache[self._hash] = cached
+        self._function, self._source = cached
+
+    @classmethod
+    def fromComponents(cls, components: Iterable[CircuitComponent]) -> Tuple[GeneratedCircuit, Dict[CircuitComponent, int]]:
+        """Generate the function of the object graph reachable from ``components``.
+
+        Args:
+            components (Iterable[CircuitComponent]): Components of the circuit.
+
+        Returns:
+            Tuple[GeneratedCircuit, Dict[CircuitComponent, int]]: The generated
+            circuit and the netlist index of every component, which orders
+            the inputs and outputs of the function.
+
+        Raises:
+            ValueError: If the graph cannot be stored in a :class:`Netlist`,
+                e.g. because it contains a bus or a component with several
+                outputs.
+        """
+        netlist, index = Netlist.fromComponents(components)
+        return cls(netlist), index
+
+    @staticmethod
+    def structuralHash(netlist: Netlist) -> str:
+        """Return a digest of the types and connections of a netlist.
+
+        Two netlists have the same digest when their components have the
+        same types, in the same order, with the same input connections.
+
+        Args:
+            netlist (Netlist): The circuit.
+
+        Returns:
+            str: The hexadecimal digest.
+        """
+        digest = hashlib.sha1()
+        for cls in netlist.types:
+            digest.update(f"{cls.__module__}.{cls.__qualname__}:{cls.type};".encode())
+        digest.update(netlist._typeCode.tobytes())
+        digest.update(netlist._faninStart.tobytes())
+        digest.update(netlist._fanins.tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _compile(netlist: Netlist) -> Tuple[Callable[..., Tuple[int, ...]], str]:
+        """Generate and compile the source of the function.
+
+        Args:
+            netlist (Netlist): The circuit.
+
+        Returns:
+            Tuple[Callable[..., Tuple[int, ...]], str]: The function and its source.
+        """
+        namespace: Dict[str, object] = {}
+        lines = []
+        inputs = []
+        outputs = []
+        for index in netlist.order:
+            fanins = [f"n{source}" if source >= 0 else "0" for source in netlist.fanins(index)]
+            if not fanins:
+                inputs.append(index)
+                continue
+            cls = netlist.types[netlist._typeCode[index]]
+            expression = cls.bitExpression(fanins)
+            if expression is None:
+                name = f"evaluate{netlist._typeCode[index]}"
+                namespace[name] = cls.evaluateBits
+                expression = f"{name}(({', '.join(fanins)},), mask)"
+            lines.append(f"    n{index} = {expression}")
+        for index in range(len(netlist)):
+            if netlist.numOutputs(index) == 0:
+                outputs.append(index)
+
+        inputs.sort()
+        header = ["def evaluate(inputs, mask=1):"]
+        if inputs:
+            header.append(f"    {', '.join(f'n{index}' for index in inputs)}, = inputs")
+        footer = [f"    return ({''.join(f'n{index}, ' for index in outputs)})"]
+        source = "\n".join(header + lines + footer) + "\n"
+        exec(compile(source, f"<generated {len(netlist)} components>", "exec"), namespace)
+        return namespace["evaluate"], source
+
+    @property
+    def hash(self) -> str:
+        """str: The structural hash of the netlist."""
+        return self._hash
+
+    @property
+    def source(self) -> str:
+        """str: The generated Python source."""
+        return self._source
+
+    @property
+    def function(self) -> Callable[..., Tuple[int, ...]]:
+        """Callable[..., Tuple[int, ...]]: The generated function."""
+        return self._function
+
+    @property
+    def inputs(self) -> List[int]:
+        """List[int]: Netlist indices of the inputs, in argument order."""
+        return self._inputs
+
+    @property
+    def outputs(self) -> List[int]:
+        """List[int]: Netlist indices of the outputs, in result order."""
+        return self._outputs
+
+    def evaluate(self, values: Sequence[bool]) -> List[bool]:
+        """Evaluate the circuit on one input vector.
+
+        Args:
+            values (Sequence[bool]): One value per input, in :attr:`inputs` order.
+
+        Returns:
+            List[bool]: One value per output, in :attr:`outputs` order.
+        """
+        return [bool(value) for value in self._function([int(value) for value in values])]
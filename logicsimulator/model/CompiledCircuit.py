@@ -0,0 +1,344 @@
+from heapq import heappush, heappop
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.Pin import Connection, InputPin, OutputPin
+from logicsimulator.model.Propagator import Propagator
+from logicsimulator.model.Sequential import Clock
+from logicsimulator.model.Switch import Switch
+
+# Classes of the observers known to be model propagators.
+_modelTypes: Set[type] = set()
+
+class CompiledCircuit:
+    """Levelized evaluation engine for a graph of circuit components.
+
+    ``CompiledCircuit`` is an opt-in alternative to the recursive observer
+    chain of :class:`Propagator`. The graph reachable from the given components
+    is compiled once into a topologically ordered schedule in which every
+    component is also assigned a level (the length of the longest path from
+    a source). A change is then propagated by evaluating the affected
+    components in schedule order, popping their schedule positions from a
+    queue, so each component is evaluated at most once per change, no matter
+    how many reconverging paths lead to it. Like the observer chain,
+    propagation stops at components whose outputs did not change.
+
+    A changed output is copied straight into the connections and input pins
+    it drives, instead of each of them being evaluated as a propagator. The
+    number of model observers of every propagator is recorded at compile
+    time, so that only the propagators observed by more than that are
+    searched for foreign observers.
+
+    The compiled circuit writes its results into the model objects themselves,
+    so the values seen afterwards are the same as those produced by the
+    observer chain. Observers that are not part of the model (for example the
+    view-model relays) are still notified of every value change.
+
+    The schedule is a snapshot of the graph: after connecting or disconnecting
+    components, a new ``CompiledCircuit`` must be created.
+    """
+
+    def __init__(self, components: Iterable[CircuitComponent]):
+        """Compile the graph reachable from the given components.
+
+        Args:
+            components (Iterable[CircuitComponent]): Components of the circuit.
+                Components connected to them are included automatically.
+
+        Raises:
+            ValueError: If the graph contains a cycle that does not go through
+                a clocked component.
+        """
+        self._components: List[CircuitComponent] = []
+        self._index: Dict[CircuitComponent, int] = {}
+        self._levels: List[int] = []
+        self._fanout: List[List[int]] = []
+        # Number of model observers of every component.
+        self._observed: List[int] = []
+        # Every output pin of every component and its number of model
+        # observers, with the connections it drives, their target pins, their
+        # numbers of model observers and the positions of their components.
+        self._outputs: List[List[Tuple[OutputPin, int, List[Tuple[Connection, int, InputPin, int, int]]]]] = []
+        self._compile(self._collect(components))
+
+    def _collect(self, components: Iterable[CircuitComponent]) -> List[CircuitComponent]:
+        """Collect every component connected to the given ones.
+
+        Args:
+            components (Iterable[CircuitComponent]): The starting components.
+
+        Returns:
+            List[CircuitComponent]: All components of the connected graph, in
+            discovery order.
+        """
+        collected: List[CircuitComponent] = []
+        seen: Set[CircuitComponent] = set()
+        stack = list(components)
+        while stack:
+            component = stack.pop()
+            if component in seen:
+                continue
+            seen.add(component)
+            collected.append(component)
+            stack.extend(component.successors())
+            stack.extend(component.predecessors())
+        return collected
+
+    def _compile(self, components: List[CircuitComponent]) -> None:
+        """Order the components and assign their levels.
+
+        The schedule reuses the dynamic topological order maintained by
+        :class:`TopologicalOrder`, so compiling only sorts the components by
+        their index.
+
+        Args:
+            components (List[CircuitComponent]): All components of the graph.
+
+        Raises:
+            ValueError: If the graph contains a cycle that does not go through
+                a clocked component.
+        """
+        self._components = sorted(components, key=lambda component: component.topologicalIndex)
+        for index, component in enumerate(self._components):
+            self._index[component] = index
+
+        for component in self._components:
+            level = 0
+            # Clocked components are sources: their inputs only matter on a clock edge.
+            for predecessor in () if component.isClocked else component.predecessors():
+                if self._index[predecessor] >= self._index[component]:
+                    raise ValueError("Cannot compile a circuit containing a cycle")
+                level = max(level, self._levels[self._index[predecessor]] + 1)
+            self._levels.append(level)
+            fanout = {self._index[successor] for successor in component.successors()}
+            self._fanout.append(sorted(fanout))
+            self._observed.append(self._countModelObservers(component))
+            self._outputs.append([
+                (pin, self._countModelObservers(pin), [
+                    (
+                        connection,
+                        self._countModelObservers(connection),
+                        connection.target,
+                        self._countModelObservers(connection.target),
+                        self._index[connection.target.parent],
+                    )
+                    for connection in pin.connections
+                ])
+                for pin in component.outputPins or ()
+            ])
+
+    @staticmethod
+    def _countModelObservers(propagator: Propagator) -> int:
+        """Return the number of observers of a propagator that are part of the model."""
+        return sum(isinstance(observer, Propagator) for observer in propagator.observers)
+
+    @property
+    def components(self) -> List[CircuitComponent]:
+        """List[CircuitComponent]: All compiled components in schedule order."""
+        return self._components
+
+    @property
+    def depth(self) -> int:
+        """int: Number of levels in the schedule."""
+        return max(self._levels) + 1 if self._levels else 0
+
+    def level(self, component: CircuitComponent) -> int:
+        """Return the level of a compiled component.
+
+        Args:
+            component (CircuitComponent): A component of this circuit.
+
+        Returns:
+            int: The length of the longest path from a source to ``component``.
+        """
+        return self._levels[self._index[component]]
+
+    def toggle(self, switch: Switch) -> None:
+        """Toggle a switch and propagate the change through the schedule.
+
+        This is the compiled counterpart of :meth:`Switch.toggle`. On the
+        rising edge of a :class:`Clock`, the clocked components it drives are
+        sampled first, as :meth:`Clock.toggle` does.
+
+        Args:
+            switch (Switch): A switch of this circuit.
+        """
+        if isinstance(switch, Clock) and not switch.value:
+            switch.sample()
+        switch._value = switch._fromWord(switch.mask ^ switch._value)
+        self.propagate(switch)
+
+    def setValue(self, switch: Switch, value: int) -> None:
+        """Set the value of a switch and propagate the change through the schedule.
+
+        Args:
+            switch (Switch): A switch of this circuit.
+            value (int): The new value; bits past the width of the switch are
+                ignored.
+        """
+        value = switch._fromWord(int(value) & switch.mask)
+        if value != switch._value:
+            switch._value = value
+            self.propagate(switch)
+
+    def propagate(self, *sources: CircuitComponent) -> None:
+        """Re-evaluate the sources and everything downstream of them.
+
+        Components are evaluated in schedule order, each one at most once, except
+        clocked components, which are evaluated again when their inputs change
+        after they were evaluated. The sources are treated as changed; any
+        other component is only evaluated once the output of one of its
+        drivers has changed.
+
+        Args:
+            *sources (CircuitComponent): The components whose state changed.
+        """
+        components = self._components
+        observed = self._observed
+        outputs = self._outputs
+        notifyExternal = self._notifyExternal
+        queue: List[int] = []
+        scheduled: Set[int] = set()
+        for source in sources:
+            index = self._index[source]
+            if index not in scheduled:
+                scheduled.add(index)
+                heappush(queue, index)
+                # Other input pins are refreshed as their connections change.
+                for pin in source.inputPins or ():
+                    self._evaluatePropagator(pin)
+        changedSources = set(scheduled)
+
+        while queue:
+            index = heappop(queue)
+            component = components[index]
+            if component.isClocked:
+                # Its data inputs may still change later in the pass, and must
+                # then be refreshed for the next clock edge.
+                scheduled.discard(index)
+            oldValue = component._value
+            component._evaluate()
+            if component._value == oldValue and index not in changedSources:
+                # Its outputs only change with its value.
+                continue
+            if len(component._observers) > observed[index]:
+                notifyExternal(component)
+            for pin, pinObserved, connections in outputs[index]:
+                oldValue = pin._value
+                pin._evaluate()
+                value = pin._value
+                if value == oldValue:
+                    continue
+                if len(pin._observers) > pinObserved:
+                    notifyExternal(pin)
+                for connection, connectionObserved, target, targetObserved, successor in connections:
+                    connection._value = value
+                    if len(connection._observers) > connectionObserved:
+                        notifyExternal(connection)
+                    if target._value != value:
+                        target._value = value
+                        if len(target._observers) > targetObserved:
+                            notifyExternal(target)
+                        if successor not in scheduled:
+                            scheduled.add(successor)
+                            heappush(queue, successor)
+
+    def evaluate(self) -> None:
+        """Evaluate every component once, in schedule order."""
+        for component in self._components:
+            self._evaluateComponent(component, True)
+
+    def writeBack(self, values: Sequence[int]) -> None:
+        """Write the words of a simulation on flat lists back into the model objects.
+
+        The components without inputs and the clocked components take their
+        word from ``values``, then the combinational logic is evaluated in
+        schedule order. Clocked components do not load a new state: once all
+        of their drivers are final, their input pins are refreshed and the
+        current clock level becomes the previous one, as in
+        :meth:`ClockedComponent.restore`, so the observer chain carries on
+        from the written state. Observers that are not part of the model,
+        such as view-model relays, are notified of the values that changed.
+
+        Args:
+            values (Sequence[int]): The word of every component, in schedule
+                order.
+        """
+        for position, component in enumerate(self._components):
+            if component.isClocked or not component.inputPins:
+                component._value = component._fromWord(values[position])
+        for component in self._components:
+            self._evaluateComponent(component, True, not component.isClocked)
+        # Connections into clocked components may come from components later
+        # in the schedule, so their input pins are only final now.
+        for component in self._components:
+            if component.isClocked:
+                for pin in component.inputPins:
+                    self._evaluatePropagator(pin)
+                component.restore(component._value)
+
+    def _evaluateComponent(self, component: CircuitComponent, changed: bool = False, evaluate: bool = True) -> bool:
+        """Evaluate a component together with its pins and outgoing connections.
+
+        The incoming connections were already evaluated together with the
+        components driving them, which precede ``component`` in the schedule.
+
+        Args:
+            component (CircuitComponent): The component to evaluate.
+            changed (bool): Whether the component's value is known to have
+                changed before evaluation, as for a toggled switch.
+            evaluate (bool): Whether to evaluate the component and its input
+                pins, or only its outputs.
+
+        Returns:
+            bool: ``True`` if the value of any outgoing connection changed.
+        """
+        if evaluate:
+            for pin in component.inputPins or ():
+                self._evaluatePropagator(pin)
+            if self._evaluatePropagator(component) is False and changed:
+                self._notifyExternal(component)
+        elif changed:
+            self._notifyExternal(component)
+        outputChanged = False
+        for pin in component.outputPins or ():
+            self._evaluatePropagator(pin)
+            for connection in pin.connections:
+                outputChanged = self._evaluatePropagator(connection) or outputChanged
+        return outputChanged
+
+    @classmethod
+    def _evaluatePropagator(cls, propagator: Propagator) -> bool:
+        """Evaluate a single propagator, notifying foreign observers on change.
+
+        Args:
+            propagator (Propagator): The propagator to evaluate.
+
+        Returns:
+            bool: ``True`` if the value changed.
+        """
+        oldValue = propagator._value
+        propagator._evaluate()
+        if propagator._value != oldValue:
+            cls._notifyExternal(propagator)
+            return True
+        return False
+
+    @staticmethod
+    def _notifyExternal(propagator: Propagator) -> None:
+        """Notify the observers of a propagator that are not part of the model.
+
+        Model propagators are driven by the schedule instead of notifications,
+        so only foreign observers (such as view-model relays) are updated.
+        The classes of the model propagators are remembered, since an
+        ``isinstance`` check against an abstract base class is slow.
+
+        Args:
+            propagator (Propagator): The propagator whose value changed.
+        """
+        modelTypes = _modelTypes
+        for observer in [observer for observer in propagator._observers if observer.__class__ not in modelTypes]:
+            if isinstance(observer, Propagator):
+                modelTypes.add(observer.__class__)
+            else:
+                observer.update()
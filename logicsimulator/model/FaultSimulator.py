@@ -0,0 +1,269 @@
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from logicsimulator.model.Bulb import Bulb
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.CompiledCircuit import CompiledCircuit
+from logicsimulator.model.Pin import InputPin, Pin
+from logicsimulator.model.Switch import Switch
+
+class StuckAtFault:
+    """A pin permanently stuck at 0 or 1.
+
+    A fault on an output pin affects every connection driven by the pin (a
+    stem fault), while a fault on an input pin only affects that pin (a
+    branch fault).
+    """
+
+    def __init__(self, pin: Pin, value: bool):
+        """Create the fault.
+
+        Args:
+            pin (Pin): The faulty pin.
+            value (bool): The value the pin is stuck at.
+        """
+        self._pin = pin
+        self._value = bool(value)
+
+    @property
+    def pin(self) -> Pin:
+        """Pin: The faulty pin."""
+        return self._pin
+
+    @property
+    def value(self) -> bool:
+        """bool: The value the pin is stuck at."""
+        return self._value
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, StuckAtFault) and self._pin is other._pin and self._value == other._value
+
+    def __hash__(self) -> int:
+        return hash((id(self._pin), self._value))
+
+    def __repr__(self) -> str:
+        parent = self._pin.parent
+        pins = parent.inputPins if self._pin.type == "InputPin" else parent.outputPins
+        return f"StuckAtFault({parent.type}.{self._pin.type}[{pins.index(self._pin)}] stuck-at-{int(self._value)})"
+
+
+class FaultReport:
+    """Fault coverage of a set of test vectors.
+
+    Attributes:
+        faults (List[StuckAtFault]): Every simulated fault.
+        detected (Dict[StuckAtFault, int]): Index of the first vector
+            detecting each detected fault.
+        detections (List[int]): Number of faults first detected by each vector.
+        counts (Dict[StuckAtFault, int]): Number of vectors detecting each
+            detected fault; only counted past the first detection when fault
+            dropping is off.
+    """
+
+    def __init__(self, faults: List[StuckAtFault], detected: Dict[StuckAtFault, int], detections: List[int], counts: Dict[StuckAtFault, int]):
+        self.faults = faults
+        self.detected = detected
+        self.detections = detections
+        self.counts = counts
+
+    @property
+    def undetected(self) -> List[StuckAtFault]:
+        """List[StuckAtFault]: The faults no vector detected."""
+        return [fault for fault in self.faults if fault not in self.detected]
+
+    @property
+    def coverage(self) -> float:
+        """float: Fraction of the faults detected by the vectors."""
+        if not self.faults:
+            return 1.0
+        return len(self.detected) / len(self.faults)
+
+    def __repr__(self) -> str:
+        return (
+            f"FaultReport({len(self.detected)}/{len(self.faults)} faults detected, "
+            f"{self.coverage:.1%} coverage, {len(self.detections)} vectors)"
+        )
+
+
+class FaultSimulator:
+    """Parallel-fault simulator for single stuck-at faults.
+
+    The fault list holds a stuck-at-0 and a stuck-at-1 fault on every input
+    and output pin of the circuit. For every test vector, the fault-free
+    circuit is simulated once. The faulty circuits are then simulated
+    ``wordSize`` at a time: bit ``j`` of every value word belongs to the
+    ``j``-th faulty machine of the group, and a fault is injected by forcing
+    its bit at its pin with an AND and an OR mask. A fault is detected when
+    a bulb of its machine differs from the fault-free bulb.
+
+    With fault dropping, detected faults are removed from the fault list, so
+    later vectors only simulate the faults still undetected. Components are
+    evaluated with :meth:`CircuitComponent.evaluateBits` on a snapshot of the
+    graph, like :class:`VectorSimulator`; the model objects are not touched.
+    """
+
+    def __init__(self, switches: Sequence[Switch], bulbs: Sequence[Bulb], wordSize: int = 64):
+        """Compile the circuit between switches and bulbs and list its faults.
+
+        Args:
+            switches (Sequence[Switch]): The inputs, in test vector order.
+            bulbs (Sequence[Bulb]): The observed outputs.
+            wordSize (int): Number of faulty machines simulated per pass.
+
+        Raises:
+            ValueError: If the graph contains a cycle, a clocked component,
+                a bus or a component with several outputs.
+        """
+        self._circuit = CompiledCircuit(list(switches) + list(bulbs))
+        self._switches = list(switches)
+        self._bulbs = list(bulbs)
+        self._wordSize = wordSize
+        components = self._circuit.components
+        self._index: Dict[CircuitComponent, int] = {component: position for position, component in enumerate(components)}
+        size = len(components)
+        self._evaluators: List[Optional[Tuple[Callable, Callable]]] = [None] * size
+        self._faults: List[StuckAtFault] = []
+        # Location of every fault: (position, pin index), with -1 for the output pin.
+        self._sites: Dict[StuckAtFault, Tuple[int, int]] = {}
+
+        for position, component in enumerate(components):
+            if component.isClocked:
+                raise ValueError("Cannot fault-simulate a circuit containing clocked components")
+            if component.width > 1:
+                raise ValueError("Cannot fault-simulate a circuit containing buses")
+            if component.numOutputs > 1:
+                raise ValueError("Cannot fault-simulate components with several outputs")
+            if component.inputPins:
+                self._evaluators[position] = (component.evaluateBits, self._fanins(component.inputPins))
+            for pin, inputPin in enumerate(component.inputPins or ()):
+                self._addFaults(inputPin, position, pin)
+            for outputPin in component.outputPins or ():
+                self._addFaults(outputPin, position, -1)
+
+        self._sources = [self._index[switch] for switch in self._switches]
+        self._outputs = [self._index[bulb] for bulb in self._bulbs]
+
+    def _addFaults(self, pin: Pin, position: int, index: int) -> None:
+        """Add the stuck-at-0 and stuck-at-1 faults of a pin."""
+        for value in (False, True):
+            fault = StuckAtFault(pin, value)
+            self._faults.append(fault)
+            self._sites[fault] = (position, index)
+
+    def _fanins(self, pins: List[InputPin]) -> Callable[[List[int]], Sequence[int]]:
+        """Return a function reading the values of the given input pins.
+
+        Args:
+            pins (List[InputPin]): The input pins.
+
+        Returns:
+            Callable[[List[int]], Sequence[int]]: Takes the value list and
+            returns one value per pin; unconnected pins read the constant 0
+            slot.
+        """
+        fanins = [
+            len(self._index) if pin.connection is None else self._index[pin.connection.source.parent]
+            for pin in pins
+        ]
+        if len(fanins) == 1:
+            # itemgetter with a single index returns the item, not a tuple.
+            fanin = fanins[0]
+            return lambda values: (values[fanin],)
+        return itemgetter(*fanins)
+
+    @property
+    def faults(self) -> List[StuckAtFault]:
+        """List[StuckAtFault]: All faults, two per pin."""
+        return self._faults
+
+    @property
+    def wordSize(self) -> int:
+        """int: Number of faulty machines simulated per pass."""
+        return self._wordSize
+
+    def _simulate(self, vector: Sequence[bool], mask: int, faults: Dict[Tuple[int, int], Tuple[int, int]]) -> List[int]:
+        """Simulate one vector on a group of machines.
+
+        Args:
+            vector (Sequence[bool]): One value per switch.
+            mask (int): A word with one bit per machine.
+            faults (Dict[Tuple[int, int], Tuple[int, int]]): For every faulty
+                site, the AND and the OR mask forcing the faulty bits.
+
+        Returns:
+            List[int]: The value word of every component.
+        """
+        inputFaults: Dict[int, List[Tuple[int, int, int]]] = {}
+        outputFaults: Dict[int, Tuple[int, int]] = {}
+        for (position, pin), (clear, force) in faults.items():
+            if pin < 0:
+                outputFaults[position] = (clear, force)
+            else:
+                inputFaults.setdefault(position, []).append((pin, clear, force))
+
+        values = [0] * (len(self._index) + 1)
+        for position, value in zip(self._sources, vector):
+            values[position] = mask if value else 0
+        for position, evaluator in enumerate(self._evaluators):
+            if evaluator is not None:
+                evaluateBits, read = evaluator
+                inputs = read(values)
+                if position in inputFaults:
+                    inputs = list(inputs)
+                    for pin, clear, force in inputFaults[position]:
+                        inputs[pin] = inputs[pin] & clear | force
+                values[position] = evaluateBits(inputs, mask)
+            if position in outputFaults:
+                clear, force = outputFaults[position]
+                values[position] = values[position] & clear | force
+        return values
+
+    def run(self, vectors: Sequence[Sequence[bool]], dropping: bool = True) -> FaultReport:
+        """Grade a set of test vectors by their fault coverage.
+
+        Args:
+            vectors (Sequence[Sequence[bool]]): The test vectors, one value
+                per switch each.
+            dropping (bool): Whether to stop simulating faults once detected.
+                Without dropping, every fault is simulated for every vector,
+                and :attr:`FaultReport.counts` holds how many vectors detect
+                each fault (for n-detect test sets).
+
+        Returns:
+            FaultReport: The faults detected by the vectors.
+        """
+        remaining = list(self._faults)
+        detected: Dict[StuckAtFault, int] = {}
+        detections: List[int] = []
+        counts: Dict[StuckAtFault, int] = {}
+        for number, vector in enumerate(vectors):
+            good = self._simulate(vector, 1, {})
+            found = 0
+            survivors = []
+            for start in range(0, len(remaining), self._wordSize):
+                group = remaining[start:start + self._wordSize]
+                mask = (1 << len(group)) - 1
+                faults: Dict[Tuple[int, int], Tuple[int, int]] = {}
+                for bit, fault in enumerate(group):
+                    clear, force = faults.get(self._sites[fault], (mask, 0))
+                    if fault.value:
+                        force |= 1 << bit
+                    else:
+                        clear &= ~(1 << bit)
+                    faults[self._sites[fault]] = (clear, force)
+                values = self._simulate(vector, mask, faults)
+                difference = 0
+                for position in self._outputs:
+                    difference |= values[position] ^ (mask if good[position] else 0)
+                for bit, fault in enumerate(group):
+                    if difference >> bit & 1:
+                        counts[fault] = counts.get(fault, 0) + 1
+                        if fault not in detected:
+                            detected[fault] = number
+                            found += 1
+                        if dropping:
+                            continue
+                    survivors.append(fault)
+            remaining = survivors
+            detections.append(found)
+        return FaultReport(list(self._faults), detected, detections, counts)
@@ -1,82 +1,325 @@
+from typing import List
+
 from logicsimulator.model.LogicGate import LogicGate
 
 class AndGate(LogicGate):
     """Logic gate implementing boolean AND.
 
-    The ``AndGate`` takes two boolean inputs and produces one boolean output,
-    evaluating to ``True`` only if both inputs are ``True``.
+    The ``AndGate`` takes two or more inputs and produces one output,
+    evaluating to ``True`` only if all inputs are ``True``. On buses, the
+    inputs are combined bitwise.
     """
 
     type = "AndGate"
     numInputs = 2
     numOutputs = 1
 
-    def __init__(self):
-        """Initialize the AND gate."""
-        super().__init__()
+    def __init__(self, numInputs: int = 2, width: int = 1):
+        """Initialize the AND gate.
+
+        Args:
+            numInputs (int): Number of inputs.
+            width (int): Number of bits of the inputs and the output.
+        """
+        super().__init__(numInputs=numInputs, width=width)
 
     def _evaluate(self) -> None:
         """Evaluate the AND gate output."""
-        self._value = self._inputPins[0].value and self._inputPins[1].value
+        value = self._mask
+        for pin in self._inputPins:
+            value &= pin._value
+        self._value = bool(value) if self._width == 1 else value
+
+    @staticmethod
+    def evaluateBits(inputs: List[int], mask: int) -> int:
+        """Evaluate the AND gate on bit-packed input words."""
+        value = mask
+        for word in inputs:
+            value &= word
+        return value
+
+    @staticmethod
+    def bitExpression(inputs: List[str]) -> str:
+        """Return the expression of the AND gate."""
+        return " & ".join(inputs)
 
 
 class OrGate(LogicGate):
     """Logic gate implementing boolean OR.
 
-    The ``OrGate`` takes two boolean inputs and produces one boolean output,
-    evaluating to ``True`` if at least one input is ``True``.
+    The ``OrGate`` takes two or more inputs and produces one output,
+    evaluating to ``True`` if at least one input is ``True``. On buses, the
+    inputs are combined bitwise.
     """
 
     type = "OrGate"
     numInputs = 2
     numOutputs = 1
 
-    def __init__(self):
-        """Initialize the OR gate."""
-        super().__init__()
+    def __init__(self, numInputs: int = 2, width: int = 1):
+        """Initialize the OR gate.
+
+        Args:
+            numInputs (int): Number of inputs.
+            width (int): Number of bits of the inputs and the output.
+        """
+        super().__init__(numInputs=numInputs, width=width)
 
     def _evaluate(self) -> None:
         """Evaluate the OR gate output."""
-        self._value = self._inputPins[0].value or self._inputPins[1].value
+        value = 0
+        for pin in self._inputPins:
+            value |= pin._value
+        self._value = bool(value) if self._width == 1 else value
+
+    @staticmethod
+    def evaluateBits(inputs: List[int], mask: int) -> int:
+        """Evaluate the OR gate on bit-packed input words."""
+        value = 0
+        for word in inputs:
+            value |= word
+        return value
+
+    @staticmethod
+    def bitExpression(inputs: List[str]) -> str:
+        """Return the expression of the OR gate."""
+        return " | ".join(inputs)
 
 
 class XorGate(LogicGate):
     """Logic gate implementing boolean XOR.
 
-    The ``XorGate`` takes two boolean inputs and produces one boolean output,
-    evaluating to ``True`` only if exactly one input is ``True``.
+    The ``XorGate`` takes two or more inputs and produces one output,
+    evaluating to ``True`` if an odd number of inputs are ``True`` (for two
+    inputs, exactly one). On buses, the inputs are combined bitwise.
     """
 
     type = "XorGate"
     numInputs = 2
     numOutputs = 1
 
-    def __init__(self):
-        """Initialize the XOR gate."""
-        super().__init__()
+    def __init__(self, numInputs: int = 2, width: int = 1):
+        """Initialize the XOR gate.
+
+        Args:
+            numInputs (int): Number of inputs.
+            width (int): Number of bits of the inputs and the output.
+        """
+        super().__init__(numInputs=numInputs, width=width)
 
     def _evaluate(self) -> None:
         """Evaluate the XOR gate output."""
-        self._value = (
-            (not self._inputPins[0].value and self._inputPins[1].value)
-            or (self._inputPins[0].value and not self._inputPins[1].value)
-        )
+        value = 0
+        for pin in self._inputPins:
+            value ^= pin._value
+        self._value = bool(value) if self._width == 1 else value
+
+    @staticmethod
+    def evaluateBits(inputs: List[int], mask: int) -> int:
+        """Evaluate the XOR gate on bit-packed input words."""
+        value = 0
+        for word in inputs:
+            value ^= word
+        return value
+
+    @staticmethod
+    def bitExpression(inputs: List[str]) -> str:
+        """Return the expression of the XOR gate."""
+        return " ^ ".join(inputs)
 
 class NotGate(LogicGate):
     """Logic gate implementing boolean NOT.
 
-    The ``NotGate`` takes one boolean input and produces one output that is the
-    logical negation of its input.
+    The ``NotGate`` takes one input and produces one output that is the
+    logical negation of its input. On buses, every bit is negated.
     """
 
     type = "NotGate"
     numInputs = 1
     numOutputs = 1
 
-    def __init__(self):
-        """Initialize the NOT gate."""
-        super().__init__()
+    def __init__(self, width: int = 1):
+        """Initialize the NOT gate.
+
+        Args:
+            width (int): Number of bits of the input and the output.
+        """
+        super().__init__(width=width)
 
     def _evaluate(self) -> None:
         """Evaluate the NOT gate output."""
-        self._value = not self._inputPins[0].value
\ No newline at end of file
+        value = self._mask ^ self._inputPins[0]._value
+        self._value = bool(value) if self._width == 1 else value
+
+    @staticmethod
+    def evaluateBits(inputs: List[int], mask: int) -> int:
+        """Evaluate the NOT gate on bit-packed input words."""
+        return ~inputs[0] & mask
+
+    @staticmethod
+    def bitExpression(inputs: List[str]) -> str:
+        """Return the expression of the NOT gate."""
+        return f"mask ^ {inputs[0]}"
+
+
+class NandGate(LogicGate):
+    """Logic gate implementing boolean NAND.
+
+    The ``NandGate`` takes two or more inputs and produces one output,
+    evaluating to ``False`` only if all inputs are ``True``. On buses, the
+    inputs are combined bitwise.
+    """
+
+    type = "NandGate"
+    numInputs = 2
+    numOutputs = 1
+
+    def __init__(self, numInputs: int = 2, width: int = 1):
+        """Initialize the NAND gate.
+
+        Args:
+            numInputs (int): Number of inputs.
+            width (int): Number of bits of the inputs and the output.
+        """
+        super().__init__(numInputs=numInputs, width=width)
+
+    def _evaluate(self) -> None:
+        """Evaluate the NAND gate output."""
+        value = self._mask
+        for pin in self._inputPins:
+            value &= pin._value
+        value ^= self._mask
+        self._value = bool(value) if self._width == 1 else value
+
+    @staticmethod
+    def evaluateBits(inputs: List[int], mask: int) -> int:
+        """Evaluate the NAND gate on bit-packed input words."""
+        value = mask
+        for word in inputs:
+            value &= word
+        return mask ^ value
+
+    @staticmethod
+    def bitExpression(inputs: List[str]) -> str:
+        """Return the expression of the NAND gate."""
+        return f"mask ^ ({' & '.join(inputs)})"
+
+
+class NorGate(LogicGate):
+    """Logic gate implementing boolean NOR.
+
+    The ``NorGate`` takes two or more inputs and produces one output,
+    evaluating to ``True`` only if all inputs are ``False``. On buses, the
+    inputs are combined bitwise.
+    """
+
+    type = "NorGate"
+    numInputs = 2
+    numOutputs = 1
+
+    def __init__(self, numInputs: int = 2, width: int = 1):
+        """Initialize the NOR gate.
+
+        Args:
+            numInputs (int): Number of inputs.
+            width (int): Number of bits of the inputs and the output.
+        """
+        super().__init__(numInputs=numInputs, width=width)
+
+    def _evaluate(self) -> None:
+        """Evaluate the NOR gate output."""
+        value = 0
+        for pin in self._inputPins:
+            value |= pin._value
+        value ^= self._mask
+        self._value = bool(value) if self._width == 1 else value
+
+    @staticmethod
+    def evaluateBits(inputs: List[int], mask: int) -> int:
+        """Evaluate the NOR gate on bit-packed input words."""
+        value = 0
+        for word in inputs:
+            value |= word
+        return mask ^ value
+
+    @staticmethod
+    def bitExpression(inputs: List[str]) -> str:
+        """Return the expression of the NOR gate."""
+        return f"mask ^ ({' | '.join(inputs)})"
+
+
+class XnorGate(LogicGate):
+    """Logic gate implementing boolean XNOR.
+
+    The ``XnorGate`` takes two or more inputs and produces one output,
+    evaluating to ``True`` if an even number of inputs are ``True`` (for two
+    inputs, if they are equal). On buses, the inputs are combined bitwise.
+    """
+
+    type = "XnorGate"
+    numInputs = 2
+    numOutputs = 1
+
+    def __init__(self, numInputs: int = 2, width: int = 1):
+        """Initialize the XNOR gate.
+
+        Args:
+            numInputs (int): Number of inputs.
+            width (int): Number of bits of the inputs and the output.
+        """
+        super().__init__(numInputs=numInputs, width=width)
+
+    def _evaluate(self) -> None:
+        """Evaluate the XNOR gate output."""
+        value = self._mask
+        for pin in self._inputPins:
+            value ^= pin._value
+        self._value = bool(value) if self._width == 1 else value
+
+    @staticmethod
+    def evaluateBits(inputs: List[int], mask: int) -> int:
+        """Evaluate the XNOR gate on bit-packed input words."""
+        value = mask
+        for word in inputs:
+            value ^= word
+        return value
+
+    @staticmethod
+    def bitExpression(inputs: List[str]) -> str:
+        """Return the expression of the XNOR gate."""
+        return f"mask ^ {' ^ '.join(inputs)}"
+
+
+class BufferGate(LogicGate):
+    """Logic gate copying its input.
+
+    The ``BufferGate`` takes one input and produces one output equal to it.
+    It models the buffers of imported netlists, and an unconnected buffer is
+    a constant 0.
+    """
+
+    type = "BufferGate"
+    numInputs = 1
+    numOutputs = 1
+
+    def __init__(self, width: int = 1):
+        """Initialize the buffer.
+
+        Args:
+            width (int): Number of bits of the input and the output.
+        """
+        super().__init__(width=width)
+
+    def _evaluate(self) -> None:
+        """Evaluate the buffer output."""
+        self._value = self._inputPins[0]._value
+
+    @staticmethod
+    def evaluateBits(inputs: List[int], mask: int) -> int:
+        """Evaluate the buffer on bit-packed input words, copying its input."""
+        return inputs[0]
+
+    @staticmethod
+    def bitExpression(inputs: List[str]) -> str:
+        """Return the expression of the buffer, its input."""
+        return inputs[0]
@@ -0,0 +1,364 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from logicsimulator.model.Netlist import Netlist
+
+class NetlistImporter(ABC):
+    """Abstract base class of the streaming importers of netlist files.
+
+    The file is parsed line by line, and every gate is added to a
+    :class:`Netlist` as soon as it is read, through its bulk construction
+    path: :meth:`Netlist.addComponent` and :meth:`Netlist.connect`, without
+    any cycle check per connection. Besides the netlist, the importer only
+    keeps the index of every named signal and, for signals used before the
+    line defining them, the input pins waiting for them.
+
+    Primary inputs become switches and primary outputs bulbs. Flip-flops are
+    imported with the full-scan model used by test tools: the output of a
+    flip-flop becomes a pseudo-input switch and its data input drives a
+    pseudo-output bulb, so that the imported netlist is combinational.
+
+    Format-specific importers implement :meth:`_parseLine`.
+    """
+
+    def __init__(self):
+        """Create an importer with an empty netlist."""
+        self._netlist = Netlist()
+        self._signals: Dict[str, int] = {}
+        self._pending: Dict[str, List[Tuple[int, int]]] = {}
+        self._inputs: Dict[str, int] = {}
+        self._outputs: Dict[str, int] = {}
+        self._state: Dict[str, Tuple[int, int]] = {}
+        self._inverted: Dict[str, int] = {}
+        self._line = 0
+
+    @classmethod
+    def read(cls, path: str) -> NetlistImporter:
+        """Import a file.
+
+        Args:
+            path (str): Path of the file.
+
+        Returns:
+            NetlistImporter: The importer holding the imported netlist.
+
+        Raises:
+            ValueError: If the file is malformed, uses an unsupported
+                construct, or leaves a used signal undefined.
+        """
+        importer = cls()
+        with open(path) as file:
+            importer.parse(file)
+        return importer
+
+    @property
+    def netlist(self) -> Netlist:
+        """Netlist: The imported netlist."""
+        return self._netlist
+
+    @property
+    def signals(self) -> Dict[str, int]:
+        """Dict[str, int]: Netlist index of the component driving every named signal."""
+        return self._signals
+
+    @property
+    def inputs(self) -> Dict[str, int]:
+        """Dict[str, int]: Netlist index of the switch of every primary input."""
+        return self._inputs
+
+    @property
+    def outputs(self) -> Dict[str, int]:
+        """Dict[str, int]: Netlist index of the bulb of every primary output."""
+        return self._outputs
+
+    @property
+    def state(self) -> Dict[str, Tuple[int, int]]:
+        """Dict[str, Tuple[int, int]]: Pseudo-input switch and pseudo-output bulb of every flip-flop, by output name."""
+        return self._state
+
+    def parse(self, lines: Iterable[str]) -> Netlist:
+        """Import the lines of a file.
+
+        Args:
+            lines (Iterable[str]): The lines, such as an open file.
+
+        Returns:
+            Netlist: The imported netlist, evaluated.
+
+        Raises:
+            ValueError: If the file is malformed, uses an unsupported
+                construct, or leaves a used signal undefined.
+        """
+        for self._line, line in enumerate(lines, 1):
+            self._parseLine(line)
+        self._finish()
+        if self._pending:
+            names = ", ".join(sorted(self._pending)[:5])
+            raise ValueError(f"Undefined signals: {names}")
+        self._netlist.evaluate()
+        return self._netlist
+
+    @abstractmethod
+    def _parseLine(self, line: str) -> None:
+        """Import one line; implemented by the format-specific importers."""
+
+    def _finish(self) -> None:
+        """Complete the constructs still open at the end of the file."""
+        pass
+
+    def _error(self, message: str) -> ValueError:
+        """Return an error pointing at the current line."""
+        return ValueError(f"Line {self._line}: {message}")
+
+    # ---------------- Construction ----------------
+
+    def _define(self, name: str, index: int) -> None:
+        """Name the output of a component and connect the pins waiting for it."""
+        if name in self._signals:
+            raise self._error(f"Signal {name} is defined twice")
+        self._signals[name] = index
+        for target, pin in self._pending.pop(name, ()):
+            self._netlist.connect(index, target, pin)
+
+    def _use(self, name: str, target: int, pin: int) -> None:
+        """Drive an input pin with a named signal, possibly defined later."""
+        source = self._signals.get(name)
+        if source is None:
+            self._pending.setdefault(name, []).append((target, pin))
+        else:
+            self._netlist.connect(source, target, pin)
+
+    def _addGate(self, type: str, inputs: List[str], name: Optional[str] = None) -> int:
+        """Add a gate driven by named signals.
+
+        Args:
+            type (str): The registered type of the gate.
+            inputs (List[str]): The names of its input signals.
+            name (Optional[str]): The name of its output signal, if any.
+
+        Returns:
+            int: The netlist index of the gate.
+        """
+        index = self._netlist.addComponent(type, len(inputs))
+        for pin, input in enumerate(inputs):
+            self._use(input, index, pin)
+        if name is not None:
+            self._define(name, index)
+        return index
+
+    def _addInput(self, name: str) -> None:
+        """Add a primary input."""
+        self._inputs[name] = self._netlist.addComponent("Switch")
+        self._define(name, self._inputs[name])
+
+    def _addOutput(self, name: str) -> None:
+        """Add a primary output."""
+        self._outputs[name] = self._addGate("Bulb", [name])
+
+    def _addFlipFlop(self, input: str, output: str) -> None:
+        """Add a flip-flop as a pseudo-input and a pseudo-output (full scan)."""
+        switch = self._netlist.addComponent("Switch")
+        self._define(output, switch)
+        self._state[output] = (switch, self._addGate("Bulb", [input]))
+
+    def _negated(self, name: str) -> str:
+        """Return the name of a signal's negation, adding one shared NOT gate."""
+        negation = f"{name}'"
+        if name not in self._inverted:
+            self._inverted[name] = self._addGate("NotGate", [name], negation)
+        return negation
+
+
+class BenchImporter(NetlistImporter):
+    """Importer of the ``.bench`` format of the ISCAS-85 and ISCAS-89 circuits.
+
+    A file declares ``INPUT(name)`` and ``OUTPUT(name)`` signals and one gate
+    per line, such as ``G10 = NAND(G1, G3)``. Gates are mapped onto the
+    registered types of :attr:`GATES`; ``DFF`` flip-flops use the full-scan
+    model of :class:`NetlistImporter`.
+    """
+
+    #: Registered component type of every gate of the format.
+    GATES = {
+        "AND": "AndGate",
+        "NAND": "NandGate",
+        "OR": "OrGate",
+        "NOR": "NorGate",
+        "XOR": "XorGate",
+        "XNOR": "XnorGate",
+        "NOT": "NotGate",
+        "BUF": "BufferGate",
+        "BUFF": "BufferGate",
+    }
+
+    _declaration = re.compile(r"(INPUT|OUTPUT)\s*\(\s*([^\s()]+)\s*\)$", re.IGNORECASE)
+    _gate = re.compile(r"([^\s=]+)\s*=\s*(\w+)\s*\(([^()]*)\)$")
+
+    def _parseLine(self, line: str) -> None:
+        """Import one line of a ``.bench`` file."""
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            return
+        match = self._gate.match(line)
+        if match is not None:
+            name, kind, arguments = match.groups()
+            inputs = [argument.strip() for argument in arguments.split(",") if argument.strip()]
+            kind = kind.upper()
+            if kind == "DFF":
+                if len(inputs) != 1:
+                    raise self._error("A DFF takes one input")
+                self._addFlipFlop(inputs[0], name)
+            elif kind in self.GATES:
+                if not inputs:
+                    raise self._error(f"Gate {name} has no inputs")
+                self._addGate(self.GATES[kind], inputs, name)
+            else:
+                raise self._error(f"Unsupported gate {kind}")
+            return
+        match = self._declaration.match(line)
+        if match is None:
+            raise self._error(f"Cannot parse {line!r}")
+        if match.group(1).upper() == "INPUT":
+            self._addInput(match.group(2))
+        else:
+            self._addOutput(match.group(2))
+
+
+class BlifImporter(NetlistImporter):
+    """Importer of the combinational and latch subset of the Berkeley Logic Interchange Format.
+
+    Supported constructs are ``.model``, ``.inputs``, ``.outputs``,
+    ``.names`` with its single-output cover, ``.latch`` (with the full-scan
+    model of :class:`NetlistImporter`) and ``.end``; lines ending with a
+    backslash continue on the next line. Hierarchical ``.subckt`` and
+    library ``.gate`` constructs are not supported.
+
+    A cover is mapped onto the matching gate when it is one (AND, OR, XOR,
+    their negations, a buffer, a NOT or a constant), and onto a sum of
+    products of AND, OR and NOT gates otherwise.
+    """
+
+    def __init__(self):
+        """Create an importer with an empty netlist."""
+        super().__init__()
+        self._continued = ""
+        # The signals and the cover rows of the .names being read.
+        self._names: Optional[List[str]] = None
+        self._cover: List[Tuple[str, str]] = []
+
+    def _parseLine(self, line: str) -> None:
+        """Import one line of a BLIF file."""
+        line = line.split("#", 1)[0].rstrip()
+        if line.endswith("\\"):
+            self._continued += line[:-1] + " "
+            return
+        words = (self._continued + line).split()
+        self._continued = ""
+        if not words:
+            return
+        if not words[0].startswith("."):
+            if self._names is None:
+                raise self._error(f"Cover row outside of .names: {line.strip()!r}")
+            if len(self._names) == 1 and len(words) == 1:
+                self._cover.append(("", words[0]))
+            elif len(words) != 2 or len(words[0]) != len(self._names) - 1:
+                raise self._error(f"Malformed cover row {line.strip()!r}")
+            else:
+                self._cover.append((words[0], words[1]))
+            return
+        self._finish()
+        directive, arguments = words[0], words[1:]
+        if directive == ".names":
+            if not arguments:
+                raise self._error(".names needs an output signal")
+            self._names = arguments
+        elif directive == ".inputs":
+            for name in arguments:
+                self._addInput(name)
+        elif directive == ".outputs":
+            for name in arguments:
+                self._addOutput(name)
+        elif directive == ".latch":
+            if len(arguments) < 2:
+                raise self._error(".latch needs an input and an output")
+            self._addFlipFlop(arguments[0], arguments[1])
+        elif directive not in (".model", ".end"):
+            raise self._error(f"Unsupported construct {directive}")
+
+    def _finish(self) -> None:
+        """Map the pending cover, if any, onto gates."""
+        if self._names is not None:
+            names, cover = self._names, self._cover
+            self._names, self._cover = None, []
+            self._addCover(names[:-1], names[-1], cover)
+
+    def _addCover(self, inputs: List[str], name: str, cover: List[Tuple[str, str]]) -> None:
+        """Add the gates computing a single-output cover.
+
+        Args:
+            inputs (List[str]): The input signals.
+            name (str): The output signal.
+            cover (List[Tuple[str, str]]): The rows: one character per
+                input (``1``, ``0`` or ``-``) and the output value.
+        """
+        values = {output for _, output in cover}
+        if not values <= {"0", "1"} or len(values) > 1:
+            raise self._error(f"Cover of {name} mixes or misuses output values")
+        # Rows give the on-set for output 1 and the off-set for output 0.
+        inverted = values == {"0"}
+        rows = [row for row, _ in cover]
+        size = len(inputs)
+        if not rows:
+            # An empty on-set.
+            self._addConstant(name, False)
+            return
+        if any(set(row) == {"-"} or not row for row in rows):
+            # A row without literals covers everything: a constant.
+            self._addConstant(name, not inverted)
+            return
+        if len(rows) == 1 and "-" not in rows[0] and "0" not in rows[0]:
+            if size == 1:
+                self._addGate("NotGate" if inverted else "BufferGate", inputs, name)
+            else:
+                self._addGate("NandGate" if inverted else "AndGate", inputs, name)
+            return
+        if len(rows) == 1 and size == 1 and rows[0] == "0":
+            self._addGate("BufferGate" if inverted else "NotGate", inputs, name)
+            return
+        if len(rows) == size and all(row.count("1") == 1 and row.count("-") == size - 1 for row in rows) \
+                and {row.index("1") for row in rows} == set(range(size)):
+            self._addGate("NorGate" if inverted else "OrGate", inputs, name)
+            return
+        if size > 1 and len(rows) == 1 << (size - 1) and len(set(rows)) == len(rows) and all("-" not in row for row in rows):
+            parities = {row.count("1") % 2 for row in rows}
+            if len(parities) == 1:
+                odd = parities == {1}
+                self._addGate("XorGate" if odd != inverted else "XnorGate", inputs, name)
+                return
+        # Sum of products.
+        products = []
+        for row in rows:
+            literals = [
+                input if value == "1" else self._negated(input)
+                for input, value in zip(inputs, row) if value != "-"
+            ]
+            if len(literals) == 1:
+                products.append(literals[0])
+            else:
+                products.append(self._signal(self._addGate("AndGate", literals)))
+        if len(products) == 1:
+            self._addGate("NotGate" if inverted else "BufferGate", products, name)
+        else:
+            self._addGate("NorGate" if inverted else "OrGate", products, name)
+
+    def _addConstant(self, name: str, value: bool) -> None:
+        """Add a constant: an unconnected NOT gate for 1, an unconnected buffer for 0."""
+        self._define(name, self._netlist.addComponent("NotGate" if value else "BufferGate"))
+
+    def _signal(self, index: int) -> str:
+        """Name the output of an internal gate, so that other gates can use it."""
+        name = f"{index}$"
+        self._define(name, index)
+        return name
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from logicsimulator.model.CircuitComponent import CircuitComponent
 
 class LogicGate(CircuitComponent):
@@ -5,10 +7,35 @@ class LogicGate(CircuitComponent):
 
     ``LogicGate`` extends :class:`CircuitComponent` and serves as the abstract
     parent class for specific boolean logic gates such as AND, OR, XOR, and NOT.
-    It provides no additional behavior beyond what ``CircuitComponent`` defines,
-    but acts as a semantic grouping for all gate-type components.
+    A gate's output is its :meth:`~CircuitComponent.evaluateBits` function of
+    its inputs, so a gate of any number of inputs and any width is evaluated
+    with a single bitwise operation per input.
+
+    Attributes:
+        delay (int): Propagation delay of the gate in time units, used by the
+            :class:`TimingSimulator`. It can be overridden per gate instance.
     """
 
-    def __init__(self):
-        """Initialize the logic gate and create its input/output pins."""
-        super().__init__()
\ No newline at end of file
+    delay = 1
+
+    def __init__(self, numInputs: Optional[int] = None, width: int = 1):
+        """Initialize the logic gate and create its input/output pins.
+
+        Args:
+            numInputs (Optional[int]): Number of inputs, if not the class default.
+            width (int): Number of bits of the inputs and the output.
+
+        Raises:
+            ValueError: If ``numInputs`` is smaller than one.
+        """
+        if numInputs is not None and numInputs < 1:
+            raise ValueError("A gate needs at least one input")
+        super().__init__(numInputs=numInputs, width=width)
+
+    def _evaluate(self) -> None:
+        """Evaluate the gate output from its inputs.
+
+        Gates on the hot path override this with an inlined equivalent.
+        """
+        value = self.evaluateBits([pin._value for pin in self._inputPins], self._mask)
+        self._value = bool(value) if self._width == 1 else value
\ No newline at end of file
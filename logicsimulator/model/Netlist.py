@@ -0,0 +1,843 @@
+from __future__ import annotations
+from array import array
+from heapq import heappush, heappop
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from logicsimulator.core.registry import ComponentRegistry
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.CompiledCircuit import CompiledCircuit
+from logicsimulator.model.Observer import Observer
+
+class Netlist:
+    """Array-backed netlist storing a circuit as a structure of arrays.
+
+    Where the object model spends several Python objects (a component, its
+    pins and its connections, each with an observer list and weak references)
+    on every gate, ``Netlist`` stores each property of all components in one
+    flat typed array:
+
+    * ``typeCodes``: an index into :attr:`types` per component,
+    * ``faninStart``/``fanins``: for every input pin of every component, the
+      index of the component driving it, or ``-1`` when unconnected,
+    * ``values``: the output value of every component.
+
+    Components have at most one output value, which is the value carried by
+    all their output pins, as in :class:`OutputPin`. Gates are evaluated with
+    their :meth:`CircuitComponent.evaluateBits` method.
+
+    Propagation follows a topological order with the same change detection
+    as :class:`CompiledCircuit`. The fanout arrays and the order are
+    compiled lazily after bulk construction; once compiled, they are kept up
+    to date by :meth:`connect`, :meth:`disconnect` and :meth:`addComponent`:
+    new fanouts are kept aside until they are numerous enough to be worth a
+    recompilation, and the order is repaired with the algorithm of Pearce
+    and Kelly, as in :class:`TopologicalOrder`, so that wiring a circuit one
+    connection at a time does not recompile it after every connection.
+    Lightweight facade objects (:class:`NetlistComponent`, :class:`NetlistPin`
+    and :class:`NetlistConnection`) expose single components with the
+    interface of the object model for the view-model layer; they are created
+    on demand and hold no state besides their indices.
+    """
+
+    def __init__(self):
+        """Initialize an empty netlist."""
+        self._types: List[type] = []
+        self._typeCodes: Dict[str, int] = {}
+        self._typeCode = array("H")
+        self._faninStart = array("i", [0])
+        self._fanins = array("i")
+        self._values = bytearray()
+        self._observers: Dict[tuple, Dict[Observer, None]] = {}
+        self._addedFanouts: Dict[int, List[Tuple[int, int]]] = {}
+        self._numAdded = 0
+        self._compiled = False
+
+    # ---------------- Construction ----------------
+
+    def addComponent(self, type: str, numInputs: Optional[int] = None) -> int:
+        """Append a component of a registered type.
+
+        Args:
+            type (str): The registered type name, e.g. ``"AndGate"``.
+            numInputs (Optional[int]): Number of input pins, for components
+                with a variable number of inputs. Defaults to the class value.
+
+        Returns:
+            int: The index of the new component.
+
+        Raises:
+            KeyError: If no component with the given type is registered.
+            ValueError: If the type cannot be stored in a netlist (see
+                :meth:`_checkType`).
+        """
+        code = self._typeCodes.get(type)
+        if code is None:
+            code = len(self._types)
+            self._types.append(self._checkType(ComponentRegistry.getComponent(type)))
+            self._typeCodes[type] = code
+        cls = self._types[code]
+        if numInputs is None:
+            numInputs = cls.numInputs
+        index = len(self._typeCode)
+        self._typeCode.append(code)
+        self._fanins.extend([-1] * numInputs)
+        self._faninStart.append(len(self._fanins))
+        self._values.append(0)
+        if self._compiled:
+            # A new component has no fanout and can go last in the order.
+            self._fanoutStart.append(self._fanoutStart[-1])
+            self._rank.append(index)
+            self._order.append(index)
+        if numInputs:
+            # Bring the initial value in line with the unconnected inputs.
+            self._values[index] = cls.evaluateBits([0] * numInputs, 1)
+        return index
+
+    @staticmethod
+    def _checkType(cls: type) -> type:
+        """Return a component class after checking that a netlist can store it.
+
+        Raises:
+            ValueError: If the components have several outputs, or have
+                inputs but no bit-parallel evaluation, as clocked components.
+        """
+        if cls.numOutputs > 1:
+            raise ValueError(f"A netlist cannot store {cls.type}: it has several outputs")
+        if cls.numInputs and not cls.supportsBits():
+            raise ValueError(f"A netlist cannot store {cls.type}: it has no bit-parallel evaluation")
+        return cls
+
+    def connect(self, source: int, target: int, pin: int) -> None:
+        """Drive an input pin of ``target`` with the output of ``source``.
+
+        No cycle check is made, which makes this the bulk construction path;
+        cycles are reported when the schedule is compiled. Values are not
+        propagated; call :meth:`evaluate` once construction is complete.
+
+        Args:
+            source (int): Index of the driving component.
+            target (int): Index of the driven component.
+            pin (int): Index of the input pin of ``target``.
+        """
+        slot = self._faninStart[target] + pin
+        previous = self._fanins[slot]
+        if previous == source:
+            return
+        if self._compiled:
+            if previous >= 0:
+                self._removeFanout(previous, target, pin)
+            if self._insertEdge(source, target):
+                self._addFanout(source, target, pin)
+            else:
+                # The cycle is reported by the next compilation.
+                self._compiled = False
+        self._fanins[slot] = source
+
+    def disconnect(self, target: int, pin: int) -> None:
+        """Leave an input pin of ``target`` unconnected.
+
+        Args:
+            target (int): Index of the driven component.
+            pin (int): Index of the input pin of ``target``.
+        """
+        slot = self._faninStart[target] + pin
+        previous = self._fanins[slot]
+        if previous >= 0 and self._compiled:
+            self._removeFanout(previous, target, pin)
+        self._fanins[slot] = -1
+
+    @classmethod
+    def fromComponents(cls, components: Iterable[CircuitComponent]) -> Tuple[Netlist, Dict[CircuitComponent, int]]:
+        """Build a netlist from the object graph reachable from ``components``.
+
+        Args:
+            components (Iterable[CircuitComponent]): Components of the circuit.
+
+        Returns:
+            Tuple[Netlist, Dict[CircuitComponent, int]]: The netlist and the
+            index of every component in it.
+
+        Raises:
+            ValueError: If the graph contains a bus, since a netlist stores
+                one bit per component, or a component that a netlist cannot
+                store (see :meth:`_checkType`).
+        """
+        netlist = cls()
+        index: Dict[CircuitComponent, int] = {}
+        compiled = CompiledCircuit(components)
+        for component in compiled.components:
+            if component.width > 1:
+                raise ValueError("A netlist cannot store buses")
+            index[component] = netlist.addComponent(component.type, len(component.inputPins or ()))
+            netlist._values[index[component]] = 1 if component.value else 0
+        for component in compiled.components:
+            for pin, inputPin in enumerate(component.inputPins or ()):
+                if inputPin.connection is not None:
+                    netlist.connect(index[inputPin.connection.source.parent], index[component], pin)
+        return netlist, index
+
+    @classmethod
+    def fromTables(cls, types: List[str], typeCode: array, faninStart: array, fanins: array, values: bytearray) -> Netlist:
+        """Build a netlist from its arrays, without copying them.
+
+        This is the bulk loading path of :class:`CircuitFile`; the arrays
+        are those of :meth:`__getstate__`.
+
+        Args:
+            types (List[str]): The registered type names.
+            typeCode (array): The ``"H"`` array of type codes.
+            faninStart (array): The ``"i"`` array of fanin offsets, one more
+                than the number of components.
+            fanins (array): The ``"i"`` array of drivers.
+            values (bytearray): The output values.
+
+        Returns:
+            Netlist: The netlist, to be compiled on first use.
+
+        Raises:
+            KeyError: If a type is not registered.
+            ValueError: If a type cannot be stored in a netlist (see
+                :meth:`_checkType`).
+        """
+        netlist = cls.__new__(cls)
+        netlist.__setstate__({
+            "types": types,
+            "typeCode": typeCode,
+            "faninStart": faninStart,
+            "fanins": fanins,
+            "values": values,
+        })
+        return netlist
+
+    def __getstate__(self) -> dict:
+        """Return the picklable state: type names instead of classes, no observers.
+
+        Unpickling looks the types up in :class:`ComponentRegistry`, so a
+        netlist can be sent to another process that registers the same types.
+        """
+        return {
+            "types": [cls.type for cls in self._types],
+            "typeCode": self._typeCode,
+            "faninStart": self._faninStart,
+            "fanins": self._fanins,
+            "values": self._values,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore a netlist pickled with :meth:`__getstate__`."""
+        self._types = [self._checkType(ComponentRegistry.getComponent(type)) for type in state["types"]]
+        self._typeCodes = {type: code for code, type in enumerate(state["types"])}
+        self._typeCode = state["typeCode"]
+        self._faninStart = state["faninStart"]
+        self._fanins = state["fanins"]
+        self._values = state["values"]
+        self._observers = {}
+        self._addedFanouts = {}
+        self._numAdded = 0
+        self._compiled = False
+
+    # ---------------- Queries ----------------
+
+    def __len__(self) -> int:
+        """Return the number of components."""
+        return len(self._typeCode)
+
+    @property
+    def types(self) -> List[type]:
+        """List[type]: The component classes referenced by the type codes."""
+        return self._types
+
+    def type(self, index: int) -> str:
+        """Return the type name of a component."""
+        return self._types[self._typeCode[index]].type
+
+    def numInputs(self, index: int) -> int:
+        """Return the number of input pins of a component."""
+        return self._faninStart[index + 1] - self._faninStart[index]
+
+    def numOutputs(self, index: int) -> int:
+        """Return the number of output pins of a component."""
+        return self._types[self._typeCode[index]].numOutputs
+
+    def fanins(self, index: int) -> List[int]:
+        """Return the driver of every input pin of a component (``-1`` if none)."""
+        return list(self._fanins[self._faninStart[index]:self._faninStart[index + 1]])
+
+    def fanouts(self, index: int) -> List[Tuple[int, int]]:
+        """Return the ``(component, pin)`` pairs driven by a component."""
+        self._compile()
+        return self._fanoutsOf(index)
+
+    def value(self, index: int) -> bool:
+        """Return the output value of a component."""
+        return bool(self._values[index])
+
+    @property
+    def order(self) -> array:
+        """array: Component indices in topological order."""
+        self._compile()
+        return self._order
+
+    def precedes(self, source: int, target: int) -> bool:
+        """Determine whether ``source`` leads to ``target``.
+
+        The netlist is not compiled for the query: before compilation, the
+        drivers of ``target`` are walked back; afterwards, the fanouts of
+        ``source`` are walked forward, only through components before
+        ``target`` in the topological order.
+
+        Args:
+            source (int): Index of the first component.
+            target (int): Index of the second component.
+
+        Returns:
+            bool: ``True`` if a path leads from ``source`` to ``target``.
+        """
+        if source == target:
+            return False
+        if not self._compiled:
+            seen: Set[int] = {target}
+            stack = [target]
+            while stack:
+                for predecessor in self.fanins(stack.pop()):
+                    if predecessor == source:
+                        return True
+                    if predecessor >= 0 and predecessor not in seen:
+                        seen.add(predecessor)
+                        stack.append(predecessor)
+            return False
+        rank = self._rank
+        limit = rank[target]
+        if rank[source] > limit:
+            return False
+        seen = {source}
+        stack = [source]
+        while stack:
+            for successor, _ in self._fanoutsOf(stack.pop()):
+                if successor == target:
+                    return True
+                # Only components before the target in the order can reach it.
+                if successor not in seen and rank[successor] < limit:
+                    seen.add(successor)
+                    stack.append(successor)
+        return False
+
+    # ---------------- Compilation ----------------
+
+    def _compile(self) -> None:
+        """Build the fanout arrays and the topological order.
+
+        Raises:
+            ValueError: If the netlist contains a cycle.
+        """
+        if self._compiled:
+            return
+        size = len(self)
+        counts = array("i", bytes(4 * (size + 1)))
+        for source in self._fanins:
+            if source >= 0:
+                counts[source + 1] += 1
+        fanoutStart = array("i", counts)
+        for index in range(size):
+            fanoutStart[index + 1] += fanoutStart[index]
+        fill = array("i", fanoutStart)
+        fanoutTarget = array("i", bytes(4 * fanoutStart[size]))
+        fanoutPin = array("i", bytes(4 * fanoutStart[size]))
+        inDegree = array("i", bytes(4 * size))
+        for target in range(size):
+            start = self._faninStart[target]
+            for pin in range(self._faninStart[target + 1] - start):
+                source = self._fanins[start + pin]
+                if source >= 0:
+                    fanoutTarget[fill[source]] = target
+                    fanoutPin[fill[source]] = pin
+                    fill[source] += 1
+                    inDegree[target] += 1
+
+        order = array("i")
+        # Popped in index order, so that circuits built from inputs to
+        # outputs keep their order as later connections are made.
+        ready = [index for index in range(size - 1, -1, -1) if inDegree[index] == 0]
+        while ready:
+            current = ready.pop()
+            order.append(current)
+            for position in range(fanoutStart[current], fanoutStart[current + 1]):
+                successor = fanoutTarget[position]
+                inDegree[successor] -= 1
+                if inDegree[successor] == 0:
+                    ready.append(successor)
+        if len(order) != size:
+            raise ValueError("Cannot compile a netlist containing a cycle")
+        rank = array("i", bytes(4 * size))
+        for position, index in enumerate(order):
+            rank[index] = position
+
+        self._fanoutStart = fanoutStart
+        self._fanoutTarget = fanoutTarget
+        self._fanoutPin = fanoutPin
+        self._rank = rank
+        self._order = order
+        self._addedFanouts = {}
+        self._numAdded = 0
+        self._compiled = True
+
+    def _fanoutsOf(self, index: int) -> List[Tuple[int, int]]:
+        """Return the ``(component, pin)`` pairs driven by a component.
+
+        Fanout array entries whose input pin was disconnected or connected
+        to another driver since the compilation are skipped.
+        """
+        fanins, faninStart, fanoutTarget, fanoutPin = self._fanins, self._faninStart, self._fanoutTarget, self._fanoutPin
+        fanouts = [
+            (fanoutTarget[position], fanoutPin[position])
+            for position in range(self._fanoutStart[index], self._fanoutStart[index + 1])
+            if fanins[faninStart[fanoutTarget[position]] + fanoutPin[position]] == index
+        ]
+        added = self._addedFanouts.get(index)
+        if added:
+            fanouts.extend(added)
+        return fanouts
+
+    def _addFanout(self, source: int, target: int, pin: int) -> None:
+        """Record a fanout made after the compilation."""
+        for position in range(self._fanoutStart[source], self._fanoutStart[source + 1]):
+            if self._fanoutTarget[position] == target and self._fanoutPin[position] == pin:
+                # Reconnected: the fanout array entry is valid again.
+                return
+        self._addedFanouts.setdefault(source, []).append((target, pin))
+        self._numAdded += 1
+        # Recompiling costs a pass over the netlist, amortized over the additions.
+        if self._numAdded > max(1024, len(self._fanins) // 4):
+            self._compiled = False
+
+    def _removeFanout(self, source: int, target: int, pin: int) -> None:
+        """Forget a fanout recorded by :meth:`_addFanout`, if any."""
+        added = self._addedFanouts.get(source)
+        if added and (target, pin) in added:
+            added.remove((target, pin))
+
+    def _insertEdge(self, source: int, target: int) -> bool:
+        """Repair the topological order before ``source`` is connected to ``target``.
+
+        Only the components ranked between the two ends are visited: those
+        reachable from ``target`` move after those reaching ``source``.
+
+        Returns:
+            bool: ``False`` if the connection closes a cycle.
+        """
+        rank, order = self._rank, self._order
+        lower, upper = rank[target], rank[source]
+        if lower > upper:
+            return True
+        if source == target:
+            return False
+        forward = [target]
+        visited = {target}
+        stack = [target]
+        while stack:
+            for successor, _ in self._fanoutsOf(stack.pop()):
+                if successor == source:
+                    return False
+                if successor not in visited and rank[successor] < upper:
+                    visited.add(successor)
+                    stack.append(successor)
+                    forward.append(successor)
+        backward = [source]
+        visited = {source}
+        stack = [source]
+        while stack:
+            for predecessor in self.fanins(stack.pop()):
+                if predecessor >= 0 and predecessor not in visited and rank[predecessor] > lower:
+                    visited.add(predecessor)
+                    stack.append(predecessor)
+                    backward.append(predecessor)
+        forward.sort(key=rank.__getitem__)
+        backward.sort(key=rank.__getitem__)
+        components = backward + forward
+        ranks = sorted(rank[component] for component in components)
+        for component, position in zip(components, ranks):
+            rank[component] = position
+            order[position] = component
+        return True
+
+    # ---------------- Simulation ----------------
+
+    def setValue(self, index: int, value: bool) -> None:
+        """Set the value of a source component and propagate it.
+
+        Args:
+            index (int): Index of a component without inputs, such as a switch.
+            value (bool): The new value.
+        """
+        self._values[index] = 1 if value else 0
+        self.propagate(index)
+
+    def toggle(self, index: int) -> None:
+        """Toggle a source component, such as a switch, and propagate the change.
+
+        Args:
+            index (int): Index of a component without inputs.
+        """
+        self.setValue(index, not self._values[index])
+
+    def _evaluateComponent(self, index: int) -> bool:
+        """Evaluate one component from its drivers.
+
+        Returns:
+            bool: ``True`` if its value changed.
+        """
+        start, end = self._faninStart[index], self._faninStart[index + 1]
+        if start == end:
+            return False
+        values = self._values
+        inputs = [values[source] if source >= 0 else 0 for source in self._fanins[start:end]]
+        value = self._types[self._typeCode[index]].evaluateBits(inputs, 1)
+        if value != values[index]:
+            values[index] = value
+            return True
+        return False
+
+    def propagate(self, *sources: int) -> None:
+        """Re-evaluate everything downstream of the given components.
+
+        The sources are re-evaluated, and those without inputs (such as
+        switches) are treated as changed. Components are evaluated in
+        topological order, each at most once, and only if one of their
+        drivers changed.
+
+        Args:
+            *sources (int): Indices of the components whose state changed.
+        """
+        self._compile()
+        rank, order = self._rank, self._order
+        queue = []
+        scheduled: Set[int] = set()
+        changed: List[int] = []
+        for source in sources:
+            if source not in scheduled:
+                scheduled.add(source)
+                heappush(queue, rank[source])
+        changedSources = {source for source in scheduled if self.numInputs(source) == 0}
+        while queue:
+            index = order[heappop(queue)]
+            if self._evaluateComponent(index) or index in changedSources:
+                changed.append(index)
+                for successor, _ in self._fanoutsOf(index):
+                    if successor not in scheduled:
+                        scheduled.add(successor)
+                        heappush(queue, rank[successor])
+        if self._observers:
+            self._notifyChanged(changed)
+
+    def evaluate(self) -> None:
+        """Evaluate every component once, in topological order."""
+        self._compile()
+        changed = [index for index in self._order if self._evaluateComponent(index)]
+        if self._observers:
+            self._notifyChanged(changed)
+
+    # ---------------- Facade support ----------------
+
+    def component(self, index: int) -> NetlistComponent:
+        """Return a facade for a component.
+
+        Args:
+            index (int): Index of the component.
+
+        Returns:
+            NetlistComponent: A facade with the interface of a
+            :class:`CircuitComponent`.
+        """
+        return NetlistComponent(self, index)
+
+    def _attach(self, key: tuple, observer: Observer) -> None:
+        """Register an observer of the facade object identified by ``key``."""
+        self._observers.setdefault(key, {})[observer] = None
+
+    def _detach(self, key: tuple, observer: Observer) -> None:
+        """Unregister an observer of the facade object identified by ``key``."""
+        observers = self._observers.get(key)
+        if observers is not None:
+            observers.pop(observer, None)
+            if not observers:
+                del self._observers[key]
+
+    def _notify(self, key: tuple) -> None:
+        """Notify the observers of the facade object identified by ``key``."""
+        for observer in tuple(self._observers.get(key, ())):
+            observer.update()
+
+    def _notifyChanged(self, changed: List[int]) -> None:
+        """Notify the observers of every facade object whose value changed.
+
+        Args:
+            changed (List[int]): Indices of the components whose value changed.
+        """
+        for index in changed:
+            self._notify(("component", index))
+            for pin in range(self.numOutputs(index)):
+                self._notify(("output", index, pin))
+            for target, pin in self._fanoutsOf(index):
+                self._notify(("connection", target, pin))
+                self._notify(("input", target, pin))
+
+# ------------------------------------------------------------------------
+
+class NetlistObject:
+    """Base class of the facade objects of a :class:`Netlist`.
+
+    Facade objects are identified by their netlist and a key of indices, so
+    two facades of the same element compare equal. Observers attached to a
+    facade are stored in the netlist and notified when its value changes.
+    """
+
+    def __init__(self, netlist: Netlist, key: tuple):
+        """Initialize the facade.
+
+        Args:
+            netlist (Netlist): The netlist holding the element.
+            key (tuple): The key identifying the element in the netlist.
+        """
+        self._netlist = netlist
+        self._key = key
+
+    @property
+    def netlist(self) -> Netlist:
+        """Netlist: The netlist holding the element."""
+        return self._netlist
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, NetlistObject) and self._netlist is other._netlist and self._key == other._key
+
+    def __hash__(self) -> int:
+        return hash((id(self._netlist), self._key))
+
+    def attach(self, observer: Observer) -> None:
+        """Attach an observer notified when the value changes."""
+        self._netlist._attach(self._key, observer)
+
+    def detach(self, observer: Observer) -> None:
+        """Detach a previously attached observer."""
+        self._netlist._detach(self._key, observer)
+
+# ------------------------------------------------------------------------
+
+class NetlistComponent(NetlistObject):
+    """Facade exposing a netlist component like a :class:`CircuitComponent`.
+
+    The pin facades are created once per component facade and kept, so that
+    holders of weak references to pins (such as :class:`PinVM`) see them live
+    as long as the component facade.
+    """
+
+    def __init__(self, netlist: Netlist, index: int):
+        super().__init__(netlist, ("component", index))
+        self._index = index
+        self._inputPins: Optional[List[NetlistInputPin]] = None
+        self._outputPins: Optional[List[NetlistOutputPin]] = None
+
+    @property
+    def index(self) -> int:
+        """int: Index of the component in the netlist."""
+        return self._index
+
+    @property
+    def type(self) -> str:
+        """str: The component type."""
+        return self._netlist.type(self._index)
+
+    @property
+    def value(self) -> bool:
+        """bool: The component's output value."""
+        return self._netlist.value(self._index)
+
+    @property
+    def numInputs(self) -> int:
+        """int: Number of input pins."""
+        return self._netlist.numInputs(self._index)
+
+    @property
+    def numOutputs(self) -> int:
+        """int: Number of output pins."""
+        return self._netlist.numOutputs(self._index)
+
+    @property
+    def inputPins(self) -> Optional[List[NetlistInputPin]]:
+        """Optional[List[NetlistInputPin]]: All input pins, or ``None`` if none exist."""
+        if self.numInputs == 0:
+            return None
+        if self._inputPins is None:
+            self._inputPins = [NetlistInputPin(self._netlist, self._index, pin) for pin in range(self.numInputs)]
+        return self._inputPins
+
+    @property
+    def outputPins(self) -> Optional[List[NetlistOutputPin]]:
+        """Optional[List[NetlistOutputPin]]: All output pins, or ``None`` if none exist."""
+        if self.numOutputs == 0:
+            return None
+        if self._outputPins is None:
+            self._outputPins = [NetlistOutputPin(self._netlist, self._index, pin) for pin in range(self.numOutputs)]
+        return self._outputPins
+
+    def toggle(self) -> None:
+        """Toggle a source component, such as a switch."""
+        self._netlist.toggle(self._index)
+
+    def precedes(self, component: NetlistComponent) -> bool:
+        """Determine whether this component leads to ``component``."""
+        return self._netlist.precedes(self._index, component.index)
+
+# ------------------------------------------------------------------------
+
+class NetlistPin(NetlistObject):
+    """Base class of the pin facades of a netlist component."""
+
+    def __init__(self, netlist: Netlist, key: tuple):
+        super().__init__(netlist, key)
+        self._component = key[1]
+        self._pin = key[2]
+
+    @property
+    def parent(self) -> NetlistComponent:
+        """NetlistComponent: The component this pin belongs to."""
+        return NetlistComponent(self._netlist, self._component)
+
+    @property
+    def index(self) -> int:
+        """int: Index of the pin among the component's pins of its kind."""
+        return self._pin
+
+class NetlistInputPin(NetlistPin):
+    """Facade exposing an input pin of a netlist component like an :class:`InputPin`."""
+
+    type = "InputPin"
+
+    def __init__(self, netlist: Netlist, component: int, pin: int):
+        super().__init__(netlist, ("input", component, pin))
+
+    @property
+    def source(self) -> int:
+        """int: Index of the component driving this pin, or ``-1``."""
+        return self._netlist.fanins(self._component)[self._pin]
+
+    @property
+    def connection(self) -> Optional[NetlistConnection]:
+        """Optional[NetlistConnection]: The connection driving this pin."""
+        if self.source < 0:
+            return None
+        return NetlistConnection(self._netlist, self._component, self._pin, self.source)
+
+    @property
+    def value(self) -> bool:
+        """bool: The value received from the connection."""
+        source = self.source
+        return self._netlist.value(source) if source >= 0 else False
+
+class NetlistOutputPin(NetlistPin):
+    """Facade exposing an output pin of a netlist component like an :class:`OutputPin`."""
+
+    type = "OutputPin"
+
+    def __init__(self, netlist: Netlist, component: int, pin: int):
+        super().__init__(netlist, ("output", component, pin))
+
+    @property
+    def connections(self) -> List[NetlistConnection]:
+        """List[NetlistConnection]: All connections driven by this pin."""
+        return [
+            NetlistConnection(self._netlist, target, pin, self._component)
+            for target, pin in self._netlist.fanouts(self._component)
+        ]
+
+    @property
+    def value(self) -> bool:
+        """bool: The value of the parent component."""
+        return self._netlist.value(self._component)
+
+# ------------------------------------------------------------------------
+
+class NetlistConnection(NetlistObject):
+    """Facade exposing a netlist edge like a :class:`Connection`.
+
+    A connection is identified by the input pin it drives, since an input pin
+    has at most one connection. It remembers its source so that it can be
+    disconnected and connected again, e.g. by undo and redo.
+    """
+
+    type = "Connection"
+
+    def __init__(self, netlist: Netlist, target: int, pin: int, source: int):
+        super().__init__(netlist, ("connection", target, pin))
+        self._target = target
+        self._pin = pin
+        self._sourceIndex = source
+
+    @property
+    def source(self) -> NetlistOutputPin:
+        """NetlistOutputPin: The source/output pin of the connection."""
+        return NetlistOutputPin(self._netlist, self._sourceIndex, 0)
+
+    @property
+    def target(self) -> NetlistInputPin:
+        """NetlistInputPin: The target/input pin of the connection."""
+        return NetlistInputPin(self._netlist, self._target, self._pin)
+
+    @property
+    def value(self) -> bool:
+        """bool: The value carried from the source pin."""
+        return self._netlist.value(self._sourceIndex)
+
+    def connect(self) -> None:
+        """Connect the pins and propagate the source value."""
+        self._netlist.connect(self._sourceIndex, self._target, self._pin)
+        self._netlist.propagate(self._target)
+        self._netlist._notify(self._key)
+        self._netlist._notify(("input", self._target, self._pin))
+
+    def disconnect(self) -> None:
+        """Disconnect the pins and propagate the now unconnected input."""
+        self._netlist.disconnect(self._target, self._pin)
+        self._netlist.propagate(self._target)
+        self._netlist._notify(("input", self._target, self._pin))
+
+    @classmethod
+    def create(cls, pin1: NetlistPin, pin2: NetlistPin) -> Optional[NetlistConnection]:
+        """Create and connect a connection if the pins are compatible.
+
+        Args:
+            pin1 (NetlistPin): First pin.
+            pin2 (NetlistPin): Second pin.
+
+        Returns:
+            Optional[NetlistConnection]: A new connection if the pins can
+            connect, otherwise ``None``.
+        """
+        if not cls.canConnect(pin1, pin2):
+            return None
+        sourcePin, targetPin = cls._order(pin1, pin2)
+        connection = cls(targetPin.netlist, targetPin.parent.index, targetPin.index, sourcePin.parent.index)
+        connection.connect()
+        return connection
+
+    @staticmethod
+    def _order(pin1: NetlistPin, pin2: NetlistPin) -> Tuple[NetlistOutputPin, NetlistInputPin]:
+        """Determine which pin is source and which is target."""
+        if isinstance(pin1, NetlistInputPin):
+            return pin2, pin1
+        return pin1, pin2
+
+    @staticmethod
+    def canConnect(pin1: NetlistPin, pin2: NetlistPin) -> bool:
+        """Check if two pins can be connected.
+
+        Returns:
+            bool: True if the pins belong to different components of the same
+            netlist, one is an input and the other an output, the input is
+            free and the connection would not create a cycle.
+        """
+        if pin1.netlist is not pin2.netlist or pin1.parent == pin2.parent or pin1.type == pin2.type:
+            return False
+        sourcePin, targetPin = NetlistConnection._order(pin1, pin2)
+        if targetPin.source >= 0:
+            return False
+        return not targetPin.parent.precedes(sourcePin.parent)
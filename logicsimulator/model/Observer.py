@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, Tuple
 
 class Observer(ABC):
     """Abstract base class for observers in the Observer pattern.
@@ -23,13 +23,22 @@ class Observer(ABC):
 class Observable:
     """Class representing the observable in the Observer pattern.
 
-    ``Observable`` maintains a list of observers and provides methods to attach,
-    detach, and notify them of changes.
+    ``Observable`` maintains a collection of observers and provides methods to
+    attach, detach, and notify them of changes.
+
+    Observers are kept in an insertion-ordered set (the keys of a dict), so
+    attaching and detaching cost O(1) even on nets with a large fan-out, while
+    observers are still notified in the order they were attached.
     """
 
     def __init__(self):
-        """Initialize the observable with an empty observer list."""
-        self._observers: List[Observer] = []
+        """Initialize the observable with an empty observer collection."""
+        self._observers: Dict[Observer, None] = {}
+
+    @property
+    def observers(self) -> Tuple[Observer, ...]:
+        """Tuple[Observer, ...]: The attached observers, in attachment order."""
+        return tuple(self._observers)
 
     def attach(self, observer: Observer) -> None:
         """Attach an observer if it is not already registered.
@@ -37,8 +46,7 @@ class Observable:
         Args:
             observer (Observer): The observer to attach.
         """
-        if observer not in self._observers:
-            self._observers.append(observer)
+        self._observers.setdefault(observer)
 
     def detach(self, observer: Observer) -> None:
         """Detach a previously registered observer.
@@ -46,14 +54,16 @@ class Observable:
         Args:
             observer (Observer): The observer to remove.
         """
-        if observer in self._observers:
-            self._observers.remove(observer)
+        self._observers.pop(observer, None)
 
     def notify(self, **kwargs) -> None:
         """Notify all attached observers of an update.
 
+        The observers are snapshotted first: observers attached or detached by
+        an ``update`` call take effect from the next notification on.
+
         Args:
             **kwargs: Arbitrary data to forward to each observer's ``update`` method.
         """
-        for observer in self._observers:
+        for observer in tuple(self._observers):
             observer.update(**kwargs)
\ No newline at end of file
@@ -0,0 +1,331 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from logicsimulator.model.Bulb import Bulb
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.CompiledCircuit import CompiledCircuit
+from logicsimulator.model.Netlist import Netlist
+from logicsimulator.model.Switch import Switch
+
+#: Signal of a constant 0, read by unconnected input pins.
+CONST0 = -1
+#: Signal of a constant 1.
+CONST1 = -2
+
+class OptimizationReport:
+    """Gate counts of a :class:`LogicOptimizer` pass.
+
+    Attributes:
+        gatesBefore (int): Gates in the model graph (components other than
+            switches and bulbs).
+        gatesAfter (int): Gates in the optimized netlist.
+        folded (int): Gates that simplified to a constant or to one of their
+            inputs.
+        merged (int): Gates structurally identical to an earlier gate.
+        removed (int): Remaining gates that reach no bulb.
+    """
+
+    def __init__(self, gatesBefore: int, gatesAfter: int, folded: int, merged: int, removed: int):
+        self.gatesBefore = gatesBefore
+        self.gatesAfter = gatesAfter
+        self.folded = folded
+        self.merged = merged
+        self.removed = removed
+
+    @property
+    def reduction(self) -> float:
+        """float: Fraction of the gates eliminated by the pass."""
+        if not self.gatesBefore:
+            return 0.0
+        return 1 - self.gatesAfter / self.gatesBefore
+
+    def __repr__(self) -> str:
+        return (
+            f"OptimizationReport({self.gatesBefore} -> {self.gatesAfter} gates, "
+            f"{self.reduction:.1%} fewer: {self.folded} folded, {self.merged} merged, "
+            f"{self.removed} removed)"
+        )
+
+
+class LogicOptimizer:
+    """Optimization pass turning a model graph into a smaller equivalent netlist.
+
+    The components are visited in topological order, and every gate output
+    is mapped to a signal: a constant (:data:`CONST0`, :data:`CONST1`) or a
+    node of the optimized circuit. Each gate goes through three steps:
+
+    * constant folding: constant inputs are absorbed (``x & 0 = 0``,
+      ``x | 0 = x``, ``x ^ 1 = ~x``, ...), and a gate whose inputs are all
+      constant becomes a constant;
+    * local simplification: repeated inputs are merged (``x & x = x``,
+      ``x ^ x = 0``), complementary inputs are folded (``x & ~x = 0``),
+      double negations cancel, buffers are replaced by their input, and a
+      gate left with a single input is replaced by it, or by its negation
+      for NAND, NOR and XNOR gates;
+    * structural hashing: the gate is looked up by its type and inputs
+      (sorted for commutative gates) among the nodes created so far, as in an
+      and-inverter graph, and reuses an identical node instead of creating
+      a new one.
+
+    The rules apply to the built-in gates, NAND, NOR and XNOR being the
+    negations of AND, OR and XOR. Components of other types, such as
+    single-output subcircuits, are only folded when all their inputs are
+    constant, and hashed with their inputs in order. Finally only the nodes
+    in the fan-in of a bulb are kept. Unconnected input pins read a
+    constant 0, and switches can be tied to constants.
+    """
+
+    #: Gates whose inputs commute and whose simplification rules are known.
+    COMMUTATIVE = ("AndGate", "OrGate", "XorGate", "NandGate", "NorGate", "XnorGate")
+    #: Inverting gates, with the gate they negate.
+    INVERTED = {"NandGate": "AndGate", "NorGate": "OrGate", "XnorGate": "XorGate"}
+
+    def __init__(self, components: Iterable[CircuitComponent], constants: Optional[Dict[Switch, bool]] = None):
+        """Prepare the optimization of the circuit connected to the components.
+
+        Args:
+            components (Iterable[CircuitComponent]): Components of the circuit.
+                Components connected to them are included automatically.
+            constants (Optional[Dict[Switch, bool]]): Switches tied to a
+                constant value.
+
+        Raises:
+            ValueError: If the graph contains a cycle, a clocked component, a
+                bus, or a component with several outputs or no bit-parallel
+                evaluation.
+        """
+        self._circuit = CompiledCircuit(components)
+        for component in self._circuit.components:
+            if component.isClocked:
+                raise ValueError("Cannot optimize a circuit containing clocked components")
+            if component.width > 1:
+                raise ValueError("Cannot optimize a circuit containing buses")
+            if component.numOutputs > 1:
+                raise ValueError(f"Cannot optimize components with several outputs, such as {component.type}")
+            if component.inputPins and not component.supportsBits():
+                raise ValueError(f"Cannot optimize components of type {component.type}")
+        self._constants = dict(constants or {})
+
+    def run(self) -> Tuple[Netlist, Dict[CircuitComponent, int], OptimizationReport]:
+        """Optimize the circuit.
+
+        Returns:
+            Tuple[Netlist, Dict[CircuitComponent, int], OptimizationReport]:
+            The optimized netlist, the index in it of every switch and bulb of
+            the circuit, and the gate counts.
+        """
+        # Nodes of the optimized circuit: (type, fanin signals), in topological order.
+        self._nodes: List[Tuple[str, Tuple[int, ...]]] = []
+        self._hashed: Dict[Tuple[str, Tuple[int, ...]], int] = {}
+        self._hits = 0
+        self._folded = 0
+        self._merged = 0
+        signals: Dict[CircuitComponent, int] = {}
+        switches: List[Tuple[Switch, int]] = []
+        bulbs: List[Tuple[Bulb, int]] = []
+        gates = 0
+
+        for component in self._circuit.components:
+            inputs = [
+                CONST0 if pin.connection is None else signals[pin.connection.source.parent]
+                for pin in component.inputPins or ()
+            ]
+            if isinstance(component, Switch):
+                if component in self._constants:
+                    signals[component] = CONST1 if self._constants[component] else CONST0
+                else:
+                    signals[component] = self._addNode(component.type, ())
+                switches.append((component, signals[component]))
+            elif isinstance(component, Bulb):
+                bulbs.append((component, inputs[0]))
+            else:
+                gates += 1
+                signals[component] = self._gate(component, inputs)
+
+        netlist, index, removed = self._emit(switches, bulbs)
+        report = OptimizationReport(
+            gates,
+            len(netlist) - len(switches) - len(bulbs),
+            self._folded,
+            self._merged,
+            removed,
+        )
+        return netlist, index, report
+
+    # ---------------- Simplification ----------------
+
+    def _addNode(self, type: str, fanins: Tuple[int, ...]) -> int:
+        """Append a node without hashing it.
+
+        Returns:
+            int: The signal of the node.
+        """
+        self._nodes.append((type, fanins))
+        return len(self._nodes) - 1
+
+    def _hash(self, type: str, fanins: Tuple[int, ...]) -> int:
+        """Return the node with the given type and fanins, creating it if needed.
+
+        Returns:
+            int: The signal of the node.
+        """
+        key = (type, fanins)
+        node = self._hashed.get(key)
+        if node is not None:
+            self._hits += 1
+            return node
+        node = self._addNode(type, fanins)
+        self._hashed[key] = node
+        return node
+
+    def _isComplement(self, signal: int, other: int) -> bool:
+        """Determine whether ``signal`` is the negation of ``other``."""
+        return signal >= 0 and self._nodes[signal] == ("NotGate", (other,))
+
+    def _negate(self, signal: int) -> int:
+        """Return the signal of the negation of ``signal``."""
+        if signal == CONST0:
+            return CONST1
+        if signal == CONST1:
+            return CONST0
+        type, fanins = self._nodes[signal]
+        if type == "NotGate":
+            return fanins[0]
+        return self._hash("NotGate", (signal,))
+
+    def _gate(self, component: CircuitComponent, inputs: List[int]) -> int:
+        """Map a gate to the signal of its simplified output.
+
+        Args:
+            component (CircuitComponent): The gate.
+            inputs (List[int]): The signals of its inputs.
+
+        Returns:
+            int: The signal of its output.
+        """
+        type = component.type
+        nodes = len(self._nodes)
+        hits = self._hits
+        if type == "NotGate":
+            signal = self._negate(inputs[0])
+        elif type == "BufferGate":
+            signal = inputs[0]
+        elif type in self.COMMUTATIVE:
+            signal = self._commutative(type, inputs)
+        elif all(signal < 0 for signal in inputs):
+            value = component.evaluateBits([1 if signal == CONST1 else 0 for signal in inputs], 1)
+            signal = CONST1 if value else CONST0
+        else:
+            signal = self._hash(type, tuple(inputs))
+        if len(self._nodes) == nodes:
+            if self._hits != hits:
+                self._merged += 1
+            else:
+                # Neither a new node nor an existing one: a constant or an input.
+                self._folded += 1
+        return signal
+
+    def _commutative(self, type: str, inputs: List[int]) -> int:
+        """Simplify an AND, OR or XOR gate, or one of their negations.
+
+        Args:
+            type (str): The gate type.
+            inputs (List[int]): The signals of its inputs.
+
+        Returns:
+            int: The signal of its output.
+        """
+        base = self.INVERTED.get(type, type)
+        inverted = base != type
+        if base == "XorGate":
+            parity = int(inverted)
+            odd = set()
+            for signal in inputs:
+                if signal == CONST1:
+                    parity ^= 1
+                elif signal != CONST0:
+                    # x ^ x = 0: pairs of equal inputs cancel.
+                    odd ^= {signal}
+            remaining = sorted(odd)
+            if not remaining:
+                return CONST1 if parity else CONST0
+            if len(remaining) == 1:
+                return self._negate(remaining[0]) if parity else remaining[0]
+            return self._hash("XnorGate" if parity else "XorGate", tuple(remaining))
+
+        # AND and OR: one constant absorbs the gate, the other is neutral.
+        absorbing, neutral = (CONST0, CONST1) if base == "AndGate" else (CONST1, CONST0)
+        if absorbing in inputs:
+            return self._negate(absorbing) if inverted else absorbing
+        remaining = sorted({signal for signal in inputs if signal != neutral})
+        for signal in remaining:
+            if any(self._isComplement(signal, other) for other in remaining):
+                return self._negate(absorbing) if inverted else absorbing
+        if not remaining:
+            return self._negate(neutral) if inverted else neutral
+        if len(remaining) == 1:
+            return self._negate(remaining[0]) if inverted else remaining[0]
+        return self._hash(type, tuple(remaining))
+
+    # ---------------- Output ----------------
+
+    def _emit(self, switches: List[Tuple[Switch, int]], bulbs: List[Tuple[Bulb, int]]) -> Tuple[Netlist, Dict[CircuitComponent, int], int]:
+        """Build the netlist of the nodes in the fan-in of the bulbs.
+
+        Args:
+            switches (List[Tuple[Switch, int]]): Every switch, with its signal
+                or its constant.
+            bulbs (List[Tuple[Bulb, int]]): Every bulb, with the signal driving it.
+
+        Returns:
+            Tuple[Netlist, Dict[CircuitComponent, int], int]: The netlist, the
+            index of every switch and bulb, and the number of gate nodes
+            removed because they reach no bulb.
+        """
+        live = [False] * len(self._nodes)
+        stack = [signal for _, signal in bulbs if signal >= 0]
+        while stack:
+            signal = stack.pop()
+            if not live[signal]:
+                live[signal] = True
+                stack.extend(fanin for fanin in self._nodes[signal][1] if fanin >= 0)
+
+        netlist = Netlist()
+        index: Dict[CircuitComponent, int] = {}
+        positions: Dict[int, int] = {}
+        for switch, signal in switches:
+            index[switch] = netlist.addComponent(switch.type)
+            if signal >= 0:
+                positions[signal] = index[switch]
+            else:
+                # Tied switches stay in the netlist, but drive nothing.
+                netlist._values[index[switch]] = 1 if signal == CONST1 else 0
+        removed = 0
+        one = None
+        for signal, (type, fanins) in enumerate(self._nodes):
+            if signal in positions:
+                continue
+            if not live[signal]:
+                removed += 1
+                continue
+            positions[signal] = netlist.addComponent(type, len(fanins))
+        for signal, (_, fanins) in enumerate(self._nodes):
+            if signal not in positions:
+                continue
+            for pin, fanin in enumerate(fanins):
+                if fanin == CONST1:
+                    if one is None:
+                        # A NOT gate with an unconnected input is a constant 1.
+                        one = netlist.addComponent("NotGate")
+                    netlist.connect(one, positions[signal], pin)
+                elif fanin >= 0:
+                    netlist.connect(positions[fanin], positions[signal], pin)
+        for bulb, signal in bulbs:
+            index[bulb] = netlist.addComponent(bulb.type)
+            if signal == CONST1:
+                if one is None:
+                    one = netlist.addComponent("NotGate")
+                netlist.connect(one, index[bulb], 0)
+            elif signal >= 0:
+                netlist.connect(positions[signal], index[bulb], 0)
+        netlist.evaluate()
+        return netlist, index, removed
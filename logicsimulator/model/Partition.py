@@ -0,0 +1,217 @@
+from __future__ import annotations
+from array import array
+from heapq import heappush, heappop
+from typing import List, Set
+
+from logicsimulator.model.Netlist import Netlist
+
+class Partition:
+    """Acyclic K-way partition of a netlist minimizing the cut nets.
+
+    A net, the output of a component, is cut when it drives a component of
+    another part; its value must then be exchanged between the parts. The
+    partition is kept acyclic in the strong sense needed for pipelining: a
+    component never drives a component of a lower part, so part ``i`` only
+    depends on parts ``0`` to ``i - 1``.
+
+    The initial partition cuts a topological order of the netlist into
+    ``parts`` slices of equal size, which is acyclic by construction. The
+    order is a depth-first post-order from the outputs, which keeps the
+    fanin cone of each output together instead of interleaving the cones
+    level by level. It is then refined by Fiduccia-Mattheyses passes
+    restricted to legal moves: a component may move to any part between the
+    highest part of its drivers and the lowest part of the components it
+    drives. Each pass moves every component at most once, taking the move
+    with the highest gain (fewer cut nets) first even when the gain is
+    negative, and finally rolls back to the best prefix of the moves. Part
+    sizes stay within ``imbalance`` of the average.
+    """
+
+    def __init__(self, netlist: Netlist, assignment: array, parts: int):
+        """Wrap an existing assignment; use :meth:`compute` to partition.
+
+        Args:
+            netlist (Netlist): The partitioned netlist.
+            assignment (array): The part of every component.
+            parts (int): Number of parts.
+        """
+        self._netlist = netlist
+        self._assignment = assignment
+        self._parts = parts
+
+    @classmethod
+    def compute(cls, netlist: Netlist, parts: int, imbalance: float = 0.1, passes: int = 8) -> Partition:
+        """Partition a netlist.
+
+        Args:
+            netlist (Netlist): The netlist.
+            parts (int): Number of parts, at least one.
+            imbalance (float): Allowed relative deviation of the part sizes
+                from the average.
+            passes (int): Maximum number of refinement passes.
+
+        Returns:
+            Partition: The partition.
+
+        Raises:
+            ValueError: If ``parts`` is smaller than one or the netlist
+                contains a cycle.
+        """
+        if parts < 1:
+            raise ValueError("A partition needs at least one part")
+        size = len(netlist)
+        assignment = array("i", bytes(4 * size))
+        for position, index in enumerate(cls._coneOrder(netlist)):
+            assignment[index] = position * parts // max(size, 1)
+        partition = cls(netlist, assignment, parts)
+        average = size / parts
+        partition._minSize = int(average * (1 - imbalance))
+        partition._maxSize = max(int(average * (1 + imbalance)), 1)
+        for _ in range(passes):
+            if not partition._refine():
+                break
+        return partition
+
+    @staticmethod
+    def _coneOrder(netlist: Netlist) -> List[int]:
+        """Return a topological order listing the fanin cones one after another.
+
+        Raises:
+            ValueError: If the netlist contains a cycle.
+        """
+        # Compiling the netlist checks that it is acyclic.
+        netlist._compile()
+        size = len(netlist)
+        outputs = [index for index in range(size) if netlist.numOutputs(index) == 0]
+        visited = [False] * size
+        order: List[int] = []
+        for root in outputs + list(range(size)):
+            if visited[root]:
+                continue
+            visited[root] = True
+            stack = [(root, iter(netlist.fanins(root)))]
+            while stack:
+                index, fanins = stack[-1]
+                for source in fanins:
+                    if source >= 0 and not visited[source]:
+                        visited[source] = True
+                        stack.append((source, iter(netlist.fanins(source))))
+                        break
+                else:
+                    stack.pop()
+                    order.append(index)
+        return order
+
+    @property
+    def netlist(self) -> Netlist:
+        """Netlist: The partitioned netlist."""
+        return self._netlist
+
+    @property
+    def parts(self) -> int:
+        """int: Number of parts."""
+        return self._parts
+
+    @property
+    def assignment(self) -> array:
+        """array: The part of every component."""
+        return self._assignment
+
+    def members(self, part: int) -> List[int]:
+        """Return the components of a part, in netlist order."""
+        return [index for index, owner in enumerate(self._assignment) if owner == part]
+
+    def sizes(self) -> List[int]:
+        """Return the number of components of every part."""
+        sizes = [0] * self._parts
+        for part in self._assignment:
+            sizes[part] += 1
+        return sizes
+
+    def cutNets(self) -> List[int]:
+        """Return the components whose output drives another part, in netlist order."""
+        return [index for index in range(len(self._netlist)) if self._isCut(index)]
+
+    def _isCut(self, index: int) -> bool:
+        """Determine whether the net of a component drives another part."""
+        part = self._assignment[index]
+        return any(self._assignment[target] != part for target, _ in self._netlist.fanouts(index))
+
+    def _drivers(self, index: int) -> Set[int]:
+        """Return the distinct components driving a component."""
+        return {source for source in self._netlist.fanins(index) if source >= 0}
+
+    def _range(self, index: int) -> range:
+        """Return the parts a component may legally move to."""
+        assignment = self._assignment
+        low = max((assignment[source] for source in self._drivers(index)), default=0)
+        high = min((assignment[target] for target, _ in self._netlist.fanouts(index)), default=self._parts - 1)
+        return range(low, high + 1)
+
+    def _gain(self, index: int, part: int) -> int:
+        """Return the decrease in cut nets if a component moved to a part."""
+        affected = self._drivers(index) | {index}
+        before = sum(self._isCut(net) for net in affected)
+        old = self._assignment[index]
+        self._assignment[index] = part
+        after = sum(self._isCut(net) for net in affected)
+        self._assignment[index] = old
+        return before - after
+
+    def _bestMove(self, index: int, sizes: List[int]):
+        """Return the best legal move of a component as ``(gain, part)``, or ``None``."""
+        best = None
+        for part in self._range(index):
+            if part == self._assignment[index] or sizes[part] >= self._maxSize:
+                continue
+            gain = self._gain(index, part)
+            if best is None or gain > best[0]:
+                best = (gain, part)
+        return best
+
+    def _refine(self) -> bool:
+        """Run one Fiduccia-Mattheyses pass.
+
+        Returns:
+            bool: ``True`` if the pass reduced the number of cut nets.
+        """
+        sizes = self.sizes()
+        locked = [False] * len(self._netlist)
+        queue = []
+        for index in range(len(self._netlist)):
+            move = self._bestMove(index, sizes)
+            if move is not None:
+                heappush(queue, (-move[0], index, move[1]))
+        moves = []
+        total = best = 0
+        bestLength = 0
+        while queue:
+            negative, index, part = heappop(queue)
+            if locked[index]:
+                continue
+            old = self._assignment[index]
+            move = self._bestMove(index, sizes)
+            if move is None or sizes[old] <= self._minSize:
+                continue
+            if (-negative, part) != move:
+                # The gain changed since the move was queued: queue it again.
+                heappush(queue, (-move[0], index, move[1]))
+                continue
+            self._assignment[index] = part
+            sizes[old] -= 1
+            sizes[part] += 1
+            locked[index] = True
+            moves.append((index, old))
+            total += move[0]
+            if total > best:
+                best, bestLength = total, len(moves)
+            # The gains and legal moves of the neighbours changed.
+            neighbours = self._drivers(index) | {target for target, _ in self._netlist.fanouts(index)}
+            for neighbour in neighbours:
+                if not locked[neighbour]:
+                    move = self._bestMove(neighbour, sizes)
+                    if move is not None:
+                        heappush(queue, (-move[0], neighbour, move[1]))
+        for index, old in reversed(moves[bestLength:]):
+            self._assignment[index] = old
+        return best > 0
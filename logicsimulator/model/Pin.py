@@ -1,9 +1,10 @@
 from __future__ import annotations
-from typing import Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List
 from abc import ABC, abstractmethod
 import weakref
 
 from logicsimulator.model.Propagator import Propagator
+from logicsimulator.model.TopologicalOrder import TopologicalOrder
 
 class Pin(Propagator, ABC):
     """Abstract base class for circuit pins.
@@ -27,6 +28,11 @@ class Pin(Propagator, ABC):
         """CircuitComponent: The parent component of this pin."""
         return self._parent()
 
+    @property
+    def width(self) -> int:
+        """int: Number of bits carried by the pin, that of its parent."""
+        return self.parent.width
+
     @property
     @abstractmethod
     def type(self) -> str:
@@ -91,22 +97,23 @@ class OutputPin(Pin):
     def __init__(self, parent: "CircuitComponent"):
         super().__init__(parent)
         parent.attach(self)
-        self._connections: List[Connection] = []
+        # Insertion-ordered set, like the observers of ``Observable``.
+        self._connections: Dict[Connection, None] = {}
 
     @property
     def connections(self) -> List[Connection]:
         """List[Connection]: All connections attached to this output pin."""
-        return self._connections
+        return list(self._connections)
 
     def connect(self, conn: Connection) -> None:
         """Attach a new connection to this output pin."""
-        self._connections.append(conn)
+        self._connections.setdefault(conn)
         self.attach(conn)
 
     def disconnect(self, conn: Connection) -> None:
         """Remove a connection from this output pin."""
         self.detach(conn)
-        self._connections.remove(conn)
+        del self._connections[conn]
 
     def _evaluate(self) -> None:
         """Set the output value based on the parent component's value."""
@@ -151,8 +158,13 @@ class Connection(Propagator):
         self._value = self.source.value
 
     def connect(self):
-        """Attach the connection to the source and target pins."""
+        """Attach the connection to the source and target pins.
+
+        The dynamic topological order of the components is updated for the
+        new edge (see :class:`TopologicalOrder`).
+        """
         self.source.connect(self)
+        TopologicalOrder.insertEdge(self.source.parent, self.target.parent)
         self.update()
         self.target.connect(self)
 
@@ -203,6 +215,11 @@ class Connection(Propagator):
     def _createsCycle(sourcePin: OutputPin, targetPin: InputPin) -> bool:
         """Check if connecting the pins would create a cycle.
 
+        The check is bounded by the dynamic topological order and is O(1)
+        whenever the source already precedes the target in that order.
+        Connections into clocked components never create a cycle, since the
+        clock edge breaks the combinational path.
+
         Args:
             sourcePin (OutputPin): The proposed source pin.
             targetPin (InputPin): The proposed target pin.
@@ -210,6 +227,8 @@ class Connection(Propagator):
         Returns:
             bool: True if a cycle would be created, False otherwise.
         """
+        if targetPin.parent.isClocked:
+            return False
         return targetPin.parent.precedes(sourcePin.parent)
 
     @staticmethod
@@ -222,9 +241,9 @@ class Connection(Propagator):
 
         Returns:
             bool: True if the pins can connect without creating a cycle,
-                and they belong to different components.
+                they belong to different components and have the same width.
         """
-        if not pin1.parent == pin2.parent and not pin1.type == pin2.type:
+        if not pin1.parent == pin2.parent and not pin1.type == pin2.type and pin1.width == pin2.width:
             sourcePin, targetPin = Connection._order(pin1, pin2)
             if targetPin.connection is None and not Connection._createsCycle(sourcePin, targetPin):
                 return True
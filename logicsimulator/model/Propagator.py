@@ -9,6 +9,9 @@ class Propagator(Observer, Observable, ABC):
     notifies its observers. Subclasses must implement the :meth:`_evaluate`
     method, which updates the internal value based on the component's logic.
 
+    Observers are only notified when the evaluation actually changed the
+    value, so propagation stops at the first propagator whose value is stable.
+
     Attributes:
         value (bool): The current boolean value after evaluation.
     """
@@ -31,10 +34,12 @@ class Propagator(Observer, Observable, ABC):
         """React to an update from an observed object.
 
         When invoked, the propagator evaluates its new state and notifies its
-        observers of the updated value.
+        observers if the value changed.
         """
+        oldValue = self._value
         self._evaluate()
-        self.notify()
+        if self._value != oldValue:
+            self.notify()
 
     @abstractmethod
     def _evaluate(self) -> None:
@@ -0,0 +1,154 @@
+from heapq import heappush, heappop
+from itertools import count
+from typing import Dict, List
+
+from logicsimulator.model.CircuitComponent import CircuitComponent
+
+class ReachabilityIndex:
+    """Cached transitive closure of the component graph, stored as bitsets.
+
+    Every registered component is assigned a bit, and the index keeps, for
+    every component, the set of components upstream of it (including itself)
+    as a Python integer bitset. Reachability questions are then answered with
+    a single bit test, and "which components are not upstream of X" takes a
+    single pass over the components.
+
+    The index is updated incrementally: a new connection ORs the upstream set
+    of its source into the components downstream of its target, and a removed
+    connection recomputes the upstream sets downstream of its target in
+    topological order. Both updates stop as soon as the sets stop changing.
+    Connections must be registered after they are made in the model, and
+    unregistered after they are removed from it. Connections into clocked
+    components do not make their sources upstream, since a clock edge breaks
+    the combinational path.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._bits: Dict[CircuitComponent, int] = {}
+        self._freeBits: List[int] = []
+        self._upstream: Dict[CircuitComponent, int] = {}
+
+    def __contains__(self, component: CircuitComponent) -> bool:
+        """Return whether a component is registered."""
+        return component in self._bits
+
+    @property
+    def components(self) -> List[CircuitComponent]:
+        """List[CircuitComponent]: All registered components."""
+        return list(self._bits)
+
+    def addComponent(self, component: CircuitComponent) -> None:
+        """Register a component, together with its existing connections.
+
+        Args:
+            component (CircuitComponent): The component to register.
+        """
+        if component in self._bits:
+            return
+        bit = self._freeBits.pop() if self._freeBits else len(self._bits)
+        self._bits[component] = 1 << bit
+        self._upstream[component] = self._bits[component]
+        for predecessor in component.predecessors():
+            self.addConnection(predecessor, component)
+        for successor in component.successors():
+            self.addConnection(component, successor)
+
+    def removeComponent(self, component: CircuitComponent) -> None:
+        """Unregister a component whose connections were already removed.
+
+        Args:
+            component (CircuitComponent): The component to unregister.
+        """
+        bit = self._bits.pop(component, None)
+        if bit is not None:
+            self._upstream.pop(component)
+            self._freeBits.append(bit.bit_length() - 1)
+
+    def addConnection(self, source: CircuitComponent, target: CircuitComponent) -> None:
+        """Account for a new connection from ``source`` to ``target``.
+
+        Args:
+            source (CircuitComponent): The driving component.
+            target (CircuitComponent): The driven component.
+        """
+        if source not in self._bits or target not in self._bits or target.isClocked:
+            return
+        upstream = self._upstream[source]
+        stack = [target]
+        while stack:
+            component = stack.pop()
+            merged = self._upstream[component] | upstream
+            if merged != self._upstream[component]:
+                self._upstream[component] = merged
+                stack.extend(self._successors(component))
+
+    def removeConnection(self, source: CircuitComponent, target: CircuitComponent) -> None:
+        """Account for the removal of the connection from ``source`` to ``target``.
+
+        Args:
+            source (CircuitComponent): The formerly driving component.
+            target (CircuitComponent): The formerly driven component.
+        """
+        if target not in self._bits or target.isClocked:
+            return
+        # Recompute in topological order, so predecessors are always up to date.
+        counter = count()
+        queue = [(target.topologicalIndex, next(counter), target)]
+        scheduled = {target}
+        while queue:
+            component = heappop(queue)[2]
+            upstream = self._bits[component]
+            for predecessor in component.predecessors():
+                upstream |= self._upstream.get(predecessor, 0)
+            if upstream != self._upstream[component]:
+                self._upstream[component] = upstream
+                for successor in self._successors(component):
+                    if successor not in scheduled:
+                        scheduled.add(successor)
+                        heappush(queue, (successor.topologicalIndex, next(counter), successor))
+
+    def _successors(self, component: CircuitComponent) -> List[CircuitComponent]:
+        """Return the registered components combinationally driven by ``component``."""
+        return [
+            successor for successor in component.successors()
+            if successor in self._bits and not successor.isClocked
+        ]
+
+    def isUpstream(self, component: CircuitComponent, of: CircuitComponent) -> bool:
+        """Return whether ``component`` is ``of`` itself or leads to it.
+
+        Args:
+            component (CircuitComponent): The candidate upstream component.
+            of (CircuitComponent): The reference component.
+
+        Returns:
+            bool: ``True`` if a path leads from ``component`` to ``of``.
+        """
+        return bool(self._upstream[of] & self._bits[component])
+
+    def notUpstreamOf(self, component: CircuitComponent) -> List[CircuitComponent]:
+        """Return the components that ``component`` may drive without a cycle.
+
+        Args:
+            component (CircuitComponent): The reference component.
+
+        Returns:
+            List[CircuitComponent]: Every registered component other than
+            ``component`` that does not lead to it.
+        """
+        upstream = self._upstream[component]
+        return [other for other, bit in self._bits.items() if not upstream & bit]
+
+    def notDownstreamOf(self, component: CircuitComponent) -> List[CircuitComponent]:
+        """Return the components that may drive ``component`` without a cycle.
+
+        Args:
+            component (CircuitComponent): The reference component.
+
+        Returns:
+            List[CircuitComponent]: Every registered component other than
+            ``component`` that it does not lead to.
+        """
+        bit = self._bits[component]
+        return [other for other, upstream in self._upstream.items() if not upstream & bit]
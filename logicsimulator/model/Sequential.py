@@ -0,0 +1,169 @@
+from abc import abstractmethod
+from typing import List, Optional
+
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.Switch import Switch
+
+class ClockedComponent(CircuitComponent):
+    """Base class for edge-triggered components holding a state.
+
+    The last input pin of a clocked component is its clock input (``CLK``);
+    the other input pins are data inputs. The value of the component is its
+    stored state, which only changes on a rising edge of the clock input, to
+    the result of :meth:`nextState` applied to the data inputs.
+
+    Since their value does not depend combinationally on their inputs,
+    connections into clocked components are allowed to close cycles, and are
+    ignored by the topological order and by the cycle checks.
+
+    Attributes:
+        delay (int): Clock-to-output delay in time units, used by the
+            :class:`TimingSimulator`.
+    """
+
+    isClocked = True
+    delay = 1
+
+    def __init__(self):
+        """Initialize the component with a cleared state and a low clock."""
+        self._clock = False
+        self._next: Optional[bool] = None
+        super().__init__()
+
+    @property
+    def clockPin(self):
+        """InputPin: The clock input pin."""
+        return self._inputPins[-1]
+
+    @property
+    def dataPins(self):
+        """List[InputPin]: The data input pins, in order."""
+        return self._inputPins[:-1]
+
+    @staticmethod
+    @abstractmethod
+    def nextState(inputs: List[int], state: int) -> int:
+        """Compute the state loaded on a rising clock edge.
+
+        Args:
+            inputs (List[int]): The values of the data input pins, as 0 or 1.
+            state (int): The current state, as 0 or 1.
+
+        Returns:
+            int: The next state, as 0 or 1.
+        """
+        pass
+
+    def sample(self) -> None:
+        """Capture the next state ahead of a rising clock edge.
+
+        Sampling every clocked component before the clock rises makes all of
+        them load the values of the previous cycle, no matter in which order
+        the clock edge reaches them.
+        """
+        self._next = self._computeNext()
+
+    def restore(self, state: int) -> None:
+        """Set the stored state without a clock edge, as when loading a saved circuit.
+
+        The current clock input is taken as the previous clock level, so a
+        high clock does not load the data inputs on the next evaluation.
+
+        Args:
+            state (int): The stored state, as 0 or 1.
+        """
+        self._clock = self.clockPin.value
+        self._next = None
+        if bool(state) != self._value:
+            self._value = bool(state)
+            self.notify()
+
+    def _computeNext(self) -> bool:
+        """Return the next state for the current data inputs."""
+        inputs = [int(pin.value) for pin in self.dataPins]
+        return bool(self.nextState(inputs, int(self._value)))
+
+    def _evaluate(self) -> None:
+        """Load the next state on a rising edge of the clock input."""
+        clock = self.clockPin.value
+        if clock and not self._clock:
+            self._value = self._next if self._next is not None else self._computeNext()
+            self._next = None
+        self._clock = clock
+
+
+class DFlipFlop(ClockedComponent):
+    """Edge-triggered D flip-flop.
+
+    The ``DFlipFlop`` has a data input ``D`` and a clock input ``CLK``, and
+    loads ``D`` on every rising edge of ``CLK``.
+    """
+
+    type = "DFlipFlop"
+    numInputs = 2
+    numOutputs = 1
+
+    def __init__(self):
+        """Initialize the flip-flop with a cleared state."""
+        super().__init__()
+
+    @staticmethod
+    def nextState(inputs: List[int], state: int) -> int:
+        """Load the ``D`` input."""
+        return inputs[0]
+
+
+class Register(ClockedComponent):
+    """Edge-triggered register bit with a load enable.
+
+    The ``Register`` has a data input ``D``, an enable input ``EN`` and a
+    clock input ``CLK``. It loads ``D`` on a rising edge of ``CLK`` when
+    ``EN`` is high, and keeps its state otherwise.
+    """
+
+    type = "Register"
+    numInputs = 3
+    numOutputs = 1
+
+    def __init__(self):
+        """Initialize the register with a cleared state."""
+        super().__init__()
+
+    @staticmethod
+    def nextState(inputs: List[int], state: int) -> int:
+        """Load the ``D`` input if ``EN`` is high, else keep the state."""
+        return inputs[0] if inputs[1] else state
+
+
+class Clock(Switch):
+    """A switch driving the clock inputs of clocked components.
+
+    Toggling the clock from low to high is a rising edge: the clocked
+    components it drives first :meth:`~ClockedComponent.sample` their data
+    inputs, so that the edge behaves as if it reached all of them at once.
+    """
+
+    type = "Clock"
+
+    def __init__(self):
+        """Initialize the clock low."""
+        super().__init__()
+
+    def toggle(self) -> None:
+        """Toggle the clock, sampling the clocked components on a rising edge."""
+        if not self._value:
+            self.sample()
+        super().toggle()
+
+    def tick(self) -> None:
+        """Run one full clock cycle: a rising edge followed by a falling edge."""
+        self.toggle()
+        self.toggle()
+
+    def sample(self) -> None:
+        """Sample the clocked components whose clock input this clock drives."""
+        for pin in self._outputPins:
+            for connection in pin.connections:
+                target = connection.target
+                if target.parent.isClocked and target is target.parent.clockPin:
+                    target.parent.sample()
@@ -0,0 +1,422 @@
+from __future__ import annotations
+from heapq import heappush, heappop
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from logicsimulator.core.registry import ComponentRegistry
+from logicsimulator.model.Bulb import Bulb
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.Pin import OutputPin
+from logicsimulator.model.Switch import Switch
+
+class SubcircuitTemplate:
+    """Compiled netlist of a subcircuit, shared by all its instances.
+
+    A template is built from a selection of components: its switches become
+    the inputs of the subcircuit and its bulbs become the outputs, in the
+    order of the selection. Every other component becomes an operation of a
+    flat program evaluated on a list of words, the state vector of an
+    instance. Slot 0 of the state vector always holds 0 (for unconnected
+    pins and pins driven from outside the selection), slots ``1..n`` hold
+    the inputs, and the result of operation ``i`` is stored in slot
+    ``n + 1 + i``. Operations are stored in topological order, and nested
+    subcircuits are flattened into the program of the enclosing template.
+
+    The template creates a :class:`Subcircuit` subclass, :attr:`componentClass`,
+    whose instances only hold their state vector besides their pins. The
+    class can be registered in :class:`ComponentRegistry` like any other
+    component type with :meth:`register`. The program, with the type name of
+    every operation, is available as :attr:`program`, from which
+    :meth:`fromProgram` rebuilds the template, e.g. when a saved circuit is
+    loaded in another session.
+    """
+
+    def __init__(self, name: str, components: Iterable[CircuitComponent]):
+        """Compile a subcircuit from a selection of components.
+
+        Args:
+            name (str): Type name of the subcircuit.
+            components (Iterable[CircuitComponent]): The selected components.
+
+        Raises:
+            ValueError: If the name is not an identifier without underscores
+                (ids of the view are ``<type>_<uuid>``), or if the selection
+                has no bulb, contains clocked components, or mixes widths.
+        """
+        self._checkName(name)
+        components = list(components)
+        if any(component.isClocked for component in components):
+            raise ValueError("Subcircuits cannot contain clocked components")
+        widths = {component.width for component in components}
+        if len(widths) > 1:
+            raise ValueError("All components of a subcircuit must have the same width")
+        inputs = [component for component in components if isinstance(component, Switch)]
+        outputs = [component for component in components if isinstance(component, Bulb)]
+        if not outputs:
+            raise ValueError("A subcircuit needs at least one bulb as output")
+
+        self._name = name
+        self._width = widths.pop()
+        self._numInputs = len(inputs)
+        # Each operation is (evaluateBits, fanin slots, delay), of the type in _types.
+        self._operations: List[Tuple[Callable, Tuple[int, ...], int]] = []
+        self._types: List[str] = []
+        slots: Dict[Tuple[CircuitComponent, int], int] = {
+            (component, 0): slot for slot, component in enumerate(inputs, start=1)
+        }
+        selected = set(components)
+        body = [component for component in components if not isinstance(component, Switch)]
+        for component in sorted(body, key=lambda component: component.topologicalIndex):
+            fanins = []
+            for pin in component.inputPins or ():
+                source = None if pin.connection is None else pin.connection.source
+                if source is None or source.parent not in selected:
+                    fanins.append(0)
+                else:
+                    fanins.append(slots[(source.parent, source.parent.outputPins.index(source))])
+            if isinstance(component, Subcircuit):
+                for index, slot in enumerate(self._inline(component.template, fanins)):
+                    slots[(component, index)] = slot
+            else:
+                self._operations.append((component.evaluateBits, tuple(fanins), component.delay))
+                self._types.append(component.type)
+                slots[(component, 0)] = self._numInputs + len(self._operations)
+        self._outputs = [slots[(bulb, 0)] for bulb in outputs]
+        self._createClass()
+
+    @classmethod
+    def fromProgram(cls, name: str, width: int, numInputs: int, outputs: Sequence[int], operations: Sequence[Tuple[str, Sequence[int]]]) -> SubcircuitTemplate:
+        """Rebuild a template from its :attr:`program`.
+
+        Args:
+            name (str): Type name of the subcircuit.
+            width (int): Number of bits of every input and output.
+            numInputs (int): Number of inputs.
+            outputs (Sequence[int]): Slot of every output.
+            operations (Sequence[Tuple[str, Sequence[int]]]): Type name and
+                fanin slots of every operation, in program order.
+
+        Returns:
+            SubcircuitTemplate: The template, not registered yet.
+
+        Raises:
+            ValueError: If the name is not valid.
+            KeyError: If the type of an operation is not registered.
+        """
+        cls._checkName(name)
+        template = cls.__new__(cls)
+        template._name = name
+        template._width = width
+        template._numInputs = numInputs
+        template._operations = []
+        template._types = []
+        for type, fanins in operations:
+            component = ComponentRegistry.getComponent(type)
+            template._operations.append((component.evaluateBits, tuple(fanins), component.delay))
+            template._types.append(type)
+        template._outputs = list(outputs)
+        template._createClass()
+        return template
+
+    @staticmethod
+    def _checkName(name: str) -> None:
+        """Raise a ValueError if ``name`` is not a valid subcircuit name."""
+        if not name.isidentifier() or "_" in name:
+            raise ValueError("A subcircuit name must be an identifier without underscores")
+
+    def _createClass(self) -> None:
+        """Compile the program and create :attr:`componentClass`."""
+        self._compile()
+        self._componentClass = type(self._name, (Subcircuit,), {
+            "type": self._name,
+            "numInputs": self._numInputs,
+            "numOutputs": len(self._outputs),
+            "delay": self._delay,
+            "template": self,
+            "__doc__": f"Instance of the ``{self._name}`` subcircuit.",
+        })
+        if len(self._outputs) == 1:
+            self._componentClass.evaluateBits = staticmethod(self.evaluate)
+
+    def _inline(self, template: "SubcircuitTemplate", fanins: List[int]) -> List[int]:
+        """Append the operations of a nested template to the program.
+
+        Args:
+            template (SubcircuitTemplate): The template of the nested instance.
+            fanins (List[int]): Slots driving the inputs of the instance.
+
+        Returns:
+            List[int]: The slots holding the outputs of the instance.
+        """
+        base = self._numInputs + len(self._operations)
+        # Inner slot 0 stays 0, inner inputs map to the fanins, the rest is shifted.
+        remap = [0] + fanins + [base + index for index in range(1, len(template._operations) + 1)]
+        for evaluateBits, innerFanins, delay in template._operations:
+            self._operations.append((evaluateBits, tuple(remap[slot] for slot in innerFanins), delay))
+        self._types.extend(template._types)
+        return [remap[slot] for slot in template._outputs]
+
+    def _compile(self) -> None:
+        """Build the readers, the fanout lists, the delay and the initial state."""
+        base = self._numInputs + 1
+        size = base + len(self._operations)
+        self._readers: List[Callable[[List[int]], Sequence[int]]] = []
+        self._fanout: List[List[int]] = [[] for _ in range(size)]
+        arrival = [0] * size
+        for position, (_, fanins, delay) in enumerate(self._operations):
+            self._readers.append(self._reader(fanins))
+            for slot in set(fanins):
+                self._fanout[slot].append(position)
+            arrival[base + position] = max((arrival[slot] for slot in fanins), default=0) + delay
+        self._delay = max(arrival[slot] for slot in self._outputs)
+
+        self._initialState = [0] * size
+        self._evaluateAll(self._initialState, self.mask)
+
+    @staticmethod
+    def _reader(fanins: Tuple[int, ...]) -> Callable[[List[int]], Sequence[int]]:
+        """Return a function reading the given slots of a state vector.
+
+        Args:
+            fanins (Tuple[int, ...]): The slots to read.
+
+        Returns:
+            Callable[[List[int]], Sequence[int]]: Takes the state vector and
+            returns one value per slot.
+        """
+        if len(fanins) == 1:
+            # itemgetter with a single index returns the item, not a tuple.
+            fanin = fanins[0]
+            return lambda state: (state[fanin],)
+        return itemgetter(*fanins)
+
+    @property
+    def name(self) -> str:
+        """str: Type name of the subcircuit."""
+        return self._name
+
+    @property
+    def width(self) -> int:
+        """int: Number of bits of every input and output."""
+        return self._width
+
+    @property
+    def mask(self) -> int:
+        """int: A word with the :attr:`width` low bits set."""
+        return (1 << self._width) - 1
+
+    @property
+    def numInputs(self) -> int:
+        """int: Number of inputs, one per switch of the selection."""
+        return self._numInputs
+
+    @property
+    def numOutputs(self) -> int:
+        """int: Number of outputs, one per bulb of the selection."""
+        return len(self._outputs)
+
+    @property
+    def size(self) -> int:
+        """int: Number of slots of the state vector of an instance."""
+        return len(self._initialState)
+
+    @property
+    def delay(self) -> int:
+        """int: Longest sum of delays from an input to an output."""
+        return self._delay
+
+    @property
+    def program(self) -> Tuple[str, int, int, List[int], List[Tuple[str, Tuple[int, ...]]]]:
+        """Tuple[str, int, int, List[int], List[Tuple[str, Tuple[int, ...]]]]: The
+        name, width, number of inputs, output slots and operations (type name
+        and fanin slots) of the template, the arguments of :meth:`fromProgram`."""
+        operations = [(type, fanins) for type, (_, fanins, _) in zip(self._types, self._operations)]
+        return (self._name, self._width, self._numInputs, list(self._outputs), operations)
+
+    @property
+    def componentClass(self) -> type:
+        """type: The :class:`Subcircuit` subclass of the instances."""
+        return self._componentClass
+
+    def register(self) -> type:
+        """Register :attr:`componentClass` in :class:`ComponentRegistry`.
+
+        Returns:
+            type: The registered class.
+
+        Raises:
+            ValueError: If another component is registered under the name.
+        """
+        ComponentRegistry.register(self._componentClass)
+        return self._componentClass
+
+    def initialState(self) -> List[int]:
+        """Return a new state vector for all inputs at 0."""
+        return list(self._initialState)
+
+    def evaluate(self, inputs: Sequence[int], mask: int) -> int:
+        """Evaluate a single-output subcircuit on bit-packed input words.
+
+        This is the :meth:`CircuitComponent.evaluateBits` method of the
+        instances of single-output templates.
+
+        Args:
+            inputs (Sequence[int]): One packed word per input.
+            mask (int): A word with every used bit set.
+
+        Returns:
+            int: The packed output word.
+        """
+        state = [0]
+        state.extend(inputs)
+        state.extend([0] * len(self._operations))
+        self._evaluateAll(state, mask)
+        return state[self._outputs[0]]
+
+    def _evaluateAll(self, state: List[int], mask: int) -> None:
+        """Evaluate every operation once, in program order.
+
+        Args:
+            state (List[int]): The state vector, updated in place.
+            mask (int): A word with every used bit set.
+        """
+        slot = self._numInputs + 1
+        for (evaluateBits, _, _), read in zip(self._operations, self._readers):
+            state[slot] = evaluateBits(read(state), mask)
+            slot += 1
+
+    def propagate(self, state: List[int], changed: Iterable[int]) -> None:
+        """Re-evaluate the operations downstream of changed slots.
+
+        Each operation is evaluated at most once, in program order, and only
+        if one of its fanins changed.
+
+        Args:
+            state (List[int]): The state vector of an instance, updated in place.
+            changed (Iterable[int]): Slots whose value just changed.
+        """
+        operations, readers, fanout = self._operations, self._readers, self._fanout
+        base = self._numInputs + 1
+        mask = self.mask
+        queue: List[int] = []
+        scheduled: Set[int] = set()
+        for slot in changed:
+            for position in fanout[slot]:
+                if position not in scheduled:
+                    scheduled.add(position)
+                    heappush(queue, position)
+        while queue:
+            position = heappop(queue)
+            value = operations[position][0](readers[position](state), mask)
+            slot = base + position
+            if value != state[slot]:
+                state[slot] = value
+                for successor in fanout[slot]:
+                    if successor not in scheduled:
+                        scheduled.add(successor)
+                        heappush(queue, successor)
+
+    def outputWord(self, state: List[int]) -> int:
+        """Pack the outputs of a state vector into one word.
+
+        Output ``i`` occupies bits ``i * width`` to ``(i + 1) * width - 1``.
+
+        Args:
+            state (List[int]): The state vector of an instance.
+
+        Returns:
+            int: The packed outputs.
+        """
+        word = 0
+        for index, slot in enumerate(self._outputs):
+            word |= state[slot] << (index * self._width)
+        return word
+
+# ------------------------------------------------------------------------
+
+class SubcircuitOutputPin(OutputPin):
+    """Output pin of a subcircuit, carrying one of its outputs."""
+
+    def __init__(self, parent: "Subcircuit", index: int):
+        """Initialize the pin.
+
+        Args:
+            parent (Subcircuit): The subcircuit this pin belongs to.
+            index (int): Index of the output carried by the pin.
+        """
+        self._index = index
+        super().__init__(parent)
+
+    def _evaluate(self) -> None:
+        """Set the output value from the matching output of the subcircuit."""
+        self._value = self.parent.outputValue(self._index)
+
+# ------------------------------------------------------------------------
+
+class Subcircuit(CircuitComponent):
+    """Instance of a :class:`SubcircuitTemplate`.
+
+    Concrete subclasses are created by the templates. An instance holds the
+    state vector of the compiled template instead of a graph of component
+    objects, and updates it incrementally when its inputs change. Its value
+    is the value of its output for single-output subcircuits, and the packed
+    word of all outputs otherwise (see :meth:`SubcircuitTemplate.outputWord`);
+    :meth:`outputValue` returns a single output.
+
+    Attributes:
+        template (SubcircuitTemplate): The shared compiled template.
+    """
+
+    template: Optional[SubcircuitTemplate] = None
+
+    def __init__(self):
+        """Create the instance with the initial state of its template."""
+        self._state = self.template.initialState()
+        super().__init__(width=self.template.width)
+
+    @property
+    def state(self) -> List[int]:
+        """List[int]: The state vector of the instance."""
+        return self._state
+
+    def outputValue(self, index: int):
+        """Return the value of one output of the subcircuit.
+
+        Args:
+            index (int): Index of the output.
+
+        Returns:
+            Union[bool, int]: The value of the output.
+        """
+        return self._fromWord(self._state[self.template._outputs[index]])
+
+    def _createOutputPins(self, numOutputs: int) -> Optional[List[OutputPin]]:
+        """Create one output pin per output of the subcircuit.
+
+        Args:
+            numOutputs (int): Number of output pins to create.
+
+        Returns:
+            Optional[List[OutputPin]]: A list of output pins, or ``None`` if
+            ``numOutputs`` is zero.
+        """
+        if numOutputs == 0:
+            return None
+        return [SubcircuitOutputPin(self, index) for index in range(numOutputs)]
+
+    def _evaluate(self) -> None:
+        """Load the inputs into the state vector and propagate their changes."""
+        template = self.template
+        state = self._state
+        changed = []
+        for slot, pin in enumerate(self._inputPins or (), start=1):
+            value = int(pin._value)
+            if state[slot] != value:
+                state[slot] = value
+                changed.append(slot)
+        if changed:
+            template.propagate(state, changed)
+        if template.numOutputs == 1:
+            self._value = self._fromWord(state[template._outputs[0]])
+        else:
+            self._value = template.outputWord(state)
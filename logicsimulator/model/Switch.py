@@ -1,4 +1,5 @@
 from typing import Literal
+from logicsimulator.model.Batch import PropagationBatch
 from logicsimulator.model.CircuitComponent import CircuitComponent
 
 class Switch(CircuitComponent):
@@ -7,25 +8,56 @@ class Switch(CircuitComponent):
     The ``Switch`` has no input pins and a single output pin. Its value is
     manually toggled by the user rather than computed from other components.
     When toggled, the switch propagates its updated value through the circuit.
+    A switch wider than one bit drives a bus with an integer value.
     """
 
     type = "Switch"
     numInputs = 0
     numOutputs = 1
 
-    def __init__(self):
-        """Initialize the switch with its default value (False)."""
-        super().__init__()
+    def __init__(self, width: int = 1):
+        """Initialize the switch with its default value (False).
+
+        Args:
+            width (int): Number of bits of the output.
+        """
+        super().__init__(width=width)
 
     def toggle(self) -> None:
         """Toggle the switch's boolean state and propagate the change.
 
         The switch alternates between ``True`` (on) and ``False`` (off) each time
-        this method is called. After updating its value, the switch notifies
-        downstream components by invoking :meth:`update`.
+        this method is called; a bus switch inverts all its bits. After
+        updating its value, the switch notifies downstream components
+        directly, since :meth:`update` only notifies on a change produced by
+        :meth:`_evaluate`. Inside a :class:`PropagationBatch`, the switch is
+        marked dirty and notifies downstream components on commit instead.
+        """
+        self._change(self._fromWord(self.mask ^ self._value))
+
+    def setValue(self, value: int) -> None:
+        """Set the value of the switch and propagate it if it changed.
+
+        Args:
+            value (int): The new value; bits beyond the width are ignored.
+        """
+        value = self._fromWord(int(value) & self.mask)
+        if value != self._value:
+            self._change(value)
+
+    def _change(self, value) -> None:
+        """Store a new value and propagate it, or defer it to the active batch.
+
+        Args:
+            value (Union[bool, int]): The new value.
         """
-        self._value = not self._value
-        self.update()
+        batch = PropagationBatch.current(self) if PropagationBatch._active else None
+        if batch is None:
+            self._value = value
+            self.notify()
+        else:
+            batch.markDirty(self)
+            self._value = value
 
     def _evaluate(self) -> None:
         """Evaluation hook for the switch.
@@ -0,0 +1,354 @@
+from heapq import heappush, heappop
+from itertools import count
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.CompiledCircuit import CompiledCircuit
+
+class CalendarQueue:
+    """Time wheel of pending value changes, coalesced per net and timestamp.
+
+    The wheel has one slot per timestamp of a sliding window starting at the
+    current time. A slot maps every net changing at that timestamp to its new
+    value, so scheduling a second change of the same net at the same time
+    replaces the first one instead of adding an event. Scheduling and popping
+    cost O(1) as long as events fall inside the window; events further in the
+    future wait in an overflow heap and are moved into the wheel when the
+    window reaches them.
+    """
+
+    def __init__(self, size: int = 1024):
+        """Create an empty queue.
+
+        Args:
+            size (int): Number of slots of the wheel, rounded up to a power of
+                two. Delays shorter than the size never use the overflow heap.
+        """
+        self._size = 1 << max(size - 1, 1).bit_length()
+        self._mask = self._size - 1
+        self._slots: List[Dict[int, int]] = [{} for _ in range(self._size)]
+        self._now = 0
+        self._pending = 0
+        self._overflow: List[Tuple[int, int, int, int]] = []
+        self._sequence = count()
+
+    def __len__(self) -> int:
+        """Return the number of pending events."""
+        return self._pending + len(self._overflow)
+
+    @property
+    def now(self) -> int:
+        """int: The current time, never after the earliest pending event."""
+        return self._now
+
+    def push(self, time: int, net: int, value: int) -> None:
+        """Schedule a net to take a value at a given time.
+
+        Args:
+            time (int): The timestamp, not earlier than :attr:`now`.
+            net (int): The net changing value.
+            value (int): Its new value.
+
+        Raises:
+            ValueError: If ``time`` is in the past.
+        """
+        if time < self._now:
+            raise ValueError("Cannot schedule an event in the past")
+        if time - self._now < self._size:
+            slot = self._slots[time & self._mask]
+            if net not in slot:
+                self._pending += 1
+            slot[net] = value
+        else:
+            heappush(self._overflow, (time, next(self._sequence), net, value))
+
+    def peek(self) -> Optional[int]:
+        """Move the current time to the earliest pending timestamp.
+
+        Returns:
+            Optional[int]: That timestamp, or ``None`` if the queue is empty.
+        """
+        if not self._pending:
+            if not self._overflow:
+                return None
+            self._advance(self._overflow[0][0])
+        slots, mask, now = self._slots, self._mask, self._now
+        while not slots[now & mask]:
+            now += 1
+        if now != self._now:
+            self._advance(now)
+        return now
+
+    def pop(self) -> Optional[Tuple[int, Dict[int, int]]]:
+        """Remove the events of the earliest pending timestamp.
+
+        Returns:
+            Optional[Tuple[int, Dict[int, int]]]: The timestamp and the new
+            value of every net changing then, or ``None`` if the queue is empty.
+        """
+        now = self.peek()
+        if now is None:
+            return None
+        slot = self._slots[now & self._mask]
+        self._slots[now & self._mask] = {}
+        self._pending -= len(slot)
+        return now, slot
+
+    def _advance(self, now: int) -> None:
+        """Move the window to start at ``now``, pulling in overflow events.
+
+        Args:
+            now (int): The new current time.
+        """
+        self._now = now
+        horizon = now + self._size
+        overflow = self._overflow
+        while overflow and overflow[0][0] < horizon:
+            time, _, net, value = heappop(overflow)
+            slot = self._slots[time & self._mask]
+            if net not in slot:
+                self._pending += 1
+            slot[net] = value
+
+
+class TimingSimulator:
+    """Event-driven simulator with per-component propagation delays.
+
+    Every component drives one net, its output. When the inputs of a
+    component change at time ``t``, its new output is scheduled for
+    ``t + component.delay`` in a :class:`CalendarQueue` instead of being
+    applied at once. Delays are transport delays: every scheduled change
+    eventually happens, so static and dynamic hazards show up as short
+    pulses in the recorded :meth:`transitions`. Components with a zero delay,
+    such as bulbs, change in the same timestamp, after the change driving them.
+
+    Clocked components sample their data inputs as they were just before a
+    rising edge of their clock input, and change after their own delay.
+
+    Like :class:`CompiledCircuit`, the simulator works on a snapshot of the
+    graph and leaves the model objects untouched until :meth:`sync`.
+    """
+
+    def __init__(self, components: Iterable[CircuitComponent], wheelSize: int = 1024):
+        """Compile the circuit connected to the given components.
+
+        Args:
+            components (Iterable[CircuitComponent]): Components of the circuit.
+                Components connected to them are included automatically.
+            wheelSize (int): Number of slots of the calendar queue.
+
+        Raises:
+            ValueError: If the graph contains a cycle that does not go through
+                a clocked component, or a combinational component with several
+                outputs or no bit-parallel evaluation.
+        """
+        self._circuit = CompiledCircuit(components)
+        self._index: Dict[CircuitComponent, int] = {
+            component: position for position, component in enumerate(self._circuit.components)
+        }
+        size = len(self._index)
+        self._queue = CalendarQueue(wheelSize)
+        self._events = 0
+        # The extra slot past the last component always holds 0, for unconnected inputs.
+        self._values = [int(component.value) for component in self._circuit.components] + [0]
+        # Value of every net once its pending events are applied.
+        self._projected = list(self._values)
+        self._delays = [component.delay for component in self._circuit.components]
+        self._evaluators: List[Optional[Tuple[Callable, Callable, int]]] = [None] * size
+        self._registers: Dict[int, Tuple[Callable, Callable]] = {}
+        self._fanout: List[List[int]] = [[] for _ in range(size)]
+        self._clockFanout: List[List[int]] = [[] for _ in range(size)]
+        self._watched: Dict[int, List[Tuple[int, int]]] = {}
+
+        for position, component in enumerate(self._circuit.components):
+            if component.isClocked:
+                self._registers[position] = (component.nextState, self._fanins(component.dataPins))
+            elif component.inputPins:
+                if component.numOutputs > 1:
+                    raise ValueError(f"Timing simulation does not support components with several outputs, such as {component.type}")
+                if not component.supportsBits():
+                    raise ValueError(f"Timing simulation does not support components of type {component.type}")
+                self._evaluators[position] = (component.evaluateBits, self._fanins(component.inputPins), component.mask)
+            for pin in component.outputPins or ():
+                for connection in pin.connections:
+                    target = connection.target.parent
+                    if not target.isClocked:
+                        self._fanout[position].append(self._index[target])
+                    elif connection.target is target.clockPin:
+                        self._clockFanout[position].append(self._index[target])
+
+    def _fanins(self, pins) -> Callable[[List[int]], Sequence[int]]:
+        """Return a function reading the values of the given input pins.
+
+        Args:
+            pins (List[InputPin]): The input pins.
+
+        Returns:
+            Callable[[List[int]], Sequence[int]]: Takes the value list and
+            returns one value per pin; unconnected pins read the constant 0
+            slot.
+        """
+        fanins = [
+            len(self._index) if pin.connection is None else self._index[pin.connection.source.parent]
+            for pin in pins
+        ]
+        if len(fanins) == 1:
+            # itemgetter with a single index returns the item, not a tuple.
+            fanin = fanins[0]
+            return lambda values: (values[fanin],)
+        return itemgetter(*fanins)
+
+    @property
+    def components(self) -> List[CircuitComponent]:
+        """List[CircuitComponent]: All components in schedule order."""
+        return self._circuit.components
+
+    @property
+    def now(self) -> int:
+        """int: The current simulation time."""
+        return self._queue.now
+
+    @property
+    def events(self) -> int:
+        """int: Number of value changes applied so far."""
+        return self._events
+
+    @property
+    def pending(self) -> int:
+        """int: Number of scheduled value changes not applied yet."""
+        return len(self._queue)
+
+    def value(self, component: CircuitComponent) -> Union[bool, int]:
+        """Return the current value of a component.
+
+        Args:
+            component (CircuitComponent): A component of this circuit.
+
+        Returns:
+            Union[bool, int]: Its value at the current simulation time.
+        """
+        return component._fromWord(self._values[self._index[component]])
+
+    def watch(self, *components: CircuitComponent) -> None:
+        """Start recording the transitions of the given components.
+
+        Args:
+            *components (CircuitComponent): Components of this circuit.
+        """
+        for component in components:
+            self._watched.setdefault(self._index[component], [])
+
+    def transitions(self, component: CircuitComponent) -> List[Tuple[int, Union[bool, int]]]:
+        """Return the recorded transitions of a watched component.
+
+        Args:
+            component (CircuitComponent): A watched component.
+
+        Returns:
+            List[Tuple[int, Union[bool, int]]]: The time and new value of
+            every change since the component was watched.
+        """
+        return [(time, component._fromWord(value)) for time, value in self._watched[self._index[component]]]
+
+    def pulses(self, component: CircuitComponent, width: int) -> List[Tuple[int, int]]:
+        """Return the pulses of a watched component shorter than ``width``.
+
+        Pulses shorter than the settling time of the logic are glitches caused
+        by hazards.
+
+        Args:
+            component (CircuitComponent): A watched component.
+            width (int): The pulse width threshold, in time units.
+
+        Returns:
+            List[Tuple[int, int]]: The start and end time of every pulse.
+        """
+        transitions = self.transitions(component)
+        return [
+            (start, end)
+            for (start, _), (end, _) in zip(transitions, transitions[1:])
+            if end - start < width
+        ]
+
+    def setValue(self, component: CircuitComponent, value: int, delay: int = 0) -> None:
+        """Schedule a value change of a component without inputs.
+
+        Changes of the same component must be scheduled in time order.
+
+        Args:
+            component (CircuitComponent): A component of this circuit, such as
+                a switch or a clock.
+            value (int): The new value; bits beyond the width are ignored.
+            delay (int): Time from now until the change.
+        """
+        position = self._index[component]
+        value = int(value) & component.mask
+        self._projected[position] = value
+        self._queue.push(self.now + delay, position, value)
+
+    def toggle(self, component: CircuitComponent, delay: int = 0) -> None:
+        """Schedule a toggle of a component without inputs, inverting all its bits.
+
+        Args:
+            component (CircuitComponent): A component of this circuit, such as
+                a switch or a clock.
+            delay (int): Time from now until the change.
+        """
+        self.setValue(component, component.mask ^ self._projected[self._index[component]], delay)
+
+    def run(self, until: Optional[int] = None) -> None:
+        """Apply the scheduled changes in time order.
+
+        Args:
+            until (Optional[int]): Stop after the changes scheduled for this
+                time. By default, run until no change is pending.
+        """
+        queue = self._queue
+        values = self._values
+        projected = self._projected
+        delays = self._delays
+        evaluators = self._evaluators
+        registers = self._registers
+        fanout = self._fanout
+        clockFanout = self._clockFanout
+        watched = self._watched
+        while True:
+            time = queue.peek()
+            if time is None or (until is not None and time > until):
+                break
+            time, slot = queue.pop()
+            # Clocked components sample their inputs before the edge is applied.
+            loads = []
+            for net, value in slot.items():
+                if value and not values[net]:
+                    for position in clockFanout[net]:
+                        nextState, read = registers[position]
+                        loads.append((position, nextState(read(values), values[position])))
+            affected = set()
+            for net, value in slot.items():
+                if values[net] != value:
+                    values[net] = value
+                    self._events += 1
+                    if net in watched:
+                        watched[net].append((time, value))
+                    affected.update(fanout[net])
+            for position, value in loads:
+                if value != projected[position]:
+                    projected[position] = value
+                    queue.push(time + delays[position], position, value)
+            for position in affected:
+                evaluateBits, read, mask = evaluators[position]
+                value = evaluateBits(read(values), mask)
+                if value != projected[position]:
+                    projected[position] = value
+                    queue.push(time + delays[position], position, value)
+
+    def sync(self) -> None:
+        """Write the current values back into the model objects.
+
+        The values are only consistent with the combinational logic once no
+        change is pending. Observers that are not part of the model, such as
+        view-model relays, are notified of the values that changed.
+        """
+        self._circuit.writeBack(self._values)
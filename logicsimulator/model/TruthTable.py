@@ -0,0 +1,145 @@
+import struct
+from typing import BinaryIO, Iterator, List, Sequence, Tuple
+
+from logicsimulator.model.Bulb import Bulb
+from logicsimulator.model.Switch import Switch
+from logicsimulator.model.VectorSimulator import VectorSimulator
+
+class TruthTable:
+    """Exhaustive truth table of a circuit, computed with bitsliced evaluation.
+
+    Row ``r`` of the table is the input assignment in which switch ``i`` is on
+    exactly when bit ``i`` of ``r`` is set. Rows are enumerated in chunks of
+    ``2 ** chunkBits`` rows: inside a chunk the low switches are driven by
+    constant bit patterns and the high switches by all-zero or all-one words,
+    so a chunk costs a single :class:`VectorSimulator` pass.
+
+    The table is represented column by column: for every bulb, a packed word
+    whose bit ``r`` is the bulb value in row ``r``. Chunks can be streamed to
+    a file with :meth:`write` without ever holding the whole table.
+    """
+
+    #: Magic bytes identifying a truth table file.
+    MAGIC = b"LSTT"
+    #: Version of the file format written by :meth:`write`.
+    VERSION = 1
+    #: Header layout: magic, version, number of inputs, number of outputs,
+    #: chunk bits.
+    HEADER = struct.Struct("<4sHIIB")
+
+    def __init__(self, switches: Sequence[Switch], bulbs: Sequence[Bulb], chunkBits: int = 16):
+        """Prepare the truth table of the circuit between switches and bulbs.
+
+        Args:
+            switches (Sequence[Switch]): The inputs; switch ``i`` is bit ``i``
+                of the row number.
+            bulbs (Sequence[Bulb]): The outputs, in column order.
+            chunkBits (int): Base-2 logarithm of the number of rows evaluated
+                per pass. Memory use is proportional to ``2 ** chunkBits``. At
+                least 3, so that chunks are whole bytes.
+        """
+        self._simulator = VectorSimulator(switches, bulbs)
+        self._numInputs = len(switches)
+        self._chunkBits = min(max(chunkBits, 3), self._numInputs)
+
+    @property
+    def numInputs(self) -> int:
+        """int: Number of inputs (switches)."""
+        return self._numInputs
+
+    @property
+    def numOutputs(self) -> int:
+        """int: Number of outputs (bulbs)."""
+        return len(self._simulator.bulbs)
+
+    @property
+    def numRows(self) -> int:
+        """int: Number of rows, ``2 ** numInputs``."""
+        return 1 << self._numInputs
+
+    @property
+    def chunkRows(self) -> int:
+        """int: Number of rows per chunk."""
+        return 1 << self._chunkBits
+
+    def chunks(self) -> Iterator[List[int]]:
+        """Evaluate the table chunk by chunk.
+
+        Yields:
+            List[int]: For every bulb, the packed word of the chunk's rows;
+            bit ``k`` is the value in row ``chunkIndex * chunkRows + k``.
+        """
+        width = self.chunkRows
+        mask = (1 << width) - 1
+        words = []
+        for bit in range(self._chunkBits):
+            span = 1 << bit
+            words.append((mask // ((1 << span) + 1)) << span)
+        words += [0] * (self._numInputs - self._chunkBits)
+        for chunk in range(self.numRows >> self._chunkBits):
+            for bit in range(self._chunkBits, self._numInputs):
+                words[bit] = mask if chunk >> (bit - self._chunkBits) & 1 else 0
+            yield self._simulator.simulateWords(words, width)
+
+    def columns(self) -> List[int]:
+        """Evaluate the whole table in memory.
+
+        Returns:
+            List[int]: For every bulb, the packed word of all rows; bit ``r``
+            is the bulb value in row ``r``.
+        """
+        size = self._chunkBytes()
+        parts: List[List[bytes]] = [[] for _ in range(self.numOutputs)]
+        for chunk in self.chunks():
+            for part, word in zip(parts, chunk):
+                part.append(word.to_bytes(size, "little"))
+        return [int.from_bytes(b"".join(part), "little") for part in parts]
+
+    def write(self, file: BinaryIO) -> None:
+        """Stream the table to a binary file.
+
+        The file holds a :attr:`HEADER` followed, for every chunk, by the
+        packed word of every bulb as little-endian bytes.
+
+        Args:
+            file (BinaryIO): A file opened for binary writing.
+        """
+        file.write(self.HEADER.pack(self.MAGIC, self.VERSION, self._numInputs, self.numOutputs, self._chunkBits))
+        size = self._chunkBytes()
+        for chunk in self.chunks():
+            file.write(b"".join(word.to_bytes(size, "little") for word in chunk))
+
+    @classmethod
+    def read(cls, file: BinaryIO) -> Tuple[int, int, Iterator[List[int]]]:
+        """Read a table written by :meth:`write`, chunk by chunk.
+
+        Args:
+            file (BinaryIO): A file opened for binary reading.
+
+        Returns:
+            Tuple[int, int, Iterator[List[int]]]: The number of inputs, the
+            number of outputs and an iterator over the chunks, as yielded by
+            :meth:`chunks`.
+
+        Raises:
+            ValueError: If the file is not a truth table of a supported version.
+        """
+        magic, version, numInputs, numOutputs, chunkBits = cls.HEADER.unpack(file.read(cls.HEADER.size))
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("Not a supported truth table file")
+        size = max(1, (1 << chunkBits) // 8)
+        numChunks = 1 << (numInputs - chunkBits)
+
+        def chunks() -> Iterator[List[int]]:
+            for _ in range(numChunks):
+                data = file.read(size * numOutputs)
+                yield [
+                    int.from_bytes(data[offset:offset + size], "little")
+                    for offset in range(0, size * numOutputs, size)
+                ]
+
+        return numInputs, numOutputs, chunks()
+
+    def _chunkBytes(self) -> int:
+        """Return the number of bytes a chunk word occupies in a file."""
+        return max(1, self.chunkRows // 8)
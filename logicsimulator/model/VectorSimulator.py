@@ -0,0 +1,144 @@
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from logicsimulator.model.Bulb import Bulb
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.CompiledCircuit import CompiledCircuit
+from logicsimulator.model.Switch import Switch
+
+class VectorSimulator:
+    """Bit-parallel simulator evaluating many input vectors at once.
+
+    The circuit is compiled into a flat schedule in which every component is
+    evaluated through its :meth:`CircuitComponent.evaluateBits` method. Each
+    switch is driven by a packed word whose bit ``k`` is the switch value in
+    input vector ``k``, so one bitwise operation per gate evaluates all the
+    vectors of a word. Words are plain Python integers, which have no fixed
+    width: a single pass evaluates 64, or any multiple of 64, vectors.
+
+    The simulator does not touch the values stored in the model objects. Like
+    :class:`CompiledCircuit`, it works on a snapshot of the graph.
+    """
+
+    def __init__(self, switches: Sequence[Switch], bulbs: Sequence[Bulb]):
+        """Compile the circuit connecting the given switches and bulbs.
+
+        Args:
+            switches (Sequence[Switch]): The inputs, in input-vector order.
+            bulbs (Sequence[Bulb]): The outputs, in output-vector order.
+
+        Raises:
+            ValueError: If the graph contains a cycle, a bus, since every bit
+                of a word already stands for a different input vector, or a
+                component with inputs that does not support bit-parallel
+                evaluation, such as a clocked component or a subcircuit with
+                several outputs.
+        """
+        self._switches = list(switches)
+        self._bulbs = list(bulbs)
+        circuit = CompiledCircuit(self._switches + self._bulbs)
+        index: Dict[CircuitComponent, int] = {
+            component: position for position, component in enumerate(circuit.components)
+        }
+        self._size = len(circuit.components)
+        self._switchIndices = [index[switch] for switch in self._switches]
+        self._bulbIndices = [index[bulb] for bulb in self._bulbs]
+        # Components without inputs that are not driven by the caller keep their
+        # current value, e.g. switches outside ``switches``.
+        self._constants: List[Tuple[int, bool]] = []
+        self._program: List[Tuple[int, Callable[[List[int], int], int], List[int]]] = []
+        driven = set(self._switchIndices)
+        for position, component in enumerate(circuit.components):
+            if component.width > 1:
+                raise ValueError("Bit-parallel simulation does not support buses")
+            if component.numOutputs > 1:
+                raise ValueError(f"Bit-parallel simulation does not support components with several outputs, such as {component.type}")
+            if component.inputPins and not component.supportsBits():
+                raise ValueError(f"Bit-parallel simulation does not support components of type {component.type}")
+            if position in driven:
+                continue
+            if not component.inputPins:
+                self._constants.append((position, bool(component.value)))
+                continue
+            fanins = []
+            for pin in component.inputPins:
+                if pin.connection is None:
+                    # The extra slot past the last component always holds 0.
+                    fanins.append(self._size)
+                else:
+                    fanins.append(index[pin.connection.source.parent])
+            self._program.append((position, component.evaluateBits, fanins))
+
+    @property
+    def switches(self) -> List[Switch]:
+        """List[Switch]: The switches driving the simulation, in order."""
+        return self._switches
+
+    @property
+    def bulbs(self) -> List[Bulb]:
+        """List[Bulb]: The bulbs read by the simulation, in order."""
+        return self._bulbs
+
+    def simulateWords(self, words: Sequence[int], width: int) -> List[int]:
+        """Simulate packed input words.
+
+        Args:
+            words (Sequence[int]): One packed word per switch; bit ``k`` of a
+                word is the switch value in input vector ``k``.
+            width (int): Number of input vectors packed in each word.
+
+        Returns:
+            List[int]: One packed word per bulb; bit ``k`` is the bulb value
+            for input vector ``k``.
+        """
+        mask = (1 << width) - 1
+        values = [0] * (self._size + 1)
+        for position, value in self._constants:
+            values[position] = mask if value else 0
+        for position, word in zip(self._switchIndices, words):
+            values[position] = word & mask
+        for position, evaluateBits, fanins in self._program:
+            values[position] = evaluateBits([values[fanin] for fanin in fanins], mask)
+        return [values[position] for position in self._bulbIndices]
+
+    def simulate(self, vectors: Sequence[Sequence[bool]]) -> List[List[bool]]:
+        """Simulate a matrix of switch assignments.
+
+        Args:
+            vectors (Sequence[Sequence[bool]]): One row per input vector, with
+                one value per switch.
+
+        Returns:
+            List[List[bool]]: One row per input vector, with one value per bulb.
+        """
+        width = len(vectors)
+        if width == 0:
+            return []
+        words = [self.pack(column) for column in zip(*vectors)]
+        columns = [self.unpack(word, width) for word in self.simulateWords(words, width)]
+        return [list(row) for row in zip(*columns)]
+
+    @staticmethod
+    def pack(values: Sequence[bool]) -> int:
+        """Pack a sequence of booleans into a word, the first value in bit 0.
+
+        Args:
+            values (Sequence[bool]): The values to pack.
+
+        Returns:
+            int: The packed word.
+        """
+        return int("".join("1" if value else "0" for value in reversed(values)) or "0", 2)
+
+    @staticmethod
+    def unpack(word: int, width: int) -> List[bool]:
+        """Unpack the low ``width`` bits of a word, bit 0 first.
+
+        Args:
+            word (int): The packed word.
+            width (int): Number of values to unpack.
+
+        Returns:
+            List[bool]: The unpacked values.
+        """
+        bits = format(word, f"0{width}b")[::-1]
+        return [bit == "1" for bit in bits[:width]]
@@ -0,0 +1,258 @@
+from __future__ import annotations
+import re
+from typing import Dict, Iterable, List, Optional, Set, TextIO
+
+from logicsimulator.model.Bulb import Bulb
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.Pin import OutputPin
+from logicsimulator.model.Subcircuit import Subcircuit, SubcircuitTemplate
+from logicsimulator.model.Switch import Switch
+
+class VerilogExporter:
+    """Exporter of a circuit as a structural Verilog module.
+
+    Switches (and clocks) become input ports, bulbs output ports driven by
+    a continuous assignment, and every other component one net named
+    ``n<k>``. Single-bit gates are instances of the Verilog gate
+    primitives of :attr:`PRIMITIVES`; gates on buses are continuous
+    assignments of the equivalent bitwise expression. Flip-flops and
+    registers are ``always @(posedge ...)`` blocks on a ``reg`` cleared at
+    start, like the model. Unconnected inputs read a constant 0.
+
+    Every :class:`SubcircuitTemplate` used gets a module of its own, named
+    after the template and written before the circuit's module from the
+    flattened program of the template, with ports ``in<k>`` then
+    ``out<k>``. Instances of the subcircuit are instances of that module,
+    whose output ``k`` drives the net ``n<position>o<k>``.
+
+    The graph is collected once, then the modules are written to the file
+    line by line: the ports, the net declarations, then one statement per
+    component, so the export is linear in the size of the design.
+    """
+
+    #: Verilog gate primitive of every single-bit gate type.
+    PRIMITIVES = {
+        "AndGate": "and",
+        "NandGate": "nand",
+        "OrGate": "or",
+        "NorGate": "nor",
+        "XorGate": "xor",
+        "XnorGate": "xnor",
+        "NotGate": "not",
+        "BufferGate": "buf",
+    }
+
+    #: Bitwise operator and negation of every gate type, for buses.
+    OPERATORS = {
+        "AndGate": ("&", False),
+        "NandGate": ("&", True),
+        "OrGate": ("|", False),
+        "NorGate": ("|", True),
+        "XorGate": ("^", False),
+        "XnorGate": ("^", True),
+        "NotGate": ("", True),
+        "BufferGate": ("", False),
+    }
+
+    def __init__(self, components: Iterable[CircuitComponent], names: Optional[Dict[CircuitComponent, str]] = None):
+        """Collect the circuit connected to the given components.
+
+        Args:
+            components (Iterable[CircuitComponent]): Components of the circuit.
+                Components connected to them are included automatically.
+            names (Optional[Dict[CircuitComponent, str]]): Port names of the
+                switches and bulbs; characters that are not valid in Verilog
+                identifiers are replaced. Ports default to ``in<k>`` and
+                ``out<k>``.
+
+        Raises:
+            ValueError: If a component other than a subcircuit has several
+                outputs, or a component or an operation of a subcircuit has a
+                type with no Verilog equivalent.
+        """
+        self._components = self._collect(components)
+        self._nets: Dict[CircuitComponent, str] = {}
+        # Net driven by every output pin, for the inputs connected to it.
+        self._pinNets: Dict[OutputPin, str] = {}
+        self._templates: Dict[str, SubcircuitTemplate] = {}
+        self._inputs: List[CircuitComponent] = []
+        self._outputs: List[CircuitComponent] = []
+        used: Set[str] = set()
+        names = names or {}
+        for position, component in enumerate(self._components):
+            if isinstance(component, Subcircuit):
+                self._addTemplate(component.template)
+                self._nets[component] = f"n{position}"
+                for index, pin in enumerate(component.outputPins):
+                    self._pinNets[pin] = f"n{position}o{index}"
+                continue
+            if component.numOutputs > 1:
+                raise ValueError(f"Cannot export {component.type}: it has several outputs")
+            if isinstance(component, Switch):
+                ports = self._inputs
+            elif isinstance(component, Bulb):
+                ports = self._outputs
+            elif component.type in self.PRIMITIVES or component.isClocked:
+                self._nets[component] = f"n{position}"
+                self._pinNets[component.outputPins[0]] = self._nets[component]
+                continue
+            else:
+                raise ValueError(f"Cannot export components of type {component.type} to Verilog")
+            default = f"{'in' if ports is self._inputs else 'out'}{len(ports)}"
+            self._nets[component] = self._identifier(names.get(component, default), used)
+            for pin in component.outputPins or ():
+                self._pinNets[pin] = self._nets[component]
+            ports.append(component)
+
+    def _addTemplate(self, template: SubcircuitTemplate) -> None:
+        """Add the module of a subcircuit template, if not added yet.
+
+        Raises:
+            ValueError: If an operation of the template has a type with no
+                Verilog equivalent.
+        """
+        if template.name in self._templates:
+            return
+        for type, _ in template.program[4]:
+            if type not in self.PRIMITIVES and type != Bulb.type:
+                raise ValueError(f"Cannot export subcircuit {template.name} to Verilog: it uses components of type {type}")
+        self._templates[template.name] = template
+
+    @staticmethod
+    def _collect(components: Iterable[CircuitComponent]) -> List[CircuitComponent]:
+        """Return every component connected to the given ones, in discovery order."""
+        collected: List[CircuitComponent] = []
+        seen: Set[CircuitComponent] = set()
+        stack = list(components)
+        while stack:
+            component = stack.pop()
+            if component in seen:
+                continue
+            seen.add(component)
+            collected.append(component)
+            stack.extend(component.successors())
+            stack.extend(component.predecessors())
+        return collected
+
+    @staticmethod
+    def _identifier(name: str, used: Set[str]) -> str:
+        """Turn a name into a unique Verilog identifier."""
+        identifier = re.sub(r"\W", "_", name)
+        if not re.match(r"[A-Za-z_]", identifier):
+            identifier = f"_{identifier}"
+        # Avoid the generated net names and earlier ports.
+        if re.fullmatch(r"n\d+(?:o\d+)?", identifier) or identifier in used:
+            suffix = 1
+            while f"{identifier}_{suffix}" in used:
+                suffix += 1
+            identifier = f"{identifier}_{suffix}"
+        used.add(identifier)
+        return identifier
+
+    @staticmethod
+    def _range(component: CircuitComponent) -> str:
+        """Return the range declaration of a component's nets."""
+        return f"[{component.width - 1}:0] " if component.width > 1 else ""
+
+    def _operands(self, component: CircuitComponent) -> List[str]:
+        """Return the net or constant read by every input pin of a component."""
+        return [
+            f"{component.width}'b0" if pin.connection is None else self._pinNets[pin.connection.source]
+            for pin in component.inputPins or ()
+        ]
+
+    @classmethod
+    def _gate(cls, type: str, width: int, instance: str, net: str, operands: List[str]) -> str:
+        """Return the statement computing a gate: a primitive instance for
+        single bits, a continuous assignment for buses."""
+        if width == 1:
+            return f"    {cls.PRIMITIVES[type]} {instance} ({', '.join([net] + operands)});\n"
+        operator, negated = cls.OPERATORS[type]
+        expression = f" {operator} ".join(operands)
+        if negated:
+            expression = f"~({expression})" if len(operands) > 1 else f"~{expression}"
+        return f"    assign {net} = {expression};\n"
+
+    def write(self, file: TextIO, module: str = "circuit") -> None:
+        """Write the circuit as a Verilog module.
+
+        Args:
+            file (TextIO): The open output file.
+            module (str): Name of the module.
+
+        Raises:
+            ValueError: If ``module`` is not a Verilog identifier, or is the
+                name of a subcircuit of the circuit.
+        """
+        if not re.fullmatch(r"[A-Za-z_]\w*", module):
+            raise ValueError(f"{module!r} is not a Verilog identifier")
+        if module in self._templates:
+            raise ValueError(f"{module!r} is the name of a subcircuit module")
+        for template in self._templates.values():
+            self._writeTemplate(file, template)
+        ports = [f"    input wire {self._range(component)}{self._nets[component]}" for component in self._inputs]
+        ports += [f"    output wire {self._range(component)}{self._nets[component]}" for component in self._outputs]
+        file.write(f"module {module} (\n" + ",\n".join(ports) + ("\n" if ports else "") + ");\n")
+        for component in self._components:
+            if component.isClocked:
+                file.write(f"    reg {self._range(component)}{self._nets[component]} = {component.width}'b0;\n")
+            elif isinstance(component, Subcircuit):
+                for pin in component.outputPins:
+                    file.write(f"    wire {self._range(component)}{self._pinNets[pin]};\n")
+            elif component.type in self.PRIMITIVES:
+                file.write(f"    wire {self._range(component)}{self._nets[component]};\n")
+        for position, component in enumerate(self._components):
+            if isinstance(component, Switch):
+                continue
+            net = self._nets[component]
+            operands = self._operands(component)
+            if isinstance(component, Bulb):
+                file.write(f"    assign {net} = {operands[0]};\n")
+            elif component.isClocked:
+                file.write(self._clocked(component, net, operands))
+            elif isinstance(component, Subcircuit):
+                outputs = [self._pinNets[pin] for pin in component.outputPins]
+                file.write(f"    {component.type} u{position} ({', '.join(operands + outputs)});\n")
+            else:
+                file.write(self._gate(component.type, component.width, f"g{position}", net, operands))
+        file.write("endmodule\n")
+
+    def _writeTemplate(self, file: TextIO, template: SubcircuitTemplate) -> None:
+        """Write the module of a subcircuit template.
+
+        Slot 0 of the program is the constant 0, the next slots the inputs,
+        then one net ``n<k>`` per operation. The bulbs of the template are
+        operations that copy their input.
+        """
+        name, width, numInputs, outputs, operations = template.program
+        size = f"[{width - 1}:0] " if width > 1 else ""
+        slots = [f"{width}'b0"] + [f"in{index}" for index in range(numInputs)]
+        slots += [f"n{index}" for index in range(len(operations))]
+        ports = [f"    input wire {size}in{index}" for index in range(numInputs)]
+        ports += [f"    output wire {size}out{index}" for index in range(len(outputs))]
+        file.write(f"module {name} (\n" + ",\n".join(ports) + "\n);\n")
+        for index in range(len(operations)):
+            file.write(f"    wire {size}n{index};\n")
+        for index, (type, fanins) in enumerate(operations):
+            operands = [slots[slot] for slot in fanins]
+            if type == Bulb.type:
+                file.write(f"    assign n{index} = {operands[0]};\n")
+            else:
+                file.write(self._gate(type, width, f"g{index}", f"n{index}", operands))
+        for index, slot in enumerate(outputs):
+            file.write(f"    assign out{index} = {slots[slot]};\n")
+        file.write("endmodule\n")
+
+    @staticmethod
+    def _clocked(component: CircuitComponent, net: str, operands: List[str]) -> str:
+        """Return the ``always`` block of a clocked component.
+
+        Raises:
+            ValueError: If the clocked component type is not supported.
+        """
+        clock = operands[-1]
+        if component.type == "DFlipFlop":
+            return f"    always @(posedge {clock}) {net} <= {operands[0]};\n"
+        if component.type == "Register":
+            return f"    always @(posedge {clock}) if ({operands[1]}) {net} <= {operands[0]};\n"
+        raise ValueError(f"Cannot export components of type {component.type} to Verilog")
@@ -0,0 +1,393 @@
+from __future__ import annotations
+from array import array
+from itertools import chain
+from typing import Iterator, List, Optional, TextIO, Tuple, Union
+
+from logicsimulator.model.Observer import Observer
+from logicsimulator.model.Propagator import Propagator
+
+class RingBuffer:
+    """Fixed-capacity buffer of records stored column-wise in typed arrays.
+
+    Every field of the records has its own preallocated ``array`` column,
+    so a record costs a few bytes instead of a tuple of Python objects.
+    Once the buffer is full, each new record overwrites the oldest one.
+    """
+
+    def __init__(self, capacity: int, typecodes: str):
+        """Allocate the columns.
+
+        Args:
+            capacity (int): Maximum number of records, at least one.
+            typecodes (str): One ``array`` type code per field, e.g. ``"qIQ"``.
+
+        Raises:
+            ValueError: If ``capacity`` is smaller than one.
+        """
+        if capacity < 1:
+            raise ValueError("A ring buffer needs a capacity of at least one")
+        self._columns = [array(code, bytes(array(code).itemsize * capacity)) for code in typecodes]
+        self._capacity = capacity
+        self._start = 0
+        self._length = 0
+        self._dropped = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored records."""
+        return self._length
+
+    def __getitem__(self, index: int) -> tuple:
+        """Return a record, the oldest one at index 0."""
+        if not 0 <= index < self._length:
+            raise IndexError("ring buffer index out of range")
+        position = (self._start + index) % self._capacity
+        return tuple(column[position] for column in self._columns)
+
+    def __iter__(self) -> Iterator[tuple]:
+        """Iterate over the records from the oldest to the newest."""
+        start, end = self._start, self._start + self._length
+        if end <= self._capacity:
+            return zip(*(column[start:end] for column in self._columns))
+        end -= self._capacity
+        return chain(
+            zip(*(column[start:] for column in self._columns)),
+            zip(*(column[:end] for column in self._columns)),
+        )
+
+    @property
+    def capacity(self) -> int:
+        """int: Maximum number of records."""
+        return self._capacity
+
+    @property
+    def full(self) -> bool:
+        """bool: Whether the next record overwrites the oldest one."""
+        return self._length == self._capacity
+
+    @property
+    def dropped(self) -> int:
+        """int: Number of records overwritten since the buffer was created."""
+        return self._dropped
+
+    @property
+    def columns(self) -> List[array]:
+        """List[array]: The preallocated column of every field."""
+        return self._columns
+
+    def reserve(self) -> int:
+        """Claim the slot of a new record, overwriting the oldest one if the buffer is full.
+
+        Writing the fields straight into :attr:`columns` at the returned
+        position avoids building a record tuple on hot paths.
+
+        Returns:
+            int: The position of the new record in the columns.
+        """
+        if self._length == self._capacity:
+            position = self._start
+            self._start = (position + 1) % self._capacity
+            self._dropped += 1
+        else:
+            position = (self._start + self._length) % self._capacity
+            self._length += 1
+        return position
+
+    def append(self, *fields) -> None:
+        """Append a record, overwriting the oldest one if the buffer is full.
+
+        Args:
+            *fields: One value per column.
+        """
+        position = self.reserve()
+        for column, field in zip(self._columns, fields):
+            column[position] = field
+
+    def clear(self) -> None:
+        """Remove every record without releasing the columns."""
+        self._start = 0
+        self._length = 0
+
+
+class VcdWriter:
+    """Writer of Value Change Dump files, the text format of IEEE 1364.
+
+    Signals are declared first, then :meth:`begin` writes the header; value
+    changes must then be written in time order.
+    """
+
+    def __init__(self, file: TextIO, timescale: str = "1 ns", scope: str = "circuit"):
+        """Prepare the file.
+
+        Args:
+            file (TextIO): The open output file.
+            timescale (str): The time unit, e.g. ``"1 ns"``.
+            scope (str): Name of the module holding the signals.
+        """
+        self._file = file
+        self._timescale = timescale
+        self._scope = scope
+        self._signals: List[Tuple[str, int, str]] = []
+        self._time: Optional[int] = None
+        self._begun = False
+
+    @staticmethod
+    def identifier(number: int) -> str:
+        """Return the short identifier code of a signal, in printable ASCII."""
+        code = chr(33 + number % 94)
+        while number >= 94:
+            number = number // 94 - 1
+            code += chr(33 + number % 94)
+        return code
+
+    def addSignal(self, name: str, width: int = 1) -> str:
+        """Declare a signal.
+
+        Args:
+            name (str): The signal name, without whitespace.
+            width (int): Number of bits.
+
+        Returns:
+            str: The identifier code of the signal.
+
+        Raises:
+            ValueError: If the header was already written.
+        """
+        if self._begun:
+            raise ValueError("Cannot declare signals after the VCD header")
+        code = self.identifier(len(self._signals))
+        self._signals.append((name, width, code))
+        return code
+
+    def begin(self) -> None:
+        """Write the header declaring the signals."""
+        if self._begun:
+            return
+        lines = [f"$timescale {self._timescale} $end", f"$scope module {self._scope} $end"]
+        lines += [f"$var wire {width} {code} {name} $end" for name, width, code in self._signals]
+        lines += ["$upscope $end", "$enddefinitions $end"]
+        self._file.write("\n".join(lines) + "\n")
+        self._begun = True
+
+    def write(self, changes: Iterator[Tuple[int, int, int]]) -> None:
+        """Write value changes.
+
+        Args:
+            changes (Iterator[Tuple[int, int, int]]): The time, signal number
+                and value of every change, in time order.
+
+        Raises:
+            ValueError: If a change is older than one already written.
+        """
+        self.begin()
+        signals = self._signals
+        lines = []
+        last = self._time
+        for time, signal, value in changes:
+            if time != last:
+                if last is not None and time < last:
+                    raise ValueError("VCD value changes must be written in time order")
+                lines.append(f"#{time}")
+                last = time
+            _, width, code = signals[signal]
+            lines.append(f"{value}{code}" if width == 1 else f"b{value:b} {code}")
+        self._time = last
+        if lines:
+            self._file.write("\n".join(lines) + "\n")
+
+
+class Probe(Observer):
+    """Observer recording the value changes of a pin, connection or component."""
+
+    def __init__(self, recorder: WaveformRecorder, signal: int, target: Propagator):
+        """Create the probe; :meth:`WaveformRecorder.probe` attaches it.
+
+        Args:
+            recorder (WaveformRecorder): The recorder receiving the changes.
+            signal (int): The signal number of the target in the recorder.
+            target (Propagator): The observed object.
+        """
+        self._recorder = recorder
+        self._signal = signal
+        self._target = target
+
+    @property
+    def target(self) -> Propagator:
+        """Propagator: The observed object."""
+        return self._target
+
+    def update(self, **kwargs) -> None:
+        """Record the new value of the target."""
+        self._recorder.record(self._signal, self._target.value)
+
+
+class WaveformRecorder:
+    """Recorder of the value changes of probed pins, connections and components.
+
+    Changes are stamped with the recorder's time, a step number advanced by
+    the caller, and stored in a :class:`RingBuffer` of fixed capacity: the
+    time, the signal number and the value of a change take 20 bytes,
+    allocated once.
+
+    With an ``output`` file, the buffer is streamed to it as a VCD file
+    whenever it fills up, so arbitrarily long runs are written completely
+    with bounded memory. Without one, the buffer keeps the most recent
+    changes: :meth:`dump` writes them as a VCD file, starting with the value
+    every signal had at the oldest retained change.
+
+    Values are unsigned integers of at most 64 bits; buses are recorded as
+    their integer value.
+    """
+
+    def __init__(self, capacity: int = 1 << 16, output: Optional[TextIO] = None, timescale: str = "1 ns"):
+        """Create a recorder without probes.
+
+        Args:
+            capacity (int): Number of changes held in memory.
+            output (Optional[TextIO]): A file to stream the changes to as VCD.
+            timescale (str): The VCD time unit of one step.
+        """
+        self._buffer = RingBuffer(capacity, "qIQ")
+        self._times, self._signals, self._values = self._buffer.columns
+        self._writer = None if output is None else VcdWriter(output, timescale)
+        self._timescale = timescale
+        self._time = 0
+        self._probes: List[Probe] = []
+        self._names: List[str] = []
+        self._widths: List[int] = []
+        # Value of every signal before the oldest retained change, if dropped.
+        self._baseline: List[Optional[int]] = []
+        self._baselineTime = 0
+
+    def __enter__(self) -> WaveformRecorder:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def time(self) -> int:
+        """int: The time stamped on new changes."""
+        return self._time
+
+    @property
+    def signals(self) -> List[str]:
+        """List[str]: The signal names, in signal number order."""
+        return list(self._names)
+
+    @property
+    def dropped(self) -> int:
+        """int: Number of changes discarded to bound the memory, without an output file."""
+        return self._buffer.dropped
+
+    def probe(self, target: Propagator, name: Optional[str] = None) -> int:
+        """Start recording the changes of a pin, connection or component.
+
+        The current value of the target is recorded as its first change.
+
+        Args:
+            target (Propagator): The observed object, such as an
+                :class:`OutputPin`, a :class:`Connection` or a :class:`Bulb`.
+            name (Optional[str]): The signal name; defaults to the type of
+                the target followed by the signal number.
+
+        Returns:
+            int: The signal number.
+
+        Raises:
+            ValueError: If the target is wider than 64 bits, or changes were
+                already streamed to the output file.
+        """
+        width = target.width if hasattr(target, "width") else target.source.width
+        if width > 64:
+            raise ValueError("Cannot record values wider than 64 bits")
+        signal = len(self._names)
+        name = name or f"{target.type}{signal}"
+        if self._writer is not None:
+            self._writer.addSignal(name, width)
+        probe = Probe(self, signal, target)
+        self._probes.append(probe)
+        self._names.append(name)
+        self._widths.append(width)
+        self._baseline.append(None)
+        target.attach(probe)
+        self.record(signal, target.value)
+        return signal
+
+    def advance(self, steps: int = 1) -> None:
+        """Advance the time stamped on new changes.
+
+        Args:
+            steps (int): Number of time units, not negative.
+
+        Raises:
+            ValueError: If ``steps`` is negative.
+        """
+        if steps < 0:
+            raise ValueError("Time cannot go backwards")
+        self._time += steps
+
+    def record(self, signal: int, value: Union[bool, int]) -> None:
+        """Record a change at the current time.
+
+        Probes call this method; simulators that do not update the object
+        model, such as :class:`TimingSimulator`, may call it directly.
+
+        Args:
+            signal (int): The signal number.
+            value (Union[bool, int]): The new value.
+        """
+        buffer = self._buffer
+        full = buffer.full
+        if full and self._writer is not None:
+            self.flush()
+            full = False
+        position = buffer.reserve()
+        if full:
+            # Remember the value of the overwritten change for dump.
+            self._baseline[self._signals[position]] = self._values[position]
+            self._baselineTime = self._times[position]
+        self._times[position] = self._time
+        self._signals[position] = signal
+        self._values[position] = value
+
+    def changes(self) -> List[Tuple[int, str, int]]:
+        """Return the changes held in memory.
+
+        Returns:
+            List[Tuple[int, str, int]]: The time, signal name and value of
+            every change, from the oldest to the newest.
+        """
+        return [(time, self._names[signal], value) for time, signal, value in self._buffer]
+
+    def flush(self) -> None:
+        """Write the changes held in memory to the output file, if any."""
+        if self._writer is not None:
+            self._writer.write(iter(self._buffer))
+            self._buffer.clear()
+
+    def dump(self, file: TextIO) -> None:
+        """Write the changes held in memory as a VCD file.
+
+        Args:
+            file (TextIO): The open output file.
+        """
+        writer = VcdWriter(file, self._timescale)
+        for name, width in zip(self._names, self._widths):
+            writer.addSignal(name, width)
+        changes = list(self._buffer)
+        if self._buffer.dropped:
+            start = self._baselineTime
+            changes = [
+                (start, signal, value) for signal, value in enumerate(self._baseline) if value is not None
+            ] + changes
+        writer.write(iter(changes))
+
+    def close(self) -> None:
+        """Flush the output file and detach the probes.
+
+        The output file itself is left open for the caller to close.
+        """
+        self.flush()
+        for probe in self._probes:
+            probe.target.detach(probe)
+        self._probes.clear()
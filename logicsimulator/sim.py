@@ -0,0 +1,391 @@
+"""Headless simulation of saved circuits.
+
+Loads a circuit and simulates it on input vectors using only
+:mod:`logicsimulator.model`, so it runs without a display and without
+importing PySide6::
+
+    python -m logicsimulator.sim circuit.lsim --vectors in.txt
+
+The circuit is a :class:`CircuitFile` saved by the editor, or a ``.bench``
+or ``.blif`` netlist. The vector file holds one vector per line, either a
+string of bits (``0110``) or one whitespace-separated integer per input
+(``3 0x1f 1``, for buses); blank lines and ``#`` comments are skipped. One
+line of output values is written per vector, in the same format.
+
+Every vector is applied to the inputs, the outputs are read, then the clock
+runs ``--cycles`` cycles, so sequential circuits step through the vectors
+like a test bench.
+"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+import argparse
+import sys
+from typing import Iterable, Iterator, List, Optional, Sequence, TextIO
+
+from logicsimulator.core.registry import ComponentRegistry
+from logicsimulator.model.Bulb import Bulb
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.CircuitFile import CircuitFile
+from logicsimulator.model.ClockedCircuit import ClockedCircuit
+from logicsimulator.model.CodeGenerator import GeneratedCircuit
+from logicsimulator.model.CompiledCircuit import CompiledCircuit
+from logicsimulator.model.Importer import BenchImporter, BlifImporter, NetlistImporter
+from logicsimulator.model.Netlist import Netlist
+from logicsimulator.model.Sequential import Clock
+from logicsimulator.model.Switch import Switch
+
+class Simulation(ABC):
+    """Abstract base class of the headless simulations.
+
+    A simulation maps every input vector, one value per input, to an output
+    vector, one value per output. Single-bit values are 0 or 1.
+    """
+
+    def __init__(self, inputs: List[str], outputs: List[str], inputWidths: List[int], outputWidths: List[int]):
+        """Initialize the ports of the simulation.
+
+        Args:
+            inputs (List[str]): Names of the inputs.
+            outputs (List[str]): Names of the outputs.
+            inputWidths (List[int]): Width of every input.
+            outputWidths (List[int]): Width of every output.
+        """
+        self._inputs = inputs
+        self._outputs = outputs
+        self._inputWidths = inputWidths
+        self._outputWidths = outputWidths
+
+    @property
+    def inputs(self) -> List[str]:
+        """List[str]: Names of the inputs, in vector order."""
+        return self._inputs
+
+    @property
+    def outputs(self) -> List[str]:
+        """List[str]: Names of the outputs, in result order."""
+        return self._outputs
+
+    @property
+    def inputWidths(self) -> List[int]:
+        """List[int]: Width of every input."""
+        return self._inputWidths
+
+    @property
+    def outputWidths(self) -> List[int]:
+        """List[int]: Width of every output."""
+        return self._outputWidths
+
+    @abstractmethod
+    def run(self, vectors: Iterable[Sequence[int]], cycles: int = 1) -> Iterator[List[int]]:
+        """Simulate the circuit on a stream of input vectors.
+
+        Args:
+            vectors (Iterable[Sequence[int]]): One value per input for every
+                vector.
+            cycles (int): Clock cycles run after every vector.
+
+        Yields:
+            List[int]: One value per output for every vector, read before
+            the clock cycles.
+        """
+
+
+class NetlistSimulation(Simulation):
+    """Simulation of a single-bit netlist through its :class:`GeneratedCircuit`.
+
+    Flip-flops imported with the full-scan model are simulated as such: the
+    values of their pseudo-output bulbs are fed back to their pseudo-input
+    switches at every clock cycle. Netlists without flip-flops are
+    simulated bit-parallel, :attr:`CHUNK` vectors per call of the generated
+    function.
+    """
+
+    #: Number of vectors simulated at once by combinational netlists.
+    CHUNK = 4096
+
+    def __init__(self, netlist: Netlist, inputs: Optional[dict] = None, outputs: Optional[dict] = None, state: Optional[dict] = None):
+        """Generate the function of a netlist.
+
+        Args:
+            netlist (Netlist): The circuit.
+            inputs (Optional[dict]): Netlist index of every named input, in
+                vector order. Defaults to the switches, named ``in<k>``;
+                clocks are held at their value.
+            outputs (Optional[dict]): Netlist index of every named output.
+                Defaults to the bulbs, named ``out<k>``.
+            state (Optional[dict]): Pseudo-input switch and pseudo-output
+                bulb of every flip-flop, as in :attr:`NetlistImporter.state`.
+
+        Raises:
+            ValueError: If the netlist contains a cycle.
+        """
+        self._circuit = GeneratedCircuit(netlist)
+        position = {index: slot for slot, index in enumerate(self._circuit.inputs)}
+        result = {index: slot for slot, index in enumerate(self._circuit.outputs)}
+        if inputs is None:
+            switches = [index for index in self._circuit.inputs if not issubclass(ComponentRegistry.getComponent(netlist.type(index)), Clock)]
+            inputs = {f"in{k}": index for k, index in enumerate(switches)}
+        if outputs is None:
+            outputs = {f"out{k}": index for k, index in enumerate(self._circuit.outputs)}
+        state = state or {}
+        super().__init__(list(inputs), list(outputs), [1] * len(inputs), [1] * len(outputs))
+        self._inputSlots = [position[index] for index in inputs.values()]
+        self._outputSlots = [result[index] for index in outputs.values()]
+        self._stateSlots = [(position[switch], result[bulb]) for switch, bulb in state.values()]
+        # Inputs outside the vectors, such as clocks, keep their value.
+        self._constants = [int(netlist.value(index)) for index in self._circuit.inputs]
+
+    def run(self, vectors: Iterable[Sequence[int]], cycles: int = 1) -> Iterator[List[int]]:
+        if self._stateSlots and cycles:
+            return self._runSequential(vectors, cycles)
+        return self._runParallel(vectors)
+
+    def _runSequential(self, vectors: Iterable[Sequence[int]], cycles: int) -> Iterator[List[int]]:
+        """Simulate one vector at a time, loading the flip-flops after each."""
+        function = self._circuit.function
+        values = list(self._constants)
+        for vector in vectors:
+            for slot, value in zip(self._inputSlots, vector):
+                values[slot] = value & 1
+            results = function(values)
+            yield [results[slot] for slot in self._outputSlots]
+            for cycle in range(cycles):
+                if cycle:
+                    results = function(values)
+                for switch, bulb in self._stateSlots:
+                    values[switch] = results[bulb]
+
+    def _runParallel(self, vectors: Iterable[Sequence[int]]) -> Iterator[List[int]]:
+        """Simulate chunks of vectors, one bit of every word per vector."""
+        function = self._circuit.function
+        chunk: List[Sequence[int]] = []
+        for vector in vectors:
+            chunk.append(vector)
+            if len(chunk) == self.CHUNK:
+                yield from self._evaluateChunk(function, chunk)
+                chunk = []
+        if chunk:
+            yield from self._evaluateChunk(function, chunk)
+
+    def _evaluateChunk(self, function, chunk: List[Sequence[int]]) -> List[List[int]]:
+        """Evaluate a chunk of vectors in one call of the generated function."""
+        size = len(chunk)
+        mask = (1 << size) - 1
+        words = [mask if value else 0 for value in self._constants]
+        for column, slot in enumerate(self._inputSlots):
+            # Vector k is bit k of the word, so the first vector is the last digit.
+            words[slot] = int("".join("1" if vector[column] & 1 else "0" for vector in reversed(chunk)), 2)
+        results = function(words, mask)
+        columns = [format(results[slot], f"0{size}b")[::-1] for slot in self._outputSlots]
+        return [[int(column[k]) for column in columns] for k in range(size)]
+
+
+class ComponentSimulation(Simulation):
+    """Simulation of the object model through a :class:`ClockedCircuit`.
+
+    Used for circuits with buses or clocked components, or with components
+    that cannot be evaluated on words, such as subcircuits with several
+    outputs. The latter are simulated on the model objects themselves
+    through a :class:`CompiledCircuit`, every clock rising and falling once
+    per cycle. The switches other than clocks are the inputs and the bulbs
+    the outputs, both in the order of the components.
+    """
+
+    def __init__(self, components: List[CircuitComponent]):
+        """Compile the circuit.
+
+        Args:
+            components (List[CircuitComponent]): Components of the circuit.
+
+        Raises:
+            ValueError: If the graph contains a cycle that does not go through
+                a clocked component.
+        """
+        words = all(
+            component.isClocked or not component.inputPins or (component.numOutputs <= 1 and component.supportsBits())
+            for component in components
+        )
+        self._circuit = ClockedCircuit(components) if words else CompiledCircuit(components)
+        self._clocks = [component for component in components if isinstance(component, Clock)]
+        self._switches = [component for component in components if isinstance(component, Switch) and not isinstance(component, Clock)]
+        self._bulbs = [component for component in components if isinstance(component, Bulb)]
+        super().__init__(
+            [f"in{k}" for k in range(len(self._switches))],
+            [f"out{k}" for k in range(len(self._bulbs))],
+            [switch.width for switch in self._switches],
+            [bulb.width for bulb in self._bulbs],
+        )
+
+    def run(self, vectors: Iterable[Sequence[int]], cycles: int = 1) -> Iterator[List[int]]:
+        circuit = self._circuit
+        for vector in vectors:
+            for switch, value in zip(self._switches, vector):
+                circuit.setValue(switch, value)
+            if isinstance(circuit, ClockedCircuit):
+                yield [int(circuit.value(bulb)) for bulb in self._bulbs]
+                for _ in range(cycles):
+                    circuit.step()
+            else:
+                yield [int(bulb.value) for bulb in self._bulbs]
+                for _ in range(cycles):
+                    self._tick()
+
+    def _tick(self) -> None:
+        """Run one clock cycle on the model objects, every clock at once."""
+        if any(clock.value for clock in self._clocks):
+            # A clock saved high first falls, so that every clock rises.
+            for clock in self._clocks:
+                clock._value = False
+            self._circuit.propagate(*self._clocks)
+        for clock in self._clocks:
+            clock.sample()
+        for level in (True, False):
+            for clock in self._clocks:
+                clock._value = level
+            self._circuit.propagate(*self._clocks)
+
+
+def load(path: str) -> Simulation:
+    """Load a circuit for headless simulation.
+
+    ``.bench`` and ``.blif`` files are imported; any other file is read as a
+    :class:`CircuitFile`. Single-bit circuits without clocked components are
+    simulated on their netlist, the others on the object model.
+
+    Args:
+        path (str): Path of the circuit file.
+
+    Returns:
+        Simulation: The simulation of the circuit.
+
+    Raises:
+        ValueError: If the file is malformed or the circuit has a
+            combinational cycle.
+        KeyError: If a component type is not registered.
+    """
+    importers = {".bench": BenchImporter, ".blif": BlifImporter}
+    for extension, importer in importers.items():
+        if path.lower().endswith(extension):
+            imported: NetlistImporter = importer.read(path)
+            return NetlistSimulation(imported.netlist, imported.inputs, imported.outputs, imported.state)
+    with CircuitFile(path) as file:
+        clocked = any(ComponentRegistry.getComponent(type).isClocked for type in file.types)
+        if not clocked:
+            try:
+                return NetlistSimulation(file.toNetlist())
+            except ValueError:
+                # Buses and components with several outputs are simulated
+                # on the object model.
+                pass
+        return ComponentSimulation(file.toComponents())
+
+
+def readVectors(lines: Iterable[str], widths: Sequence[int]) -> Iterator[List[int]]:
+    """Parse input vectors, one per line.
+
+    Args:
+        lines (Iterable[str]): Lines of the vector file.
+        widths (Sequence[int]): Width of every input.
+
+    Yields:
+        List[int]: One value per input for every vector.
+
+    Raises:
+        ValueError: If a line does not hold one valid value per input.
+    """
+    bits = all(width == 1 for width in widths)
+    for number, line in enumerate(lines, 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        tokens = line.split()
+        if len(tokens) == 1 and bits and len(tokens[0]) == len(widths) > 1:
+            tokens = list(tokens[0])
+        if len(tokens) != len(widths):
+            raise ValueError(f"Line {number}: expected {len(widths)} values, got {len(tokens)}")
+        try:
+            vector = [int(token, 0) for token in tokens]
+        except ValueError:
+            raise ValueError(f"Line {number}: invalid value in {line!r}") from None
+        for value, width in zip(vector, widths):
+            if not 0 <= value < 1 << width:
+                raise ValueError(f"Line {number}: {value} does not fit in {width} bits")
+        yield vector
+
+
+def formatVector(values: Sequence[int], widths: Sequence[int]) -> str:
+    """Format output values: a string of bits if they are all single bits.
+
+    Args:
+        values (Sequence[int]): One value per output.
+        widths (Sequence[int]): Width of every output.
+
+    Returns:
+        str: The formatted line, without a newline.
+    """
+    if all(width == 1 for width in widths):
+        return "".join(str(value) for value in values)
+    return " ".join(str(value) for value in values)
+
+
+def simulate(path: str, lines: Iterable[str], output: TextIO, cycles: int = 1) -> int:
+    """Simulate a circuit file on a vector file, writing one line per vector.
+
+    Args:
+        path (str): Path of the circuit file.
+        lines (Iterable[str]): Lines of the vector file.
+        output (TextIO): The open output file.
+        cycles (int): Clock cycles run after every vector.
+
+    Returns:
+        int: The number of vectors simulated.
+    """
+    simulation = load(path)
+    count = 0
+    for values in simulation.run(readVectors(lines, simulation.inputWidths), cycles):
+        output.write(formatVector(values, simulation.outputWidths) + "\n")
+        count += 1
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of ``python -m logicsimulator.sim``.
+
+    Args:
+        argv (Optional[List[str]]): Command-line arguments, by default
+            ``sys.argv[1:]``.
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(prog="python -m logicsimulator.sim", description="Simulate a circuit without the editor.")
+    parser.add_argument("circuit", help="circuit file: a saved circuit, .bench or .blif")
+    parser.add_argument("--vectors", default="-", help="input vectors, one per line (default: standard input)")
+    parser.add_argument("--output", default="-", help="output file (default: standard output)")
+    parser.add_argument("--cycles", type=int, default=1, help="clock cycles run after every vector (default: 1)")
+    parser.add_argument("--ports", action="store_true", help="print the input and output names and exit")
+    arguments = parser.parse_args(argv)
+    if arguments.cycles < 0:
+        parser.error("--cycles must not be negative")
+
+    vectors = output = None
+    try:
+        if arguments.ports:
+            simulation = load(arguments.circuit)
+            print("inputs:", " ".join(simulation.inputs))
+            print("outputs:", " ".join(simulation.outputs))
+            return 0
+        vectors = sys.stdin if arguments.vectors == "-" else open(arguments.vectors)
+        output = sys.stdout if arguments.output == "-" else open(arguments.output, "w")
+        simulate(arguments.circuit, vectors, output, arguments.cycles)
+    except (OSError, ValueError, KeyError) as error:
+        parser.exit(1, f"{parser.prog}: error: {error}\n")
+    finally:
+        for file in (vectors, output):
+            if file is not None and file not in (sys.stdin, sys.stdout):
+                file.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
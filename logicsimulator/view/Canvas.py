@@ -30,6 +30,7 @@ class Canvas(QGraphicsView):
     createConnectionRequest = Signal(tuple, tuple)  # (parent id, pin id), (parent id, pin id)
     removeConnectionsRequest = Signal(list)  # connection ids
     componentToggleRequest = Signal(str)  # component id for toggling (e.g., Switch)
+    componentsToggleRequest = Signal(list)  # ids of the switches toggled together
 
     def __init__(self, canvasVM: CanvasVM = None, parent=None, settings: CanvasSettings = CanvasSettings.default()):
         super().__init__(parent)
@@ -64,6 +65,7 @@ class Canvas(QGraphicsView):
         """Initialize variables for connection (wire) dragging operations."""
         self._connectionDragStartPin = None
         self._connectionDragging = False
+        self._highlightedPins: List[PinItem] = []
     
     def _importSettings(self, settings: CanvasSettings = CanvasSettings.default()) -> None:
         """Load settings like grid size, zoom, background color, and offsets."""
@@ -95,6 +97,8 @@ class Canvas(QGraphicsView):
             self._eventBus.emit(eventName="RemoveConnections", connectionIds=ids))
         self.componentToggleRequest.connect(lambda id:
             self._eventBus.emit(eventName="ToggleComponent", componentId=id))
+        self.componentsToggleRequest.connect(lambda ids:
+            self._eventBus.emit(eventName="ToggleComponents", componentIds=ids))
     
     @property
     def eventBus(self):
@@ -186,9 +190,11 @@ class Canvas(QGraphicsView):
     # ---------------- Keyboard Shortcuts ----------------
 
     def keyPressEvent(self, event):
-        """Handle keyboard shortcuts like delete, copy, paste, undo, redo."""
+        """Handle keyboard shortcuts like delete, copy, paste, undo, redo, toggle."""
         if event.key() == Qt.Key_Backspace:
             self.removeSelected()
+        elif event.key() == Qt.Key_Space:
+            self.toggleSelected()
         elif event.key() == Qt.Key_C and (event.modifiers() & (Qt.ControlModifier | Qt.MetaModifier)):
             self.copySelectedComponents()
         elif event.key() == Qt.Key_V and (event.modifiers() & (Qt.ControlModifier | Qt.MetaModifier)):
@@ -223,6 +229,12 @@ class Canvas(QGraphicsView):
         if componentIds:
             self.removeComponentsRequest.emit(componentIds)
 
+    def toggleSelected(self):
+        """Toggle the selected switches together, in a single propagation pass."""
+        switchIds = [item.id for item in self._scene.selectedItems() if isinstance(item, SwitchItem)]
+        if switchIds:
+            self.componentsToggleRequest.emit(switchIds)
+
     # ---------------- Rendering ----------------
 
     def drawBackground(self, painter: QPainter, rect):
@@ -284,6 +296,7 @@ class Canvas(QGraphicsView):
                 self._connectionDragging = True
                 self._connectionDragStartPin = item
                 self._createConnectionGhost(self._connectionDragStartPin.scenePos(), scenePos)
+                self._highlightConnectablePins(item)
             elif isinstance(item, ComponentItem):
                 # Start dragging components
                 self._componentDragging = True
@@ -328,6 +341,7 @@ class Canvas(QGraphicsView):
                     (item.parentItem().id, item.id)
                 )
             self._scene.removeItem(self._connectionGhost)
+            self._clearHighlightedPins()
             self._connectionDragging = False
             self._connectionDragStartPin = None
             event.accept()
@@ -358,6 +372,21 @@ class Canvas(QGraphicsView):
         """Update the ghost connection's end point during dragging."""
         self._connectionGhost.end = newEnd
 
+    def _highlightConnectablePins(self, startPin: PinItem):
+        """Highlight every pin the connection being dragged can be dropped on."""
+        if self._canvasVM is None:
+            return
+        for parentId, pinId in self._canvasVM.connectablePins((startPin.parentItem().id, startPin.id)):
+            pin = self._componentRegistry[parentId].pinItems[pinId]
+            pin.setHighlighted(True)
+            self._highlightedPins.append(pin)
+
+    def _clearHighlightedPins(self):
+        """Remove the drop target highlighting set when the drag started."""
+        for pin in self._highlightedPins:
+            pin.setHighlighted(False)
+        self._highlightedPins.clear()
+
     # ---------------- Drag and Drop ----------------
 
     def dragEnterEvent(self, event: QDragEnterEvent):
@@ -8,11 +8,15 @@ from PySide6.QtCore import QPointF
 # Mapping of simple circuit components to their corresponding view classes
 others = {
     "Bulb": BulbItem,
-    "Switch": SwitchItem
+    "Switch": SwitchItem,
+    "Clock": SwitchItem
 }
 
 # Supported logic gate types
-logicGates = ("AndGate", "OrGate", "NotGate", "XorGate", "NandGate")
+logicGates = ("AndGate", "OrGate", "NotGate", "XorGate", "NandGate", "NorGate", "XnorGate", "BufferGate")
+
+# Clocked components, drawn like logic gates
+sequentialComponents = ("DFlipFlop", "Register")
 
 class CircuitComponentItemFactory:
     """Factory class to create visual circuit component items.
@@ -43,6 +47,9 @@ class CircuitComponentItemFactory:
         if type in others:
             # Return specialized view class for Bulb or Switch
             return others[type](id, type, pos, inputPinIds, outputPinIds, value)
-        elif type in logicGates:
-            # Return a LogicGateItem for logic gate components
+        elif type in logicGates or type in sequentialComponents:
+            # Return a LogicGateItem for logic gate and clocked components
+            return LogicGateItem(id, type, pos, inputPinIds, outputPinIds)
+        else:
+            # Registered subcircuits are drawn like logic gates too
             return LogicGateItem(id, type, pos, inputPinIds, outputPinIds)
\ No newline at end of file
@@ -10,10 +10,14 @@ from PySide6.QtCore import QPointF
 view_vm = {
     "Bulb": BulbItem,
     "Switch": SwitchItem,
+    "Clock": SwitchItem,
 }
 
 # List of logic gate component types
-logicGateComponents = ("AndGate", "OrGate", "NotGate", "XorGate", "NandGate")
+logicGateComponents = ("AndGate", "OrGate", "NotGate", "XorGate", "NandGate", "NorGate", "XnorGate", "BufferGate")
+
+# Clocked components, drawn like logic gates
+sequentialComponents = ("DFlipFlop", "Register")
 
 class ComponentItemFactory:
     """Factory class to create visual component items for the canvas.
@@ -41,8 +45,8 @@ class ComponentItemFactory:
             # Return specific view class for Bulb or Switch
             return view_vm[type](id)
         else:
-            if type in logicGateComponents:
-                # Return a LogicGateItem for logic gate components
+            if type in logicGateComponents or type in sequentialComponents:
+                # Return a LogicGateItem for logic gate and clocked components
                 return LogicGateItem(id)
             else:
                 # Return a generic ComponentItem for any other type
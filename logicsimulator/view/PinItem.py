@@ -34,6 +34,7 @@ class PinItem(QGraphicsObject):
         self._setupGraphics(relativePos)
         self.setFlags(QGraphicsObject.ItemIsSelectable)
         self._parentSelected = parentItem.isSelected()
+        self._highlighted = False
 
     def _importSettings(self, settings: PinItemSettings):
         """Load visual appearance settings from a PinItemSettings object."""
@@ -44,6 +45,7 @@ class PinItem(QGraphicsObject):
         self._draggingColor = settings.DRAGGING_COLOR
         self._borderColor = settings.BORDER_COLOR
         self._borderWidth = settings.BORDER_WIDTH
+        self._highlightedColor = settings.HIGHLIGHTED_COLOR
 
     def _setupGraphics(self, relativePos: QPointF):
         """Initialize graphics properties and set relative position."""
@@ -85,7 +87,7 @@ class PinItem(QGraphicsObject):
             self.selected.emit(self._id)
             self._brush = self._selectedColor
         else:
-            self._brush = self._parentSelectedColor if self.parentSelected else self._color
+            self._brush = self._restingColor()
         self.update()
 
     @property
@@ -96,9 +98,27 @@ class PinItem(QGraphicsObject):
     def setParentSelected(self, value: bool):
         """Update visual color based on parent selection state."""
         self._parentSelected = value
-        self._brush = self._parentSelectedColor if value else self._color
+        self._brush = self._restingColor()
         self.update()
 
+    @property
+    def highlighted(self) -> bool:
+        """Return whether the pin is highlighted as a legal drop target."""
+        return self._highlighted
+
+    def setHighlighted(self, value: bool):
+        """Highlight the pin as a legal drop target for a dragged connection."""
+        self._highlighted = value
+        if not self.isSelected():
+            self._brush = self._restingColor()
+        self.update()
+
+    def _restingColor(self):
+        """Return the color of the pin when it is not selected."""
+        if self._highlighted:
+            return self._highlightedColor
+        return self._parentSelectedColor if self._parentSelected else self._color
+
     def paint(self, painter: QPainter, option, widget=None):
         """Paint the pin as a colored ellipse."""
         painter.setBrush(self._brush)
@@ -1,7 +1,7 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QSizePolicy, QLabel
 from PySide6.QtGui import QDrag, QPixmap, QPainter
 from PySide6.QtCore import Qt, QMimeData
-from typing import List
+from typing import List, Optional
 
 from logicsimulator.core.registry import ComponentRegistry
 from logicsimulator.view.settings.SideBar import SideBarSettings
@@ -16,7 +16,7 @@ class SideBar(QWidget):
         gateTypes (List[str]): List of available component types to display.
     """
 
-    def __init__(self, parent=None, gateTypes: List[str] = ComponentRegistry.getAllComponents(), settings=SideBarSettings.default()):
+    def __init__(self, parent=None, gateTypes: Optional[List[str]] = None, settings=SideBarSettings.default()):
         """Initialize the sidebar with component buttons and visual settings.
 
         Args:
@@ -25,7 +25,7 @@ class SideBar(QWidget):
             settings (SideBarSettings, optional): Settings for sidebar appearance. Defaults to default settings.
         """
         super().__init__(parent)
-        self.gateTypes = gateTypes
+        self.gateTypes = gateTypes if gateTypes is not None else ComponentRegistry.getAllComponents()
         self._importSettings(settings)
         self._setupGraphics()
 
@@ -8,7 +8,8 @@ class PinItemSettings:
                 parentSelectedColor,
                 borderColor,
                 draggingColor,
-                borderWidth):
+                borderWidth,
+                highlightedColor=QColor(150, 230, 150, 255)):
         self.RADIUS = radius
         self.COLOR = color
         self.SELECTED_COLOR = selectedColor
@@ -16,6 +17,7 @@ class PinItemSettings:
         self.DRAGGING_COLOR = draggingColor
         self.BORDER_COLOR = borderColor
         self.BORDER_WIDTH = borderWidth
+        self.HIGHLIGHTED_COLOR = highlightedColor
     
     @classmethod
     def default(cls):
@@ -26,7 +28,8 @@ class PinItemSettings:
         draggingColor = QColor(230, 230, 230)
         borderColor = QColor(0,0,0)
         borderWidth = 1
-        return cls(radius, color, selectedColor, parentSelectedColor, borderColor, draggingColor, borderWidth)
+        highlightedColor = QColor(150, 230, 150, 255)
+        return cls(radius, color, selectedColor, parentSelectedColor, borderColor, draggingColor, borderWidth, highlightedColor)
 
 class InputPinItemSettings(PinItemSettings):
     
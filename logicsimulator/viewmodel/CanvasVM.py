@@ -1,9 +1,16 @@
 from PySide6.QtCore import Signal, Slot, QObject, QPointF
-from typing import Dict
+from typing import Dict, List, Tuple
 
+from logicsimulator.model.Batch import PropagationBatch
+from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.CircuitFile import CircuitFile
+from logicsimulator.model.ReachabilityIndex import ReachabilityIndex
+from logicsimulator.model.Subcircuit import SubcircuitTemplate
+from logicsimulator.model.Verilog import VerilogExporter
 from logicsimulator.viewmodel.ConnectionVM import ConnectionVM
 from logicsimulator.viewmodel.CircuitComponentVM import CircuitComponentVM
 from logicsimulator.viewmodel.ComponentVM import ComponentVM
+from logicsimulator.viewmodel.ComponentVMFactory import ComponentVMFactory
 from logicsimulator.viewmodel.PinVM import PinVM
 
 class CanvasVM(QObject):
@@ -13,6 +20,10 @@ class CanvasVM(QObject):
     exposing signals for creation, removal, position updates, and value changes.
     It acts as the central hub for coordinating the UI layer with component
     and connection state changes.
+
+    The canvas also keeps a :class:`ReachabilityIndex` of its circuit, so the
+    pins a wire may legally be dropped on can be listed without one cycle
+    check per candidate pin.
     """
 
     #: Signal emitted when a generic component is added.
@@ -48,11 +59,16 @@ class CanvasVM(QObject):
     #: Args: id (str), new value (bool)
     connectionValueUpdated = Signal(str, bool)
 
+    #: Signal emitted when a subcircuit type is created and registered.
+    #: Args: type name (str)
+    subcircuitCreated = Signal(str)
+
     def __init__(self):
         """Initialize the canvas view-model."""
         super().__init__()
         self._components: Dict[str, ComponentVM] = dict()
         self._connections: Dict[str, ConnectionVM] = dict()
+        self._reachability = ReachabilityIndex()
 
     def addComponent(self, component: ComponentVM):
         """Add a component to the canvas.
@@ -62,9 +78,12 @@ class CanvasVM(QObject):
 
         Behavior:
             - Registers listeners for position and value changes.
+            - Registers circuit components in the reachability index.
             - Emits the appropriate signal depending on component type.
         """
         self._components[component.id] = component
+        if isinstance(component.component, CircuitComponent):
+            self._reachability.addComponent(component.component)
         component.posChanged.connect(lambda id, pos: self.componentPosUpdated.emit(id, pos))
         if isinstance(component, CircuitComponentVM):
             component.valueChanged.connect(lambda id, value: self.componentValueUpdated.emit(id, value))
@@ -87,10 +106,12 @@ class CanvasVM(QObject):
 
         Behavior:
             - Disconnects all signals.
-            - Removes the component from the internal registry.
+            - Removes the component from the internal registry and the
+              reachability index.
             - Emits ``componentRemoved``.
         """
         self._components.pop(component.id)
+        self._reachability.removeComponent(component.component)
         component.posChanged.disconnect()
         if isinstance(component, CircuitComponentVM):
             component.valueChanged.disconnect()
@@ -104,11 +125,13 @@ class CanvasVM(QObject):
 
         Behavior:
             - Connects the underlying pins.
+            - Updates the reachability index.
             - Registers value change listeners.
             - Emits ``connectionAdded``.
         """
         self._connections[connection.id] = connection
         connection.connect()
+        self._reachability.addConnection(connection.connection.source.parent, connection.connection.target.parent)
         connection.valueChanged.connect(lambda id, value: self.connectionValueUpdated.emit(id, value))
         self.connectionAdded.emit(connection.id, connection.parentPinIdPair1, connection.parentPinIdPair2)
 
@@ -120,15 +143,181 @@ class CanvasVM(QObject):
 
         Behavior:
             - Disconnects the underlying pins.
+            - Updates the reachability index.
             - Disconnects value change signals.
             - Removes the connection from the internal registry.
             - Emits ``connectionRemoved``.
         """
         connection.disconnect()
+        self._reachability.removeConnection(connection.connection.source.parent, connection.connection.target.parent)
         connection.valueChanged.disconnect()
         self._connections.pop(connection.id)
         self.connectionRemoved.emit(connection.id)
 
+    def connectablePins(self, parentPinPair: Tuple[str, str]) -> List[Tuple[str, str]]:
+        """List the pins a wire dragged from the given pin can be dropped on.
+
+        The result is the set of pins that pass :meth:`ConnectionVM.canConnect`
+        with the given pin: free pins of the same width on components that
+        do not close a cycle. Reachability is answered by the index in a
+        single pass over the components, instead of one cycle check per pin.
+
+        Args:
+            parentPinPair (Tuple[str, str]): Pair (parent component ID, pin ID)
+                of the pin the wire starts from.
+
+        Returns:
+            List[Tuple[str, str]]: Pairs (parent component ID, pin ID) of the
+            legal drop targets.
+        """
+        parent = self._components[parentPinPair[0]]
+        pinVM = parent.pins[parentPinPair[1]]
+        component = parent.component
+        if component not in self._reachability:
+            # Components outside the index, e.g. netlist facades, are checked pin by pin.
+            return [
+                (candidate.id, candidatePin.id)
+                for candidate in self._components.values() if isinstance(candidate, CircuitComponentVM)
+                for candidatePin in candidate.pins.values() if ConnectionVM.canConnect(pinVM, candidatePin)
+            ]
+        if pinVM.type == "OutputPin":
+            # The dragged pin drives: targets must not lead back to its component,
+            # unless the clock edge of a clocked target breaks the loop.
+            legal = set(self._reachability.notUpstreamOf(component))
+            legal.update(other for other in self._reachability.components if other.isClocked and other is not component)
+            return [
+                (candidate.id, candidatePin.id)
+                for candidate in self._components.values() if candidate.component in legal
+                for candidatePin in candidate.inputPins.values()
+                if candidatePin.pin.connection is None and candidatePin.pin.width == pinVM.pin.width
+            ]
+        if pinVM.pin.connection is not None:
+            return []
+        # The dragged pin is driven: sources must not be reachable from its component.
+        if component.isClocked:
+            legal = {other for other in self._reachability.components if other is not component}
+        else:
+            legal = set(self._reachability.notDownstreamOf(component))
+        return [
+            (candidate.id, candidatePin.id)
+            for candidate in self._components.values() if candidate.component in legal
+            for candidatePin in candidate.outputPins.values() if candidatePin.pin.width == pinVM.pin.width
+        ]
+
+    def createSubcircuit(self, name: str, componentIds: List[str]) -> str:
+        """Save a selection of components as a new subcircuit type.
+
+        The selected switches become the inputs and the selected bulbs the
+        outputs of the subcircuit, in selection order. The compiled template
+        is registered, so the type can be created like any other component.
+        The selected components stay on the canvas.
+
+        Args:
+            name (str): Type name of the subcircuit.
+            componentIds (List[str]): IDs of the selected components.
+
+        Returns:
+            str: The registered type name.
+
+        Raises:
+            ValueError: If the selection cannot form a subcircuit or the name
+                is already registered.
+        """
+        components = [self._components[id].component for id in componentIds]
+        SubcircuitTemplate(name, components).register()
+        self.subcircuitCreated.emit(name)
+        return name
+
+    def batch(self) -> PropagationBatch:
+        """Return a transaction deferring propagation until it is committed.
+
+        Used as ``with canvas.batch():``, it lets many switches be toggled
+        with a single ordered propagation pass, so every value signal of the
+        canvas is emitted at most once per component and connection. Only
+        the components of the canvas are deferred.
+
+        Returns:
+            PropagationBatch: The batch, to be used as a context manager.
+        """
+        return PropagationBatch(self._reachability)
+
+    def save(self, path: str) -> None:
+        """Save the circuit on the canvas, with the component positions and IDs.
+
+        Args:
+            path (str): Path of the :class:`CircuitFile` to write.
+        """
+        components = [vm for vm in self._components.values() if isinstance(vm, CircuitComponentVM)]
+        CircuitFile.write(
+            path,
+            [vm.component for vm in components],
+            [(vm.pos.x(), vm.pos.y()) for vm in components],
+            [vm.id for vm in components],
+        )
+
+    def load(self, path: str) -> None:
+        """Replace the circuit on the canvas by a saved one.
+
+        The model components are built in bulk from the file, then wrapped
+        in view-models with their saved IDs, if any, and connected in a
+        single propagation batch.
+
+        Args:
+            path (str): Path of a :class:`CircuitFile`.
+
+        Raises:
+            ValueError: If the file is not a valid circuit file.
+            KeyError: If it uses a component type that is not registered.
+        """
+        with CircuitFile(path) as file:
+            components = file.toComponents(connect=False)
+            positions = file.positions() or [(0.0, 0.0)] * len(components)
+            ids = file.ids() or [None] * len(components)
+            connections = file.connections()
+            self.clear()
+            vms = [
+                ComponentVMFactory.wrapComponent(component, QPointF(x, y), id)
+                for component, (x, y), id in zip(components, positions, ids)
+            ]
+            for vm in vms:
+                self.addComponent(vm)
+            with self.batch():
+                for source, output, target, pin in connections:
+                    self.addConnection(ConnectionVM(
+                        list(vms[source].outputPins.values())[output],
+                        list(vms[target].inputPins.values())[pin],
+                    ))
+            file.restore(components)
+
+    def clear(self) -> None:
+        """Remove every connection and component from the canvas."""
+        for connection in list(self._connections.values()):
+            self.removeConnection(connection)
+        for component in list(self._components.values()):
+            self.removeComponent(component)
+
+    def exportVerilog(self, path: str, module: str = "circuit") -> None:
+        """Write the circuit on the canvas as a structural Verilog module.
+
+        Switches and bulbs become the ports of the module, named after their
+        component IDs. Every subcircuit type used is written as a module of
+        its own before it.
+
+        Args:
+            path (str): Path of the ``.v`` file to write.
+            module (str): Name of the module.
+
+        Raises:
+            ValueError: If the canvas holds components with no Verilog
+                equivalent.
+        """
+        components = {
+            vm.component: vm.id for vm in self._components.values() if isinstance(vm, CircuitComponentVM)
+        }
+        exporter = VerilogExporter(components, components)
+        with open(path, "w") as file:
+            exporter.write(file, module)
+
     @property
     def components(self) -> Dict[str, ComponentVM]:
         """Dict[str, ComponentVM]: Mapping of component IDs to component view-models."""
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from PySide6.QtCore import QPointF, Signal, Slot
 
@@ -16,15 +16,20 @@ class CircuitComponentVM(ComponentVM, PropagatorObject):
     in :class:`PropagatorObject`.
     """
 
-    def __init__(self, circuitComponent: CircuitComponent, pos: QPointF):
+    def __init__(self, circuitComponent: CircuitComponent, pos: QPointF, id: Optional[str] = None):
         """Initialize the view-model.
 
+        The IDs of the pin view-models are derived from the ID of the
+        component, so a component recreated with the same ID has the same
+        pin IDs.
+
         Args:
             circuitComponent (CircuitComponent): The logic/model component
                 represented by this view-model.
             pos (QPointF): Initial position of the component in the view.
+            id (Optional[str]): The ID of the view-model; generated by default.
         """
-        super().__init__(component=circuitComponent, pos=pos, propagator=circuitComponent)
+        super().__init__(component=circuitComponent, pos=pos, id=id, propagator=circuitComponent)
         self._createPinsVM()
 
     def _createPinsVM(self):
@@ -36,8 +41,8 @@ class CircuitComponentVM(ComponentVM, PropagatorObject):
         """Create view-models for all input pins of the component."""
         if self._component.inputPins is not None:
             self._inputPins = {}
-            for pin in self._component.inputPins:
-                newPinVM = PinVM(self._id, pin)
+            for index, pin in enumerate(self._component.inputPins):
+                newPinVM = PinVM(self._id, pin, f"{pin.type}_{index}_{self._id}")
                 self._inputPins[newPinVM.id] = newPinVM
         else:
             self._inputPins = {}
@@ -46,8 +51,8 @@ class CircuitComponentVM(ComponentVM, PropagatorObject):
         """Create view-models for all output pins of the component."""
         if self._component.outputPins is not None:
             self._outputPins = {}
-            for pin in self._component.outputPins:
-                newPinVM = PinVM(self._id, pin)
+            for index, pin in enumerate(self._component.outputPins):
+                newPinVM = PinVM(self._id, pin, f"{pin.type}_{index}_{self._id}")
                 self._outputPins[newPinVM.id] = newPinVM
         else:
             self._outputPins = {}
@@ -0,0 +1,25 @@
+from logicsimulator.viewmodel.SwitchVM import SwitchVM
+
+from typing import Optional
+
+from PySide6.QtCore import QPointF
+
+class ClockVM(SwitchVM):
+    """View-model representation of a Clock component.
+
+    ``ClockVM`` is toggled like a :class:`SwitchVM`; toggling the underlying
+    :class:`Clock` from low to high is a rising edge for the clocked
+    components it drives.
+    """
+
+    type = "Clock"
+
+    def __init__(self, circuitComponent: "Clock", pos: QPointF, id: Optional[str] = None):
+        """Initialize the Clock view-model.
+
+        Args:
+            circuitComponent (Clock): The underlying clock component.
+            pos (QPointF): Initial position of the view-model element.
+            id (Optional[str]): The ID of the view-model; generated by default.
+        """
+        super().__init__(circuitComponent, pos, id)
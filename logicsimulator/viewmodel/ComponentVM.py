@@ -1,3 +1,5 @@
+from typing import Optional
+
 from PySide6.QtCore import QObject, QPointF, Signal
 
 from logicsimulator.core.idGenerator import generateId
@@ -17,19 +19,27 @@ class ComponentVM(Movable):
     position handling for visual elements.
     """
 
-    def __init__(self, component: Component, pos: QPointF, **kwargs):
+    def __init__(self, component: Component, pos: QPointF, id: Optional[str] = None, **kwargs):
         """Initialize a ComponentVM.
 
         Args:
             component (Component): The underlying logic/model component this
                 view-model represents.
             pos (QPointF): Initial position of the component in the UI.
+            id (Optional[str]): The ID of the view-model, when it is
+                recreated from a saved circuit or a command journal. A new
+                ``<type>_<uuid>`` ID is generated by default.
             **kwargs: Additional keyword arguments passed to ``Movable``.
         """
         self._component = component
-        self._id = generateId(prefix=self.type)
+        self._id = id or generateId(prefix=self.type)
         super().__init__(id=self._id, pos=pos, **kwargs)
 
+    @property
+    def component(self) -> Component:
+        """Component: The underlying model component."""
+        return self._component
+
     @property
     def type(self):
         """str: The type of the underlying component."""
@@ -1,15 +1,20 @@
+from typing import Optional
+
 from logicsimulator.model.ComponentFactory import ComponentFactory
 from logicsimulator.model.CircuitComponent import CircuitComponent
+from logicsimulator.model.Component import Component
 
 from logicsimulator.viewmodel.ComponentVM import ComponentVM
 from logicsimulator.viewmodel.CircuitComponentVM import CircuitComponentVM
 from logicsimulator.viewmodel.SwitchVM import SwitchVM
+from logicsimulator.viewmodel.ClockVM import ClockVM
 
 from PySide6.QtCore import QPointF
 
 # Mapping of component type names to their corresponding view-model classes
 vm_model = {
-    "Switch": SwitchVM
+    "Switch": SwitchVM,
+    "Clock": ClockVM
 }
 
 class ComponentVMFactory:
@@ -22,12 +27,13 @@ class ComponentVMFactory:
     """
 
     @staticmethod
-    def createComponent(type: str, pos: QPointF):
+    def createComponent(type: str, pos: QPointF, id: Optional[str] = None):
         """Create a component and its corresponding view-model.
 
         Args:
             type (str): The type name of the component to create.
             pos (QPointF): Initial position of the view-model in the UI.
+            id (Optional[str]): The ID of the view-model; generated by default.
 
         Returns:
             ComponentVM: A view-model instance corresponding to the created
@@ -41,10 +47,28 @@ class ComponentVMFactory:
             - Otherwise, return a generic :class:`ComponentVM`.
         """
         component = ComponentFactory.createComponent(type)
-        if type in vm_model:
-            return vm_model[type](component, pos)
+        return ComponentVMFactory.wrapComponent(component, pos, id)
+
+    @staticmethod
+    def wrapComponent(component: Component, pos: QPointF, id: Optional[str] = None):
+        """Create the view-model of an existing component.
+
+        Used when the model components are built in bulk, e.g. by
+        :meth:`CircuitFile.toComponents`.
+
+        Args:
+            component (Component): The model component.
+            pos (QPointF): Initial position of the view-model in the UI.
+            id (Optional[str]): The ID of the view-model; generated by default.
+
+        Returns:
+            ComponentVM: A view-model instance of the component, chosen as in
+                :meth:`createComponent`.
+        """
+        if component.type in vm_model:
+            return vm_model[component.type](component, pos, id)
         else:
             if isinstance(component, CircuitComponent):
-                return CircuitComponentVM(component, pos)
+                return CircuitComponentVM(component, pos, id)
             else:
-                return ComponentVM(component, pos)
\ No newline at end of file
+                return ComponentVM(component, pos, id)
\ No newline at end of file
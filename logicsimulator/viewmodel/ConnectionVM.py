@@ -1,8 +1,8 @@
 from PySide6.QtCore import Signal, QObject, Slot
 import weakref
 
-from logicsimulator.core.idGenerator import generateId
 from logicsimulator.model.Pin import Connection
+from logicsimulator.model.Netlist import NetlistConnection, NetlistPin
 from logicsimulator.viewmodel.PropagatorObject import PropagatorObject
 from logicsimulator.viewmodel.PinVM import PinVM
 from logicsimulator.viewmodel.CircuitComponentVM import CircuitComponentVM
@@ -26,14 +26,31 @@ class ConnectionVM(PropagatorObject):
             pinVM2 (PinVM): Second pin view-model of the connection.
 
         The underlying model connection is created automatically. The
-        view-model also registers as a propagator for updates.
+        view-model also registers as a propagator for updates. Its ID is
+        derived from the IDs of its output and input pins, which is unique
+        since an input pin has at most one connection, so replaying the
+        same commands recreates the same IDs.
         """
         self._pinVM1 = pinVM1
         self._pinVM2 = pinVM2
-        self._id = generateId(prefix="Connection")
-        self._connection = Connection.create(pinVM1.pin, pinVM2.pin)
+        source, target = (pinVM1, pinVM2) if pinVM1.type == "OutputPin" else (pinVM2, pinVM1)
+        self._id = f"Connection_{source.id}_{target.id}"
+        self._connection = self._connectionClass(pinVM1).create(pinVM1.pin, pinVM2.pin)
         super().__init__(id=self._id, propagator=self._connection)
 
+    @staticmethod
+    def _connectionClass(pinVM: PinVM) -> type:
+        """Select the model connection class matching the backend of a pin.
+
+        Args:
+            pinVM (PinVM): A pin view-model.
+
+        Returns:
+            type: :class:`NetlistConnection` for pins of a :class:`Netlist`,
+            :class:`Connection` otherwise.
+        """
+        return NetlistConnection if isinstance(pinVM.pin, NetlistPin) else Connection
+
     @staticmethod
     def canConnect(pinVM1: PinVM, pinVM2: PinVM) -> bool:
         """Check if two pin view-models can be connected.
@@ -45,7 +62,7 @@ class ConnectionVM(PropagatorObject):
         Returns:
             bool: True if the pins can be connected according to the model rules.
         """
-        return Connection.canConnect(pinVM1.pin, pinVM2.pin)
+        return ConnectionVM._connectionClass(pinVM1).canConnect(pinVM1.pin, pinVM2.pin)
 
     def connect(self):
         """Connect the underlying model connection."""
@@ -55,6 +72,11 @@ class ConnectionVM(PropagatorObject):
         """Disconnect the underlying model connection."""
         self._connection.disconnect()
 
+    @property
+    def connection(self) -> Connection:
+        """Connection: The underlying model connection."""
+        return self._connection
+
     @property
     def id(self) -> str:
         """str: Unique identifier of this connection view-model."""
@@ -8,7 +8,8 @@ events = (
     "RemoveComponents",
     "CreateConnection",
     "RemoveConnections",
-    "ToggleComponent"
+    "ToggleComponent",
+    "ToggleComponents"
 )
 
 class EventHandler:
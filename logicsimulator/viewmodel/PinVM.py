@@ -1,27 +1,29 @@
 from logicsimulator.model.Pin import Pin
 from logicsimulator.viewmodel.PropagatorObject import PropagatorObject
 from logicsimulator.core.idGenerator import generateId
+from typing import Optional
 import weakref
 
 class PinVM(PropagatorObject):
     """View-model wrapper for a :class:`Pin`.
 
     ``PinVM`` exposes a pin’s properties and propagator signals to the UI
-    layer. Each pin view-model has its own autogenerated ID and relays
+    layer. Each pin view-model has its own ID and relays
     changes from the underlying :class:`Pin` instance through the
     :class:`PropagatorObject` mixin.
     """
 
-    def __init__(self, parentId: str, pin: Pin):
+    def __init__(self, parentId: str, pin: Pin, id: Optional[str] = None):
         """Initialize the pin view-model.
 
         Args:
             parentId (str): ID of the component this pin belongs to.
             pin (Pin): The underlying model pin wrapped by this view-model.
+            id (Optional[str]): The ID of the view-model; generated by default.
         """
         self._parentId = parentId
         self._pin = weakref.ref(pin)
-        self._id = generateId(prefix=self._pin().type)
+        self._id = id or generateId(prefix=self._pin().type)
 
         # ``PropagatorObject`` registers for propagator updates
         super().__init__(id=self._id, propagator=self._pin())
@@ -38,7 +40,7 @@ class PinVM(PropagatorObject):
 
     @property
     def id(self) -> str:
-        """str: Unique auto-generated ID for this pin view-model."""
+        """str: Unique ID of this pin view-model."""
         return self._id
 
     @property
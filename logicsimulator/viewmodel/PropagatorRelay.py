@@ -9,8 +9,9 @@ class PropagatorRelay(ObjectProperty):
     """Qt relay object that emits signals when a propagator value changes.
 
     ``PropagatorRelay`` uses a :class:`PropagatorObserver` to watch a
-    model-side :class:`Propagator`. When the propagator updates, the relay
-    emits a Qt signal with the new value.
+    model-side :class:`Propagator`. When the propagator's value changes, the
+    relay emits a Qt signal with the new value. Updates that leave the value
+    as it was last emitted are dropped.
     """
 
     #: Signal emitted when the propagator's value changes.
@@ -27,12 +28,15 @@ class PropagatorRelay(ObjectProperty):
             propagator (Propagator): The propagator whose value is observed.
         """
         super().__init__(parentId)
+        self._value = propagator.value
         self._propagatorObserver = PropagatorObserver(self, propagator)
 
     def onValueChange(self, value: bool) -> None:
-        """Emit the valueChanged signal.
+        """Emit the valueChanged signal if the value differs from the last one.
 
         Args:
             value (bool): The new value from the propagator.
         """
-        self.valueChanged.emit(self._parentId, value)
\ No newline at end of file
+        if value != self._value:
+            self._value = value
+            self.valueChanged.emit(self._parentId, value)
\ No newline at end of file
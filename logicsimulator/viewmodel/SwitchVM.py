@@ -1,6 +1,8 @@
 from logicsimulator.viewmodel.CircuitComponentVM import CircuitComponentVM
 from logicsimulator.viewmodel.Toggleable import Toggleable
 
+from typing import Optional
+
 from PySide6.QtCore import QPointF
 
 class SwitchVM(CircuitComponentVM, Toggleable):
@@ -14,14 +16,15 @@ class SwitchVM(CircuitComponentVM, Toggleable):
 
     type = "Switch"
 
-    def __init__(self, circuitComponent: "Switch", pos: QPointF):
+    def __init__(self, circuitComponent: "Switch", pos: QPointF, id: Optional[str] = None):
         """Initialize the Switch view-model.
 
         Args:
             circuitComponent (Switch): The underlying switch logic component.
             pos (QPointF): Initial position of the view-model element.
+            id (Optional[str]): The ID of the view-model; generated by default.
         """
-        super().__init__(circuitComponent, pos)
+        super().__init__(circuitComponent, pos, id)
 
     def toggle(self):
         """Toggle the underlying switch component.
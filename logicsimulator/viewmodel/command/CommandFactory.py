@@ -6,7 +6,8 @@ commandRegistry = {
     "CreateConnection" : CreateConnection,
     "RemoveComponents" : RemoveComponents,
     "RemoveConnections" : RemoveConnections,
-    "ToggleComponent":  ToggleComponent
+    "ToggleComponent":  ToggleComponent,
+    "ToggleComponents": ToggleComponents
 }
 
 class CommandFactory:
@@ -1,37 +1,119 @@
+import warnings
+from typing import Optional
+
+from logicsimulator.core.registry import ComponentRegistry
 from logicsimulator.viewmodel.command.base import Command
 from logicsimulator.viewmodel.command.CommandFactory import CommandFactory
+from logicsimulator.viewmodel.command.Journal import CommandJournal
 
 from logicsimulator.viewmodel.CanvasVM import CanvasVM
 
 class CommandManager:
     
-    def __init__(self, canvasVM : CanvasVM):
+    def __init__(self, canvasVM : CanvasVM, journal : Optional[CommandJournal] = None):
         self.connectCanvasVM(canvasVM)
         self._executedStack = [] #stack of executed commands
         self._undoneStack = [] #stack of undone commands
+        self._journal = journal
+        self._replaying = False
+        # Number of commands on top of each stack that were done after the
+        # snapshot of the journal, so that their undo or redo can be replayed
+        self._journaledExecuted = 0
+        self._journaledUndone = 0
     
     def connectCanvasVM(self, canvasVM : CanvasVM):
         self._canvasVM = canvasVM
+        canvasVM.subcircuitCreated.connect(self._recordTemplate)
     
     def do(self, command: Command):
         if command: #if not None
             command.execute()
             self._executedStack.append(command)
             self._undoneStack.clear()
-
+            self._journaledExecuted += 1
+            self._journaledUndone = 0
+            self._record("do", command)
+    
     def undo(self):
         if self._executedStack:
             cmd = self._executedStack.pop()
             cmd.undo()
             self._undoneStack.append(cmd)
-
+            if self._journaledExecuted:
+                self._journaledExecuted -= 1
+                self._journaledUndone += 1
+                self._record("undo")
+            else:
+                self._recordSnapshot()
+    
     def redo(self):
         if self._undoneStack:
             cmd = self._undoneStack.pop()
             cmd.execute()
             self._executedStack.append(cmd)
+            if self._journaledUndone:
+                self._journaledUndone -= 1
+                self._journaledExecuted += 1
+                self._record("redo")
+            else:
+                self._recordSnapshot()
     
     def createCommand(self, commandType : str, **kwargs):
         command = CommandFactory.createCommand(commandType, canvasVM = self._canvasVM, **kwargs)
         if command.createdSuccessfully:
-            self.do(command)
\ No newline at end of file
+            self.do(command)
+    
+    def recover(self):
+        # Restore the session of the journal: its snapshot, then its commands,
+        # which are replayed without being journaled again. The journal is
+        # the autosave of the editor, so the last session is restored whether
+        # it ended with a crash or not.
+        if self._journal is None:
+            return
+        self._replaying = True
+        try:
+            records = self._journal.recover(self._canvasVM)
+            for operation, commandType, arguments in records:
+                if operation == "do":
+                    self.createCommand(commandType, **arguments)
+                elif operation == "undo":
+                    self.undo()
+                elif operation == "redo":
+                    self.redo()
+        except Exception as error:
+            # A session that cannot be restored, e.g. one using a component
+            # type that is no longer registered, must not prevent the start.
+            moved = self._journal.reset(self._canvasVM)
+            self._executedStack.clear()
+            self._undoneStack.clear()
+            self._journaledExecuted = self._journaledUndone = 0
+            warnings.warn(f"Could not recover the last session ({error!r}); it was moved to {', '.join(moved)}")
+        finally:
+            self._replaying = False
+    
+    def compact(self):
+        # Only the journal is folded into the snapshot: the commands stay on
+        # the stacks and can still be undone during this session, but their
+        # undo or redo is then journaled as a new snapshot (see undo), since
+        # the commands cannot be replayed from the journal anymore. After a
+        # crash, the history older than the snapshot is lost.
+        self._journal.compact(self._canvasVM)
+        self._journaledExecuted = self._journaledUndone = 0
+    
+    def _record(self, operation : str, command : Optional[Command] = None):
+        if self._journal is not None and not self._replaying:
+            self._journal.append(operation, command)
+            if self._journal.full:
+                self.compact()
+    
+    def _recordTemplate(self, name : str):
+        # Subcircuit types are not commands, but later commands may use them
+        if self._journal is not None and not self._replaying:
+            self._journal.appendTemplate(ComponentRegistry.getComponent(name).template)
+            if self._journal.full:
+                self.compact()
+    
+    def _recordSnapshot(self):
+        # Undoing or redoing a command done before the snapshot
+        if self._journal is not None and not self._replaying:
+            self.compact()
\ No newline at end of file
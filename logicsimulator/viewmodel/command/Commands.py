@@ -1,4 +1,4 @@
-from typing import List, Set, Tuple
+from typing import List, Optional, Set, Tuple
 import weakref
 
 from PySide6.QtCore import QPointF
@@ -12,17 +12,28 @@ from logicsimulator.viewmodel.ComponentVMFactory import ComponentVMFactory
 from logicsimulator.viewmodel.PinVM import PinVM
 
 class AddComponents(Command):
-    def __init__(self, canvasVM : CanvasVM, componentTypeList : List[str], posList: List[QPointF]):
+    def __init__(self, canvasVM : CanvasVM, componentTypeList : List[str], posList: List[QPointF], componentIds : Optional[List[str]] = None):
         super().__init__()
         self._canvas = canvasVM
+        self._componentTypeList = componentTypeList
+        self._posList = posList
         self._components : List[ComponentVM] = list()
         for index in range(len(componentTypeList)):
-            self._components.append(ComponentVMFactory.createComponent(type = componentTypeList[index], pos = posList[index]))
+            id = componentIds[index] if componentIds else None
+            self._components.append(ComponentVMFactory.createComponent(type = componentTypeList[index], pos = posList[index], id = id))
     
     @property
     def component(self):
         return self._component
     
+    @property
+    def arguments(self):
+        return {
+            "componentTypeList": self._componentTypeList,
+            "posList": self._posList,
+            "componentIds": [component.id for component in self._components]
+        }
+    
     def execute(self):
         for component in self._components:
             self._canvas.addComponent(component = component)
@@ -45,6 +56,10 @@ class MoveComponents(Command):
     def components(self):
         return self._componentIds
     
+    @property
+    def arguments(self):
+        return {"componentIds": self._componentIds, "newPosList": self._newPosList}
+    
     @property
     def oldPosList(self):
         return self._oldPosList
@@ -91,6 +106,10 @@ class RemoveComponents(Command):
     def canvas(self):
         return self._canvas
     
+    @property
+    def arguments(self):
+        return {"componentIds": self._componentsIds}
+    
     def execute(self):
         for connectionSet in self._adjacentConnections:
             for connection in connectionSet:
@@ -109,6 +128,8 @@ class CreateConnection(Command):
     def __init__(self, canvasVM : CanvasVM, parentPinPair1 : Tuple[str, str], parentPinPair2: Tuple[str, str]):
         super().__init__()
         self._canvas = canvasVM
+        self._parentPinPair1 = parentPinPair1
+        self._parentPinPair2 = parentPinPair2
         self._pinVM1 = weakref.ref(self._canvas.components[parentPinPair1[0]].pins[parentPinPair1[1]])
         self._pinVM2 = weakref.ref(self._canvas.components[parentPinPair2[0]].pins[parentPinPair2[1]])
         if ConnectionVM.canConnect(self._pinVM1(), self._pinVM2()):
@@ -117,6 +138,10 @@ class CreateConnection(Command):
             self._connection = None
             self._createdSuccessfully = False
     
+    @property
+    def arguments(self):
+        return {"parentPinPair1": self._parentPinPair1, "parentPinPair2": self._parentPinPair2}
+    
     def execute(self):
         self._canvas.addConnection(self._connection)
     
@@ -132,6 +157,10 @@ class RemoveConnections(Command):
         for id in self._connectionIds:
             self._connections.append(self._canvas.connections[id])
     
+    @property
+    def arguments(self):
+        return {"connectionIds": self._connectionIds}
+    
     def execute(self):
         for connection in self._connections:
             self._canvas.removeConnection(connection)
@@ -144,10 +173,40 @@ class ToggleComponent(Command):
     def __init__(self, canvasVM : CanvasVM, componentId: str):
         super().__init__()
         self._canvas = canvasVM
+        self._componentId = componentId
         self._component = self._canvas.components[componentId]
     
+    @property
+    def arguments(self):
+        return {"componentId": self._componentId}
+    
     def execute(self):
         self._component.toggle()
     
     def undo(self):
-        self._component.toggle()
\ No newline at end of file
+        self._component.toggle()
+
+class ToggleComponents(Command):
+    def __init__(self, canvasVM : CanvasVM, componentIds: List[str]):
+        super().__init__()
+        self._canvas = canvasVM
+        self._componentIds = componentIds
+        self._components = [self._canvas.components[id] for id in componentIds]
+    
+    @property
+    def components(self):
+        return self._components
+    
+    @property
+    def arguments(self):
+        return {"componentIds": self._componentIds}
+    
+    def execute(self):
+        with self._canvas.batch():
+            for component in self._components:
+                component.toggle()
+    
+    def undo(self):
+        with self._canvas.batch():
+            for component in self._components:
+                component.toggle()
\ No newline at end of file
@@ -0,0 +1,270 @@
+from __future__ import annotations
+import marshal
+import os
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QPointF
+
+from logicsimulator.core.registry import ComponentRegistry
+from logicsimulator.model.Subcircuit import SubcircuitTemplate
+from logicsimulator.viewmodel.CanvasVM import CanvasVM
+from logicsimulator.viewmodel.command.base import Command
+
+class CommandJournal:
+    """Append-only on-disk journal of the commands of a session.
+
+    The session is stored as a snapshot of the canvas (a
+    :class:`CircuitFile` saved with the component IDs) and a journal file
+    holding every command executed, undone or redone since the snapshot.
+    Each command appends one record of a few dozen bytes, so autosaving
+    after a change costs the size of the change, not of the design; after a
+    crash, :meth:`recover` loads the snapshot and returns the records for
+    the :class:`CommandManager` to replay. Since replayed commands recreate
+    the same component IDs (see :attr:`Command.arguments`), later records
+    find the components they refer to. The editor recovers the journal at
+    every start, so it also restores the last session after a clean exit.
+
+    Subcircuit types created during the session are journaled too, as the
+    :attr:`SubcircuitTemplate.program` of their template, since the
+    snapshot only holds the templates of the types it uses: they are
+    registered again by :meth:`recover`, before the commands creating
+    instances of them are replayed.
+
+    A record is the ``marshal`` encoding of ``(operation, command type,
+    arguments)``, with positions stored as complex numbers, framed by its
+    length and CRC-32: a record torn by a crash is detected and dropped.
+
+    Once the journal grows past ``threshold`` bytes, :meth:`compact` folds
+    it into a new snapshot. The snapshot is written to a temporary file and
+    a ``compact`` record is appended before the snapshot replaces the old
+    one and the journal is emptied but for the subcircuit templates, so a
+    crash at any step recovers either the old snapshot with its journal or
+    the new snapshot with the templates.
+    """
+
+    MAGIC = b"LSIMJRNL"
+    FRAME = struct.Struct("<II")
+
+    def __init__(self, path: str, snapshotPath: str, threshold: int = 1 << 20, durable: bool = False):
+        """Create a journal; :meth:`recover` opens it.
+
+        Args:
+            path (str): Path of the journal file.
+            snapshotPath (str): Path of the snapshot file.
+            threshold (int): Size in bytes past which the journal should be
+                compacted.
+            durable (bool): Whether every record is synced to the disk, to
+                also survive a system crash; by default, records are only
+                flushed to the operating system, which survives a crash of
+                the application.
+        """
+        self._path = path
+        self._snapshotPath = snapshotPath
+        self._threshold = threshold
+        self._durable = durable
+        self._file = None
+        # Program of every journaled template, by type name
+        self._templates: Dict[str, tuple] = {}
+
+    @property
+    def size(self) -> int:
+        """int: Current size of the journal file in bytes."""
+        return self._file.tell() if self._file is not None else 0
+
+    @property
+    def full(self) -> bool:
+        """bool: Whether the journal grew past its threshold and should be compacted."""
+        return self.size > self._threshold
+
+    # ---------------- Records ----------------
+
+    @staticmethod
+    def _encode(value: Any) -> Any:
+        """Replace the positions of command arguments by complex numbers."""
+        if isinstance(value, QPointF):
+            return complex(value.x(), value.y())
+        if isinstance(value, (list, tuple)):
+            return type(value)(CommandJournal._encode(item) for item in value)
+        if isinstance(value, dict):
+            return {key: CommandJournal._encode(item) for key, item in value.items()}
+        return value
+
+    @staticmethod
+    def _decode(value: Any) -> Any:
+        """Restore the positions encoded by :meth:`_encode`."""
+        if isinstance(value, complex):
+            return QPointF(value.real, value.imag)
+        if isinstance(value, (list, tuple)):
+            return type(value)(CommandJournal._decode(item) for item in value)
+        if isinstance(value, dict):
+            return {key: CommandJournal._decode(item) for key, item in value.items()}
+        return value
+
+    def _read(self) -> Tuple[List[tuple], int]:
+        """Read the intact records of the journal file.
+
+        Returns:
+            Tuple[List[tuple], int]: The records and the size of the intact
+            part of the file.
+
+        Raises:
+            ValueError: If the file is not a command journal.
+        """
+        with open(self._path, "rb") as file:
+            data = file.read()
+        if not data.startswith(self.MAGIC):
+            raise ValueError(f"{self._path} is not a command journal")
+        records = []
+        offset = len(self.MAGIC)
+        while offset + self.FRAME.size <= len(data):
+            length, checksum = self.FRAME.unpack_from(data, offset)
+            payload = data[offset + self.FRAME.size:offset + self.FRAME.size + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            records.append(marshal.loads(payload))
+            offset += self.FRAME.size + length
+        return records, offset
+
+    def _write(self, record: tuple, sync: bool = False) -> None:
+        """Append a framed record and flush it."""
+        payload = marshal.dumps(record)
+        self._file.write(self.FRAME.pack(len(payload), zlib.crc32(payload)) + payload)
+        self._file.flush()
+        if sync or self._durable:
+            os.fsync(self._file.fileno())
+
+    def append(self, operation: str, command: Optional[Command] = None) -> None:
+        """Append the record of an operation of the command manager.
+
+        Args:
+            operation (str): ``"do"``, ``"undo"`` or ``"redo"``.
+            command (Optional[Command]): The executed command, for ``"do"``.
+        """
+        if command is None:
+            self._write((operation, "", {}))
+        else:
+            self._write((operation, type(command).__name__, self._encode(command.arguments)))
+
+    def appendTemplate(self, template: SubcircuitTemplate) -> None:
+        """Append the record of a subcircuit type created in the session.
+
+        Args:
+            template (SubcircuitTemplate): The registered template.
+        """
+        program = template.program
+        self._templates[program[0]] = program
+        self._write(("template", program[0], {"program": program}))
+
+    def _writeTemplates(self) -> None:
+        """Write the records of every journaled template after the magic.
+
+        The records overwrite the start of the journal before it is
+        truncated, so a crash in between leaves the templates followed by
+        torn records, which are dropped.
+        """
+        self._file.seek(len(self.MAGIC))
+        for name, program in self._templates.items():
+            self._write(("template", name, {"program": program}))
+        self._file.truncate()
+        self._file.flush()
+
+    # ---------------- Sessions ----------------
+
+    def recover(self, canvasVM: CanvasVM) -> List[Tuple[str, str, dict]]:
+        """Open the journal, restoring the snapshot of the last session.
+
+        An interrupted compaction is completed, the journaled subcircuit
+        templates that are not registered yet are registered, the snapshot,
+        if any, is loaded into the canvas and the records torn by a crash
+        are truncated. The journal file is created if it does not exist.
+
+        Args:
+            canvasVM (CanvasVM): The canvas receiving the snapshot.
+
+        Returns:
+            List[Tuple[str, str, dict]]: The operation, command type and
+            arguments of every command record to replay.
+
+        Raises:
+            ValueError: If the journal or snapshot file is invalid.
+            KeyError: If a template uses a type that is not registered.
+        """
+        temporary = self._snapshotPath + ".tmp"
+        records, end = self._read() if os.path.exists(self._path) else ([], 0)
+        compacted = bool(records) and records[-1][0] == "compact"
+        if compacted:
+            if os.path.exists(temporary):
+                os.replace(temporary, self._snapshotPath)
+        elif os.path.exists(temporary):
+            os.remove(temporary)
+        self._templates = {type: arguments["program"] for operation, type, arguments in records if operation == "template"}
+        registered = set(ComponentRegistry.getAllComponents())
+        for name, program in self._templates.items():
+            if name not in registered:
+                SubcircuitTemplate.fromProgram(*program).register()
+        if os.path.exists(self._snapshotPath):
+            canvasVM.load(self._snapshotPath)
+        self._file = open(self._path, "r+b" if end else "wb")
+        if not end:
+            self._file.write(self.MAGIC)
+            end = len(self.MAGIC)
+        if compacted:
+            self._writeTemplates()
+            return []
+        self._file.seek(end)
+        self._file.truncate()
+        self._file.flush()
+        return [(operation, type, self._decode(arguments)) for operation, type, arguments in records if operation != "template"]
+
+    def compact(self, canvasVM: CanvasVM) -> None:
+        """Fold the journal into a new snapshot of the canvas.
+
+        Args:
+            canvasVM (CanvasVM): The canvas, in the state reached by the
+                snapshot and the journal.
+        """
+        temporary = self._snapshotPath + ".tmp"
+        canvasVM.save(temporary)
+        with open(temporary, "rb") as file:
+            os.fsync(file.fileno())
+        self._write(("compact", "", {}), sync=True)
+        os.replace(temporary, self._snapshotPath)
+        self._writeTemplates()
+        os.fsync(self._file.fileno())
+
+    def reset(self, canvasVM: CanvasVM) -> List[str]:
+        """Move the files of the session aside and start an empty session.
+
+        Used when the session cannot be recovered, e.g. because it uses a
+        component type that is no longer registered: the files are kept
+        with a ``.broken`` suffix, replacing older ones, so that the
+        application can start.
+
+        Args:
+            canvasVM (CanvasVM): The canvas, which is cleared.
+
+        Returns:
+            List[str]: The paths the files were moved to.
+        """
+        self.close()
+        moved = []
+        for path in (self._path, self._snapshotPath, self._snapshotPath + ".tmp"):
+            if os.path.exists(path):
+                os.replace(path, path + ".broken")
+                moved.append(path + ".broken")
+        canvasVM.clear()
+        self._file = open(self._path, "wb")
+        self._file.write(self.MAGIC)
+        # The templates registered by the recovery stay usable, so keep them
+        registered = set(ComponentRegistry.getAllComponents())
+        self._templates = {name: program for name, program in self._templates.items() if name in registered}
+        self._writeTemplates()
+        return moved
+
+    def close(self) -> None:
+        """Close the journal file; the session can be recovered later."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
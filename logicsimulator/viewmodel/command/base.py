@@ -14,6 +14,13 @@ class Command(ABC):
     def undo(self):
         pass
     
+    @property
+    @abstractmethod
+    def arguments(self) -> dict:
+        # Keyword arguments recreating the command with CommandFactory,
+        # besides the canvas, as recorded by the CommandJournal.
+        pass
+    
     @property
     def createdSuccessfully(self) -> bool:
         return self._createdSuccessfully